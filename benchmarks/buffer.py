@@ -0,0 +1,61 @@
+"""
+Benchmark many `increase_score(1)` calls on a small set of hot Edges, with
+and without a ScoreBuffer, reporting increments per second and store
+writes. Every store write is followed by invalidating cached values of the
+originating Node, the buffer invalidates once per flush instead.
+
+Usage: python benchmarks/buffer.py [increments] [hot_edges]
+"""
+import random
+import sys
+import time
+
+from nodegraph.buffer import ScoreBuffer
+from nodegraph.graph import Graph
+
+
+def hot_edges(graph, count):
+    """ Return count Edges from a star of Nodes. """
+    nodes = graph.nodes.create_many(
+        'node_{0}'.format(i) for i in xrange(count + 1)
+    )
+
+    return graph.edges.create_many((nodes[0], node) for node in nodes[1:])
+
+
+def run(increments, count):
+    random.seed(0)
+
+    results = []
+    for label, buffered in (('direct', False), ('buffered', True)):
+        graph = Graph(name='benchmark')
+        edges = hot_edges(graph, count)
+        sample = [random.choice(edges) for i in xrange(increments)]
+
+        if buffered:
+            graph.score_buffer = ScoreBuffer(graph.store)
+
+        start = time.time()
+        for edge in sample:
+            edge.increase_score(1)
+
+        if buffered:
+            graph.score_buffer.flush()
+        duration = time.time() - start
+
+        writes = graph.score_buffer.writes if buffered else increments
+
+        results.append((label, increments / duration, writes))
+
+    print '{0:>10} {1:>20} {2:>14}'.format(
+        'method', 'increments per sec', 'store writes'
+    )
+    for label, rate, writes in results:
+        print '{0:>10} {1:>20.0f} {2:>14}'.format(label, rate, writes)
+
+
+if __name__ == '__main__':
+    increments = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    run(increments, count)
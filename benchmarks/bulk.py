@@ -0,0 +1,75 @@
+"""
+Benchmark score increments per second, comparing Edge.increase_score() on
+every Edge against a single EdgeManager.increase_score_many() batch.
+
+Usage: python benchmarks/bulk.py [increment_count]
+"""
+import random
+import sys
+import time
+
+from nodegraph.graph import Graph
+
+
+def build_graph(node_count):
+    """ Return a Graph with node_count Nodes and its list of Nodes. """
+    graph = Graph(name='benchmark')
+
+    nodes = graph.nodes.create_many(
+        'node_{0}'.format(i) for i in xrange(node_count)
+    )
+
+    return graph, nodes
+
+
+def increments(nodes, count):
+    """ Return count random `(from node, to node, delta)` rows. """
+    rng = random.Random(0)
+
+    rows = []
+    while len(rows) < count:
+        from_node, to_node = rng.choice(nodes), rng.choice(nodes)
+
+        if from_node != to_node:
+            rows.append((from_node, to_node, rng.randrange(1, 100)))
+
+    return rows
+
+
+def single(graph, rows):
+    """ Increase scores one Edge at a time. """
+    create = graph.edges.create
+
+    for from_node, to_node, delta in rows:
+        create(from_node, to_node).increase_score(delta)
+
+
+def batched(graph, rows):
+    """ Increase scores in a single batch. """
+    graph.edges.increase_score_many(rows, create=True)
+
+
+def run(count):
+    node_count = max(int(count ** 0.5), 2)
+
+    results = []
+    for label, func in (('single', single), ('batched', batched)):
+        graph, nodes = build_graph(node_count)
+        rows = increments(nodes, count)
+
+        start = time.time()
+        func(graph, rows)
+        duration = time.time() - start
+
+        results.append((label, count / duration))
+
+    print '{0:>10} {1:>20}'.format('method', 'increments per sec')
+    for label, rate in results:
+        print '{0:>10} {1:>20.0f}'.format(label, rate)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run(int(sys.argv[1]))
+    else:
+        run(1000000)
@@ -0,0 +1,104 @@
+"""
+Benchmark edge list import and export throughput in rows per second,
+comparing batched import against creating Nodes and Edges one by one
+through the managers.
+
+Usage: python benchmarks/edgelist.py [edge_count]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from nodegraph.edgelist import (
+    import_edges, export_edges, open_edge_list, read_edges
+)
+from nodegraph.graph import Graph
+from nodegraph.sqlitestore import SQLiteGraphStore
+
+
+def write_edge_list(path, edge_count):
+    """ Write edge_count random edges over edge_count / 10 nodes. """
+    node_count = max(edge_count // 10, 2)
+
+    rng = random.Random(0)
+
+    with open_edge_list(path, 'wb') as f:
+        f.write('from_node\tto_node\tscore\tttl\n')
+
+        for i in xrange(edge_count):
+            f.write('node_{0}\tnode_{1}\t{2}\t\n'.format(
+                rng.randrange(node_count), rng.randrange(node_count),
+                rng.randrange(1000)
+            ))
+
+
+def manager_import(graph, path):
+    """ Import by creating Nodes and Edges through the managers. """
+    with open_edge_list(path, 'rb') as f:
+        for from_name, to_name, score, ttl in read_edges(f, '\t'):
+            if from_name == to_name:
+                continue
+
+            edge = graph.edges.create(
+                graph.nodes.create(from_name), graph.nodes.create(to_name)
+            )
+            edge.score = score
+
+
+def rate(func, edge_count):
+    """ Return rows per second for calling func. """
+    start = time.time()
+    func()
+
+    return edge_count / (time.time() - start)
+
+
+def run(edge_count):
+    directory = tempfile.mkdtemp()
+
+    try:
+        source = os.path.join(directory, 'edges.tsv.gz')
+        write_edge_list(source, edge_count)
+
+        results = []
+
+        graph = Graph(name='benchmark')
+        results.append(('managers', rate(
+            lambda: manager_import(graph, source), edge_count
+        )))
+
+        graph = Graph(name='benchmark')
+        results.append(('import', rate(
+            lambda: import_edges(graph, source), edge_count
+        )))
+
+        store = SQLiteGraphStore(
+            name='benchmark', path=os.path.join(directory, 'graph.db')
+        )
+        sqlite_graph = Graph(name='benchmark', store=store)
+        results.append(('import sqlite', rate(
+            lambda: import_edges(sqlite_graph, source), edge_count
+        )))
+        store.close()
+
+        target = os.path.join(directory, 'export.tsv.gz')
+        results.append(('export', rate(
+            lambda: export_edges(graph, target), graph.store.edge_count
+        )))
+
+        print '{0:>16} {1:>16}'.format('operation', 'rows per sec')
+        for label, value in results:
+            print '{0:>16} {1:>16.0f}'.format(label, value)
+
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run(int(sys.argv[1]))
+    else:
+        run(1000000)
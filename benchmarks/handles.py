@@ -0,0 +1,132 @@
+"""
+Benchmark memory use and dictionary lookup throughput for Node and Edge
+handles, comparing the slotted handles in `nodegraph.lowlevel` against the
+previous `__dict__`-based objects which rebuilt their key on every hash.
+
+Usage: python benchmarks/handles.py [edge_count]
+"""
+import sys
+import time
+
+from nodegraph.graph import Graph
+from nodegraph.lowlevel import Node, Edge
+
+
+class LegacyNode(object):
+    """ Node as implemented before handles were slotted. """
+
+    def __init__(self, graph, name):
+        self.name = name
+        self.graph = graph
+
+    def key(self):
+        return (self.graph.key(), self.name)
+
+    def __eq__(x, y):
+        return x.key() == y.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+
+class LegacyEdge(object):
+    """ Edge as implemented before handles were slotted. """
+
+    def __init__(self, graph, from_node, to_node):
+        self.graph = graph
+        self.from_node = from_node
+        self.to_node = to_node
+
+    def key(self):
+        return (self.from_node.key(), self.to_node.key())
+
+    def __eq__(x, y):
+        return x.key() == y.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+
+def legacy_node(graph, name):
+    return LegacyNode(graph, name)
+
+
+def slotted_node(graph, name):
+    return Node(graph, graph.store.intern(name), name)
+
+
+def build_edges(graph, node_factory, edge_cls, edge_count):
+    """ Build edge_count edges over roughly sqrt(edge_count) nodes. """
+    node_count = int(edge_count ** 0.5) + 2
+
+    nodes = [node_factory(graph, 'node_%d' % i) for i in xrange(node_count)]
+
+    edges = []
+    for i in xrange(node_count):
+        for j in xrange(node_count):
+            if i != j:
+                edges.append(edge_cls(graph, nodes[i], nodes[j]))
+
+                if len(edges) == edge_count:
+                    return edges
+
+    return edges
+
+
+def edge_size(edge):
+    """ Approximate number of bytes owned by a single Edge. """
+    size = sys.getsizeof(edge)
+
+    if hasattr(edge, '__dict__'):
+        size += sys.getsizeof(edge.__dict__)
+    else:
+        size += sys.getsizeof(edge._key) + sys.getsizeof(edge._hash)
+
+    return size
+
+
+def lookups_per_second(edges):
+    """ Time looking up every Edge in a dictionary keyed on Edges. """
+    scores = dict.fromkeys(edges, 0)
+
+    # Equal but distinct handles, as created by separate requests
+    probes = [
+        type(edge)(edge.graph, edge.from_node, edge.to_node) for edge in edges
+    ]
+
+    start = time.time()
+    for probe in probes:
+        scores[probe]
+    duration = time.time() - start
+
+    return len(probes) / duration
+
+
+def run(edge_count):
+    graph = Graph(name='benchmark')
+
+    results = []
+    for label, node_factory, edge_cls in (
+        ('legacy', legacy_node, LegacyEdge),
+        ('slotted', slotted_node, Edge)
+    ):
+        edges = build_edges(graph, node_factory, edge_cls, edge_count)
+
+        results.append((
+            label, edge_size(edges[0]), lookups_per_second(edges)
+        ))
+
+        del edges
+
+    print '{0:>10} {1:>16} {2:>16}'.format(
+        'handles', 'bytes per edge', 'lookups per sec'
+    )
+    for label, size, rate in results:
+        print '{0:>10} {1:>16} {2:>16.0f}'.format(label, size, rate)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run(int(sys.argv[1]))
+    else:
+        run(1000000)
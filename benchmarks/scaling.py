@@ -0,0 +1,189 @@
+"""
+Scaling benchmark reporting how GraphStore memory and EnsembleManager.get()
+latency grow with graph size, ensemble_max_recursion and
+ensemble_weight_cutoff, on seeded synthetic power-law graphs.
+
+Every size is measured in a separate process, so memory is not shared
+between sizes. Results are written as JSON.
+
+Usage: python benchmarks/scaling.py [--sizes 1000,10000,100000,1000000]
+           [--recursions 2,3,4] [--cutoffs 0.01,0.003,0.001]
+           [--queries 10] [--seed 0] [--output results.json]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+
+from nodegraph.generators import generate_graph
+from nodegraph.graph import Graph
+
+# Format version of the results
+FORMAT = 1
+
+
+def resident_bytes():
+    """
+    Return the resident memory of this process; the peak resident memory
+    where the current value is not available.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+
+        return pages * resource.getpagesize()
+
+    except IOError:
+        # Kilobytes on Linux, bytes on OS X
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        if sys.platform == 'darwin':
+            return peak
+
+        return peak * 1024
+
+
+def measure(edge_count, recursions, cutoffs, queries, seed):
+    """ Return measurements for a single graph size. """
+    before = resident_bytes()
+
+    graph = Graph(name='scaling')
+    start = time.time()
+    generate_graph(graph, edge_count, seed=seed)
+    build_seconds = time.time() - start
+
+    store = graph.store
+    memory = resident_bytes() - before
+
+    # Keep cached values for the duration of the benchmark
+    graph.ttl = 3600
+
+    # Query pairs of linked Nodes
+    rng = random.Random(seed)
+    edges = list(store.iter_edges())
+
+    pairs = []
+    for i in xrange(queries):
+        from_id, to_id = rng.choice(edges)
+        pairs.append((
+            graph.nodes.get_by_id(from_id), graph.nodes.get_by_id(to_id)
+        ))
+
+    del edges
+
+    ensembles = []
+    for max_recursion in recursions:
+        for weight_cutoff in cutoffs:
+            graph.ensemble_max_recursion = max_recursion
+            graph.ensemble_weight_cutoff = weight_cutoff
+
+            paths = 0
+            latencies = []
+            for from_node, to_node in pairs:
+                # Cold cache for every query
+                store.cache.flush()
+
+                start = time.time()
+                ensemble = graph.ensembles.get(from_node, to_node)
+                latencies.append(time.time() - start)
+
+                paths += len(ensemble.paths)
+
+            latencies.sort()
+
+            ensembles.append({
+                'max_recursion': max_recursion,
+                'weight_cutoff': weight_cutoff,
+                'queries': len(latencies),
+                'mean_seconds': sum(latencies) / len(latencies),
+                'median_seconds': latencies[len(latencies) // 2],
+                'max_seconds': latencies[-1],
+                'mean_paths': float(paths) / len(latencies),
+            })
+
+    return {
+        'size': edge_count,
+        'nodes': sum(1 for node_id in store.iter_nodes()),
+        'edges': store.edge_count,
+        'build_seconds': build_seconds,
+        'memory_bytes': memory,
+        'memory_bytes_per_edge': float(memory) / store.edge_count,
+        'ensembles': ensembles,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--sizes', default='1000,10000,100000,1000000',
+        help='comma separated numbers of edges to generate'
+    )
+    parser.add_argument(
+        '--recursions', default='2,3,4',
+        help='comma separated values for ensemble_max_recursion'
+    )
+    parser.add_argument(
+        '--cutoffs', default='0.01,0.003,0.001',
+        help='comma separated values for ensemble_weight_cutoff'
+    )
+    parser.add_argument(
+        '--queries', type=int, default=10, help='ensembles per measurement'
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='file to write JSON results to')
+    parser.add_argument('--single', action='store_true', help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+
+    recursions = [int(value) for value in args.recursions.split(',')]
+    cutoffs = [float(value) for value in args.cutoffs.split(',')]
+
+    if args.single:
+        # Measure a single size, writing the result to stdout
+        json.dump(measure(
+            int(args.sizes), recursions, cutoffs, args.queries, args.seed
+        ), sys.stdout)
+
+        return
+
+    results = []
+    for size in args.sizes.split(','):
+        # Run with the same optimization flags
+        flags = ['-O'] * sys.flags.optimize
+
+        output = subprocess.check_output([sys.executable] + flags + [
+            os.path.abspath(__file__), '--single',
+            '--sizes', size,
+            '--recursions', args.recursions,
+            '--cutoffs', args.cutoffs,
+            '--queries', str(args.queries),
+            '--seed', str(args.seed),
+        ])
+
+        results.append(json.loads(output))
+
+    report = {
+        'format': FORMAT,
+        'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
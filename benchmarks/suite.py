@@ -0,0 +1,179 @@
+"""
+Benchmark suite timing common Graph operations on the Wikipedia link graph
+at several graph sizes, with a cold and a warm GraphCache.
+
+Results are written as JSON, so runs for different releases can be compared
+to catch performance regressions. Without dump files the bundled sample is
+used.
+
+Usage: python benchmarks/suite.py [--page page.sql.gz
+           --pagelinks pagelinks.sql.gz [--linktarget linktarget.sql.gz]]
+           [--sizes 10000,100000] [--count 1000] [--output results.json]
+"""
+import argparse
+import datetime
+import json
+import platform
+import random
+import sys
+import time
+
+from nodegraph.graph import Graph
+from nodegraph.wikipedia import load_pagelinks, load_sample
+
+# Format version of the results
+FORMAT = 1
+
+
+def timed(func, items, cache=None, flush=None):
+    """
+    Return seconds taken calling func for every item. For a cold cache
+    flush is called before every call, for a warm cache func is called for
+    every item before timing.
+    """
+    if cache == 'warm':
+        for item in items:
+            func(item)
+
+    start = time.time()
+
+    if cache == 'cold':
+        for item in items:
+            flush()
+            func(item)
+    else:
+        for item in items:
+            func(item)
+
+    return time.time() - start
+
+
+def operations(graph, rng, count):
+    """
+    Return a list of `(operation, function, items, cached)` for a Graph,
+    with cached indicating whether the operation uses the GraphCache.
+    """
+    nodes = list(graph.nodes.all())
+    edges = list(graph.edges.all())
+
+    def sample(items, size):
+        return [rng.choice(items) for i in xrange(size)]
+
+    node_names = [node.name for node in sample(nodes, count)]
+    node_pairs = [
+        (edge.from_node, edge.to_node) for edge in sample(edges, count)
+    ]
+
+    # Ensembles recurse over many paths; keep the number of queries small
+    ensemble_pairs = node_pairs[:max(count // 100, 1)]
+
+    return [
+        ('node_lookup', graph.nodes.get, node_names, False),
+        ('edge_lookup', lambda pair: graph.edges.get(*pair), node_pairs, False),
+        ('edge_weight', lambda edge: edge.get_weight(),
+            sample(edges, count), True),
+        ('node_score_out', lambda node: node.get_score_out(),
+            sample(nodes, count), True),
+        ('ensemble', lambda pair: graph.ensembles.get(*pair),
+            ensemble_pairs, True),
+    ]
+
+
+def run_size(load, size, count, seed=0):
+    """ Return the results for a Graph with at most size Edges. """
+    graph = Graph(name='benchmark')
+
+    # Keep cached values for the duration of the benchmark
+    graph.ttl = 3600
+
+    start = time.time()
+    edge_count = load(graph, limit=size)
+    load_seconds = time.time() - start
+
+    rng = random.Random(seed)
+
+    results = []
+
+    def result(operation, cache, items, seconds):
+        results.append({
+            'size': size,
+            'nodes': len(graph.nodes.all()),
+            'edges': edge_count,
+            'operation': operation,
+            'cache': cache,
+            'count': len(items),
+            'seconds': seconds,
+            'per_second': len(items) / seconds if seconds else None,
+        })
+
+    result('load', None, xrange(edge_count), load_seconds)
+
+    flush = graph.store.cache.flush
+
+    for operation, func, items, cached in operations(graph, rng, count):
+        if cached:
+            for cache in ('cold', 'warm'):
+                flush()
+                result(operation, cache, items, timed(func, items, cache, flush))
+        else:
+            result(operation, None, items, timed(func, items))
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--page', help='page table dump')
+    parser.add_argument('--pagelinks', help='pagelinks table dump')
+    parser.add_argument('--linktarget', help='linktarget table dump')
+    parser.add_argument(
+        '--sizes', help='comma separated numbers of edges to load'
+    )
+    parser.add_argument(
+        '--count', type=int, default=1000, help='operations per measurement'
+    )
+    parser.add_argument('--output', help='file to write JSON results to')
+
+    args = parser.parse_args(argv)
+
+    if args.page and args.pagelinks:
+        dataset = args.pagelinks
+        sizes = [10000, 100000, 1000000]
+
+        def load(graph, limit):
+            return load_pagelinks(
+                graph, args.page, args.pagelinks, args.linktarget,
+                limit=limit
+            )
+
+    else:
+        dataset = 'sample'
+        sizes = [100, 200, 400]
+        load = load_sample
+
+    if args.sizes:
+        sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = []
+    for size in sizes:
+        results.extend(run_size(load, size, args.count))
+
+    report = {
+        'format': FORMAT,
+        'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'dataset': dataset,
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
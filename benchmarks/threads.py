@@ -0,0 +1,101 @@
+"""
+Benchmark concurrent score increments on the in-memory GraphStore,
+reporting throughput by thread count for a single lock and for striped
+locks, through GraphStore.increase_score() and Edge.increase_score().
+
+Under CPython the GIL runs one thread at a time, so throughput stays flat
+with thread count rather than growing; what this shows is that the locks
+cost no throughput as writers are added. Striping only pays off where
+threads run in parallel, like stores releasing the GIL in C code.
+
+Usage: python benchmarks/threads.py [edge_count] [increments]
+"""
+import random
+import sys
+import threading
+import time
+
+from nodegraph.generators import generate_graph
+from nodegraph.graph import Graph
+from nodegraph.store import GraphStore
+
+
+def store_increments(graph, edges, count):
+    """ Increase scores through the store. """
+    increase_score = graph.store.increase_score
+
+    for from_id, to_id in edges[:count]:
+        increase_score(from_id, to_id, 1)
+
+
+def edge_increments(graph, edges, count):
+    """ Increase scores through Edges, invalidating cached values. """
+    get_by_id = graph.nodes.get_by_id
+    get = graph.edges.get
+
+    for from_id, to_id in edges[:count]:
+        get(get_by_id(from_id), get_by_id(to_id)).increase_score(1)
+
+
+def run_threads(func, graph, edges, thread_count, increments):
+    """ Return increments per second with thread_count threads. """
+    per_thread = increments // thread_count
+
+    # Every thread increments its own random sample of edges
+    samples = [
+        [random.choice(edges) for i in xrange(per_thread)]
+        for i in xrange(thread_count)
+    ]
+
+    threads = [
+        threading.Thread(target=func, args=(graph, sample, per_thread))
+        for sample in samples
+    ]
+
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.time() - start
+
+    return per_thread * thread_count / duration
+
+
+def run(count, increments):
+    random.seed(0)
+
+    methods = (('store', store_increments), ('edge', edge_increments))
+
+    results = []
+    for stripes in (1, 64):
+        graph = Graph(
+            name='benchmark',
+            store=GraphStore(name='benchmark', stripes=stripes)
+        )
+        generate_graph(graph, count, seed=0)
+
+        edges = list(graph.store.iter_edges())
+
+        for label, func in methods:
+            for thread_count in (1, 2, 4, 8):
+                rate = run_threads(
+                    func, graph, edges, thread_count, increments
+                )
+
+                results.append((stripes, label, thread_count, rate))
+
+    print '{0:>8} {1:>8} {2:>8} {3:>20}'.format(
+        'stripes', 'method', 'threads', 'increments per sec'
+    )
+    for stripes, label, thread_count, rate in results:
+        print '{0:>8} {1:>8} {2:>8} {3:>20.0f}'.format(
+            stripes, label, thread_count, rate
+        )
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    increments = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+
+    run(count, increments)
@@ -0,0 +1,58 @@
+"""
+Benchmark weighting every Edge of a synthetic power-law Graph, comparing
+Edge.get_weight() per Edge against the vectorized edge_weights() for the
+in-memory and CSR stores.
+
+Usage: python benchmarks/weights.py [edge_count]
+"""
+import sys
+import time
+
+from nodegraph.csr import CSRGraphStore
+from nodegraph.generators import generate_graph
+from nodegraph.graph import Graph
+from nodegraph.store import GraphStore
+from nodegraph.weights import edge_weights
+
+
+def per_edge(graph):
+    """ Weigh every Edge through Edge.get_weight(). """
+    for edge in graph.edges.all():
+        edge.get_weight()
+
+
+def vectorized(graph):
+    """ Weigh every Edge in a single call. """
+    edge_weights(graph)
+
+
+def run(count):
+    stores = (('memory', GraphStore), ('csr', CSRGraphStore))
+
+    results = []
+    for store_label, store_class in stores:
+        graph = Graph(name='benchmark', store=store_class(name='benchmark'))
+        generate_graph(graph, count)
+
+        if store_class is CSRGraphStore:
+            graph.store.merge()
+
+        for label, func in (('per_edge', per_edge), ('vectorized', vectorized)):
+            start = time.time()
+            func(graph)
+            duration = time.time() - start
+
+            results.append((
+                store_label, label, graph.store.edge_count / duration
+            ))
+
+    print '{0:>10} {1:>12} {2:>20}'.format('store', 'method', 'edges per sec')
+    for store_label, label, rate in results:
+        print '{0:>10} {1:>12} {2:>20.0f}'.format(store_label, label, rate)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run(int(sys.argv[1]))
+    else:
+        run(1000000)
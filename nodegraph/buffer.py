@@ -0,0 +1,217 @@
+import atexit
+import threading
+import time
+import weakref
+
+
+# Open ScoreBuffers, closed at exit
+_buffers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_at_exit():
+    """ Close ScoreBuffers still open at exit. """
+    for buffer in list(_buffers):
+        buffer.close()
+
+
+class ScoreBuffer(object):
+    """
+    Write-combining buffer for Edge score deltas, merging the deltas per
+    Edge in memory before writing them to the store.
+
+    Attached to a Graph as `graph.score_buffer`, Edge.increase_score() and
+    decrease_score() add to the buffer instead of writing the store. The
+    buffer is flushed, writing the combined deltas in a single batch and
+    invalidating cached values depending on the changed Edges, once
+    `flush_size` Edges have pending deltas or `flush_interval` seconds have
+    passed since the last flush. Edge.score, Edge.get_weight() and
+    Node.get_score_out() include pending deltas right away, computed without
+    the cache while deltas are pending for the originating Node. Path and
+    Ensemble weights cached before deltas were added remain until the
+    flush.
+
+    For stores which are `thread_safe` the interval is enforced by a
+    background timer, so deltas on Edges which go quiet are written as
+    well. Other stores, like SQLiteGraphStore and CSRGraphStore, are only
+    written from the calling threads: the interval is checked when deltas
+    are added, call flush() to write deltas left pending. Pending deltas
+    are written on close() and at exit; `flush_interval=None` only flushes
+    on size.
+
+    Deltas combine exactly: a score never decreases below 0 at any step, as
+    if every delta had been written on its own.
+    """
+
+    def __init__(self, store, flush_size=1000, flush_interval=1.0,
+                 timer=time.time):
+        self.store = store
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        # Allow for pluggable timer, eases testing
+        self.timer = timer
+
+        # Pending `(delta, floor)` per `(from id, to id)`, updating a score
+        # to max(score + delta, floor)
+        self.pending = {}
+        self.flushed = self.timer()
+
+        # To ids of pending deltas per from id
+        self.pending_out = {}
+
+        # Guards pending deltas while adding and flushing
+        self.lock = threading.Lock()
+
+        # Deltas added and Edges written
+        self.deltas = 0
+        self.writes = 0
+
+        # Flushes pending deltas when no further deltas are added
+        self._flush_timer = None
+
+        _buffers.add(self)
+
+    def add(self, from_id, to_id, delta):
+        """ Add a delta to the score of an edge. """
+        key = (from_id, to_id)
+
+        with self.lock:
+            pending = self.pending
+
+            # Apply delta after the pending update, starting with identity
+            combined, floor = pending.get(key, (0, 0))
+
+            floor += delta
+            if floor < 0:
+                floor = 0
+
+            pending[key] = (combined + delta, floor)
+            self.pending_out.setdefault(from_id, set()).add(to_id)
+
+            self.deltas += 1
+
+            interval = self.flush_interval
+
+            if len(pending) >= self.flush_size or (
+                interval is not None and
+                self.timer() - self.flushed >= interval
+            ):
+                self._flush()
+
+            elif self._flush_timer is None and self._timed():
+                self._flush_timer = threading.Timer(interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _timed(self):
+        """ Return whether flushes are timed from a background thread. """
+        return self.flush_interval is not None and self.store.thread_safe
+
+    def has_pending(self, from_id):
+        """ Return whether deltas are pending for edges from node id. """
+        return from_id in self.pending_out
+
+    def get_score(self, from_id, to_id):
+        """ Return the score for an edge including pending deltas. """
+        # Read the store under the lock, so a flush is seen entirely or not
+        with self.lock:
+            store = self.store
+
+            score = store.get_score(from_id, to_id)
+            update = self.pending.get((from_id, to_id))
+
+            # Like the store, ignore deltas for edges not in it
+            if update is None or not store.has_edge(from_id, to_id):
+                return score
+
+        delta, floor = update
+
+        return max(score + delta, floor)
+
+    def get_score_out(self, from_id):
+        """
+        Return the total score of edges from node id including pending
+        deltas.
+        """
+        with self.lock:
+            store = self.store
+            pending = self.pending
+
+            total = store.score_out(from_id)
+
+            for to_id in self.pending_out.get(from_id, ()):
+                if not store.has_edge(from_id, to_id):
+                    continue
+
+                score = store.get_score(from_id, to_id)
+                delta, floor = pending[(from_id, to_id)]
+
+                total += max(score + delta, floor) - score
+
+        return total
+
+    def discard(self, from_id, to_id):
+        """
+        Drop pending deltas for an edge, for when its score is set or the
+        edge is removed.
+        """
+        with self.lock:
+            if self.pending.pop((from_id, to_id), None) is None:
+                return
+
+            to_ids = self.pending_out[from_id]
+            to_ids.discard(to_id)
+
+            if not to_ids:
+                del self.pending_out[from_id]
+
+    def flush(self):
+        """ Write all pending deltas, returns the number of edges written. """
+        with self.lock:
+            return self._flush()
+
+    def close(self):
+        """
+        Write all pending deltas and stop the flush timer. Deltas added
+        afterwards are no longer written at exit.
+        """
+        self.flush()
+
+        _buffers.discard(self)
+
+    def _flush(self):
+        """ Write all pending deltas, the lock should be held. """
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        pending = self.pending
+        self.flushed = self.timer()
+
+        if not pending:
+            return 0
+
+        store = self.store
+
+        # Plain deltas, clamped at 0, are written in a single batch
+        store.increase_scores(
+            (from_id, to_id, delta)
+            for (from_id, to_id), (delta, floor) in pending.iteritems()
+            if not floor
+        )
+
+        # Scores raised above a floor are corrected afterwards
+        for (from_id, to_id), (delta, floor) in pending.iteritems():
+            if floor and store.increase_score(from_id, to_id, delta) < floor:
+                store.set_score(from_id, to_id, floor)
+
+        store.cache.invalidate_many(
+            set(from_id for from_id, to_id in pending)
+        )
+
+        self.pending = {}
+        self.pending_out = {}
+        self.writes += len(pending)
+
+        return len(pending)
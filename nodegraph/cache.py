@@ -1,3 +1,10 @@
+import collections
+import functools
+import heapq
+import sys
+import threading
+import time
+
 from .utils import seconds
 
 
@@ -5,18 +12,151 @@ class GraphCache(object):
     """
     Cache for Graph data, emulates a simple key-value store with expiry date.
 
+    The cache is unbounded by default. When `max_entries` or `max_bytes` is
+    given, entries are evicted as soon as either limit is exceeded: expired
+    entries first, then the least recently used (policy 'lru') or least
+    frequently used (policy 'lfu') entries. Entries are evicted in batches
+    of `evict_fraction` of the limit, so finding them is amortized over many
+    writes. Sizes are approximate, see entry_size().
+
+    Expiry times are indexed in a min-heap. Every set() reclaims up to
+    `sweep_count` expired entries from the top of the heap, so entries which
+    are never read again do not accumulate; sweep() reclaims all of them.
+
+    Entries may be set with the sources they were computed from, e.g. the
+    ids of the Nodes whose outgoing Edges determine a weight. invalidate()
+    removes exactly the entries depending on a source.
+
+    Statistics are kept per kind of key, see stats().
+
+    The cache is safe for use by multiple threads. Every invalidate() and
+    flush() bumps `version`, which is recorded for the invalidated source;
+    values computed since a flush or an invalidation of one of their
+    sources may be stale and are not written, see set(). Sources share
+    `VERSION_SLOTS` recorded versions by hash, so rarely a value is
+    rejected for an unrelated source.
+
     Note: this is only a wrapper used for dependency-free testing for now.
     Warning: there might be rounding isssues considering the expiry time.
     """
-    def __init__(self, timer=seconds):
-        """ Set timer, emtpy cache and expires dictionaries. """
+
+    # Approximate bytes used per entry by the internal dictionaries
+    ENTRY_OVERHEAD = 200
+
+    # Number of versions recorded for invalidated sources
+    VERSION_SLOTS = 4096
+
+    # Statistics kept per kind of key
+    COUNTERS = (
+        'hits', 'misses', 'miss_seconds', 'expirations', 'evictions',
+        'invalidations'
+    )
+
+    def __init__(self, timer=seconds, max_entries=None, max_bytes=None,
+                 policy='lru', evict_fraction=0.1, sweep_count=2):
+        """ Set timer and limits, emtpy cache and expires dictionaries. """
 
         # Allow for pluggable timer, eases testing
         self.timer = timer
 
+        # Size limits
+        assert policy in ('lru', 'lfu')
+        assert 0 < evict_fraction <= 1
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.evict_fraction = evict_fraction
+
+        self.bounded = max_entries is not None or max_bytes is not None
+
+        # Expired entries reclaimed per set(), at least one for every entry
+        assert sweep_count >= 1
+        self.sweep_count = sweep_count
+
+        # Number of entries evicted for size limits, removed on expiry and
+        # invalidated by changes to their sources
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+        # Guards all cache structures
+        self._lock = threading.Lock()
+
+        # Number of invalidations and flushes, and the version of the last
+        # invalidation per slot of sources
+        self.version = 0
+        self._source_versions = [0] * self.VERSION_SLOTS
+
+        # Statistics per kind of key
+        self.reset_stats()
+
         # Flush the cache
         self.flush()
 
+    @staticmethod
+    def key_kind(key):
+        """
+        Return the kind of a key for statistics; the name of cached values
+        for `(object, name)` keys, prefixed by the object type for weights.
+        """
+        if not isinstance(key, tuple) or len(key) != 2:
+            return 'other'
+
+        obj, name = key
+
+        if name == 'weight':
+            return type(obj).__name__.lower() + '_weight'
+
+        return name
+
+    def count(self, counter, kind, amount=1):
+        """ Add amount to a counter for a kind of key. """
+        with self._lock:
+            self._counts[counter][kind] += amount
+
+    def _count_removed(self, counter, key):
+        """ Count a removed key towards a counter for its kind. """
+        self._counts[counter][self.key_kind(key)] += 1
+
+    def stats(self):
+        """
+        Return a dictionary of statistics per kind of key with counts of
+        hits, misses, expirations, evictions and invalidations, the seconds
+        spent computing values on misses and the current number of entries
+        as `size`. Hits and misses are counted by cache_value().
+        """
+        with self._lock:
+            keys = self._cache.keys()
+            counts = dict(
+                (counter, dict(kinds))
+                for counter, kinds in self._counts.iteritems()
+            )
+
+        sizes = collections.Counter(self.key_kind(key) for key in keys)
+
+        kinds = set(sizes)
+        for kind_counts in counts.itervalues():
+            kinds.update(kind_counts)
+
+        stats = {}
+        for kind in kinds:
+            stats[kind] = dict(
+                (counter, counts[counter].get(kind, 0))
+                for counter in self.COUNTERS
+            )
+            stats[kind]['size'] = sizes.get(kind, 0)
+
+        return stats
+
+    def reset_stats(self):
+        """ Reset all statistics. """
+        # Replaced at once, no lock required
+        self._counts = dict(
+            (counter, collections.defaultdict(int))
+            for counter in self.COUNTERS
+        )
+
     def generate_expires(self, ttl):
         """ Generate expiration time using ttl. """
         assert isinstance(ttl, int)
@@ -29,11 +169,264 @@ class GraphCache(object):
         assert isinstance(expires, int), '{0} is not an integer'.format(expires)
         return expires
 
-    def set(self, key, value, ttl):
-        """ Set a key to value with given ttl. """
+    def entry_size(self, key, value):
+        """
+        Approximate size in bytes of a cache entry; objects referred to by
+        the key and value, shared with the Graph, are not counted.
+        """
+        return sys.getsizeof(key) + sys.getsizeof(value) + self.ENTRY_OVERHEAD
+
+    def set(self, key, value, ttl, sources=None, version=None):
+        """
+        Set a key to value with given ttl, depending on an iterable of
+        sources when given. When version is given, the value is only written
+        if neither the cache was flushed nor any of the sources invalidated
+        since `version` was read; returns whether the value was written.
+        """
+
+        expires = self.generate_expires(ttl)
+
+        if sources:
+            sources = tuple(sources)
+
+        with self._lock:
+            if version is not None and self._stale(version, sources):
+                return False
+
+            self._set(key, value, ttl, sources, expires)
+
+        return True
+
+    def _stale(self, version, sources):
+        """
+        Return whether a value computed from sources at version is stale,
+        the lock should be held.
+        """
+        if self._flushed > version:
+            return True
+
+        if not sources:
+            return False
+
+        versions = self._source_versions
+        slots = len(versions)
+
+        for source in sources:
+            if versions[hash(source) % slots] > version:
+                return True
+
+        return False
+
+    def _set(self, key, value, ttl, sources, expires):
+        """ Set a key, the lock should be held. """
 
         self._cache[key] = value
-        self._expires[key] = self.generate_expires(ttl)
+        self._expires[key] = expires
+
+        # Replace dependencies of a previous value
+        if key in self._sources:
+            self._unlink(key)
+
+        if sources:
+            sources = tuple(sources)
+            self._sources[key] = sources
+
+            dependents = self._dependents
+            for source in sources:
+                try:
+                    dependents[source].add(key)
+                except KeyError:
+                    dependents[source] = set([key])
+
+        # Index the expiry time, entries are unique by sequence number
+        heap = self._heap
+        self._sequence += 1
+        heapq.heappush(heap, (expires, self._sequence, key))
+
+        # Reclaim a few expired entries, without calling the timer again
+        now = expires - ttl
+        if now > heap[0][0]:
+            self._sweep(self.sweep_count, now)
+
+        # Drop outdated heap entries of keys set or deleted before expiry
+        if len(heap) > 2 * len(self._cache) + 64:
+            self._reindex()
+
+        if self.bounded:
+            self._use(key)
+
+            if self.max_bytes is not None:
+                size = self.entry_size(key, value)
+
+                self.bytes += size - self._sizes.get(key, 0)
+                self._sizes[key] = size
+
+            if self._exceeds(self.max_entries, self.max_bytes):
+                self._evict()
+
+    def _use(self, key):
+        """ Register use of a key for eviction. """
+        if self.policy == 'lru':
+            self._clock += 1
+            self._usage[key] = self._clock
+        else:
+            self._usage[key] = self._usage.get(key, 0) + 1
+
+    def _exceeds(self, max_entries, max_bytes):
+        """ Return whether the cache exceeds either limit, if given. """
+        return (
+            (max_entries is not None and len(self._cache) > max_entries) or
+            (max_bytes is not None and self.bytes > max_bytes)
+        )
+
+    def sweep(self, limit=None, now=None):
+        """
+        Remove expired entries in order of expiry, returns the number of
+        entries removed. At most limit entries of the expiry heap are
+        processed, when given.
+        """
+        if now is None:
+            now = self.timer()
+
+        with self._lock:
+            return self._sweep(limit, now)
+
+    def _sweep(self, limit, now):
+        """ Remove expired entries, the lock should be held. """
+
+        # Local lookups for the loop
+        heap = self._heap
+        pop = heapq.heappop
+        expires = self._expires
+
+        removed = 0
+        processed = 0
+        while heap and now > heap[0][0]:
+            if limit is not None and processed >= limit:
+                break
+
+            expiry, sequence, key = pop(heap)
+            processed += 1
+
+            # Keys set again or deleted leave outdated heap entries
+            if expires.get(key) == expiry:
+                self._remove(key)
+                self._count_removed('expirations', key)
+                removed += 1
+
+        self.expirations += removed
+
+        return removed
+
+    def _reindex(self):
+        """ Rebuild the expiry heap from the current expiry times. """
+        self._heap = [
+            (expires, sequence, key) for sequence, (key, expires)
+            in enumerate(self._expires.iteritems())
+        ]
+        heapq.heapify(self._heap)
+
+        self._sequence = len(self._heap)
+
+    def evict(self):
+        """
+        Remove expired entries, then evict entries according to the policy
+        until the cache is `evict_fraction` below its limits.
+        """
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        """ Evict entries, the lock should be held. """
+        self._sweep(None, self.timer())
+
+        # Limits after eviction
+        keep = 1 - self.evict_fraction
+
+        max_entries = self.max_entries
+        if max_entries is not None:
+            max_entries = int(max_entries * keep)
+
+        max_bytes = self.max_bytes
+        if max_bytes is not None:
+            max_bytes = int(max_bytes * keep)
+
+        if not self._exceeds(max_entries, max_bytes):
+            return
+
+        # Least recently or least frequently used first
+        for key in sorted(self._usage, key=self._usage.__getitem__):
+            self._remove(key)
+            self._count_removed('evictions', key)
+            self.evictions += 1
+
+            if not self._exceeds(max_entries, max_bytes):
+                break
+
+    def invalidate(self, source):
+        """
+        Remove all entries depending on source, returns the number of
+        entries removed.
+        """
+        with self._lock:
+            return self._invalidate(source)
+
+    def _invalidate(self, source):
+        """ Invalidate a source, the lock should be held. """
+        self.version += 1
+        self._source_versions[
+            hash(source) % len(self._source_versions)
+        ] = self.version
+
+        keys = self._dependents.pop(source, None)
+
+        if not keys:
+            return 0
+
+        for key in keys:
+            self._remove(key)
+            self._count_removed('invalidations', key)
+
+        self.invalidations += len(keys)
+
+        return len(keys)
+
+    def invalidate_many(self, sources):
+        """
+        Remove all entries depending on any of an iterable of sources,
+        returns the number of entries removed.
+        """
+        invalidate = self._invalidate
+
+        with self._lock:
+            return sum(invalidate(source) for source in sources)
+
+    def _unlink(self, key):
+        """ Remove the dependencies of a key. """
+        dependents = self._dependents
+
+        for source in self._sources.pop(key):
+            keys = dependents.get(source)
+
+            # Sources being invalidated have been removed already
+            if keys is not None:
+                keys.discard(key)
+
+                if not keys:
+                    del dependents[source]
+
+    def _remove(self, key):
+        """ Remove an existing key from the cache. """
+        del self._cache[key]
+        del self._expires[key]
+
+        if key in self._sources:
+            self._unlink(key)
+
+        if self.bounded:
+            del self._usage[key]
+
+            self.bytes -= self._sizes.pop(key, 0)
 
     def get_expires(self, key):
         """ Get the expiration time for a particular key or return None. """
@@ -54,9 +447,14 @@ class GraphCache(object):
         """
         Get the key if not expired. If expired, remove key, return None.
         """
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key):
+        """ Get the key, the lock should be held. """
         expires = self.get_expires(key)
 
-        if not expires:
+        if expires is None:
             # Key does not exist
             return None
 
@@ -66,17 +464,46 @@ class GraphCache(object):
             assert key in self._cache
 
             # Delete keys
-            del self._expires[key]
-            del self._cache[key]
+            self._remove(key)
+            self._count_removed('expirations', key)
+            self.expirations += 1
 
             # Return None
             return None
 
+        if self.bounded:
+            self._use(key)
+
         # Key available
         return self._cache[key]
 
+    def keys(self):
+        """ Return a list of all keys in the cache, including expired keys. """
+
+        return self._cache.keys()
+
+    def __len__(self):
+        """ Number of entries in the cache, including expired entries. """
+
+        return len(self._cache)
+
+    def delete(self, key):
+        """ Remove a key from the cache, if present. """
+
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+
     def flush(self):
         """ Flush the cache """
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        """ Flush the cache, the lock should be held. """
+        # Values computed before flushing are outdated
+        self.version += 1
+        self._flushed = self.version
 
         # Key -> value store
         self._cache = {}
@@ -84,39 +511,86 @@ class GraphCache(object):
         # Key -> Expiry dates
         self._expires = {}
 
+        # Key -> sources, source -> set of dependent keys
+        self._sources = {}
+        self._dependents = {}
+
+        # Min-heap of (expiry date, sequence number, key)
+        self._heap = []
+        self._sequence = 0
+
+        # Key -> last use for 'lru' or number of uses for 'lfu'
+        self._usage = {}
+        self._clock = 0
+
+        # Key -> approximate size, and total size in bytes
+        self._sizes = {}
+        self.bytes = 0
+
+
+def _get_ttl(obj):
+    """ Default ttl source, the object's get_ttl() method. """
+    return obj.get_ttl()
 
-def cache_value(key):
+
+def _get_sources(obj):
+    """ Default sources, the object's get_sources() method. """
+    return obj.get_sources()
+
+
+def cache_value(key, ttl=_get_ttl, sources=_get_sources, kind=None,
+                bypass=None):
     """
-    Caching decorator using the get_ttl() method to cache values during
-    a particular time.
+    Caching decorator for computed properties of Graph objects, cached under
+    `(self, key)` in the Graph's store cache.
+
+    The value is cached for ttl(self) seconds and invalidated when any of
+    sources(self), the ids of the Nodes whose outgoing Edges it depends on,
+    change. Decorated methods take a single `use_cache` argument; when
+    False, or when bypass(self) is true, the value is computed without
+    reading or writing the cache.
+    None can not be cached, any other value including 0 can.
+
+    Hits, misses and the seconds spent computing values on misses are
+    counted in the cache statistics for kind, by default the key; it should
+    match GraphCache.key_kind() for the cache key.
     """
+    if kind is None:
+        kind = key
+
     def cache_decorator(func):
         """ Wrapper generating the decorator based on key argument. """
 
-        def wrapper(self, *args, **kwargs):
+        @functools.wraps(func)
+        def wrapper(self, use_cache=True):
             """ Method performing the actual caching. """
-            assert hasattr(self, 'graph')
-            assert hasattr(self, 'get_ttl')
+            if not use_cache or bypass and bypass(self):
+                return func(self)
 
-            cache_key = (self, 'weight')
+            cache = self.graph.store.cache
+            cache_key = (self, key)
 
             # Hit cache
-            cached = self.graph.store.cache.get(cache_key)
+            cached = cache.get(cache_key)
             if cached is not None:
+                cache.count('hits', kind)
+
                 return cached
 
             # No cached value, generate value
-            value = func(self, *args, **kwargs)
+            version = cache.version
+            start = time.time()
+            value = func(self)
 
-            # Get minimal outgoing ttl for Edges
-            ttl = self.get_ttl()
+            cache.count('misses', kind)
+            cache.count('miss_seconds', kind, time.time() - start)
 
-            # Write to cache
-            self.graph.store.cache.set(cache_key, value, ttl)
+            # Write to cache, invalidated when its sources change; unless
+            # invalidated while generating the value
+            cache.set(cache_key, value, ttl(self), sources(self), version)
 
             return value
 
         return wrapper
 
     return cache_decorator
-
@@ -0,0 +1,424 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .store import BaseGraphStore, GraphStore
+
+
+class CSRGraphStore(GraphStore):
+    """
+    Store keeping Edges in compressed sparse row (CSR) form for read-heavy
+    graphs, requires NumPy.
+
+    Merged edges are held in NumPy arrays: row offsets, destination ids,
+    scores and ttl's for outgoing edges and offsets and source ids for
+    incoming edges. Rows are sorted by destination id so single edges are
+    found with a binary search.
+
+    Mutations are written to the dictionaries inherited from GraphStore,
+    which act as a delta buffer: new edges go into the adjacency sets, score
+    and ttl writes for any edge into `edge_score` and `edge_ttl`, and
+    removed merged edges are masked in `removed`. The buffer is merged into
+    the arrays once it holds more than `delta_limit` changes or
+    `delta_ratio` times the number of merged edges, whichever is larger.
+    """
+
+    # Marker for merged edges without explicitly set ttl
+    NO_TTL = -1
+
+    # Writes go to the delta buffer and arrays without locking
+    thread_safe = False
+
+    def __init__(self, name, delta_limit=1000, delta_ratio=0.05):
+        if numpy is None:
+            raise ImportError('CSRGraphStore requires NumPy.')
+
+        super(CSRGraphStore, self).__init__(name=name)
+
+        self.delta_limit = delta_limit
+        self.delta_ratio = delta_ratio
+
+        # Merged edges not present anymore or recreated in the delta buffer
+        self.removed = set()
+
+        # Number of changes since the last merge
+        self.pending = 0
+
+        # Empty CSR arrays
+        self.offsets = numpy.zeros(1, dtype=numpy.int64)
+        self.targets = numpy.zeros(0, dtype=numpy.int64)
+        self.scores = numpy.zeros(0, dtype=numpy.int64)
+        self.ttls = numpy.zeros(0, dtype=numpy.int64)
+
+        self.in_offsets = numpy.zeros(1, dtype=numpy.int64)
+        self.sources = numpy.zeros(0, dtype=numpy.int64)
+
+    # Merged edges
+
+    def _row(self, from_id):
+        """ Return (start, end) of the merged row for node id. """
+        if from_id + 1 < len(self.offsets):
+            return self.offsets[from_id], self.offsets[from_id + 1]
+
+        return 0, 0
+
+    def _find(self, from_id, to_id):
+        """ Return array index of a merged edge, or None. """
+        start, end = self._row(from_id)
+
+        if start == end or (from_id, to_id) in self.removed:
+            return None
+
+        index = start + numpy.searchsorted(self.targets[start:end], to_id)
+
+        if index < end and self.targets[index] == to_id:
+            return index
+
+        return None
+
+    def _merged_out(self, from_id):
+        """ Return list of to ids of unmasked merged edges. """
+        start, end = self._row(from_id)
+
+        to_ids = self.targets[start:end].tolist()
+
+        if self.removed:
+            removed = self.removed
+            to_ids = [
+                to_id for to_id in to_ids if (from_id, to_id) not in removed
+            ]
+
+        return to_ids
+
+    def _changed(self):
+        """ Register a change to the delta buffer, merge when required. """
+        self.pending += 1
+
+        limit = max(self.delta_limit, self.delta_ratio * len(self.targets))
+
+        if self.pending > limit:
+            self.merge()
+
+    def merge(self):
+        """ Merge the delta buffer into the CSR arrays. """
+        row_lengths = numpy.diff(self.offsets)
+        merged_sources = numpy.repeat(
+            numpy.arange(len(row_lengths), dtype=numpy.int64), row_lengths
+        )
+
+        # Merged edges still present, with buffered score and ttl writes
+        keep = numpy.ones(len(self.targets), dtype=bool)
+        for from_id, to_id in self.removed:
+            index = self._unmasked_find(from_id, to_id)
+            if index is not None:
+                keep[index] = False
+
+        scores = self.scores.copy()
+        ttls = self.ttls.copy()
+
+        delta = set(
+            (from_id, to_id)
+            for from_id, to_ids in self.edges_from.iteritems()
+            for to_id in to_ids
+        )
+
+        for edge, score in self.edge_score.iteritems():
+            if edge not in delta:
+                index = self._find(*edge)
+                if index is not None:
+                    scores[index] = score
+
+        for edge, ttl in self.edge_ttl.iteritems():
+            if edge not in delta:
+                index = self._find(*edge)
+                if index is not None:
+                    ttls[index] = ttl
+
+        # Delta edges
+        delta = list(delta)
+        delta_sources = numpy.array(
+            [from_id for from_id, to_id in delta], dtype=numpy.int64
+        )
+        delta_targets = numpy.array(
+            [to_id for from_id, to_id in delta], dtype=numpy.int64
+        )
+        delta_scores = numpy.array(
+            [self.edge_score.get(edge, 0) for edge in delta],
+            dtype=numpy.int64
+        )
+        delta_ttls = numpy.array(
+            [self.edge_ttl.get(edge, self.NO_TTL) for edge in delta],
+            dtype=numpy.int64
+        )
+
+        sources = numpy.concatenate((merged_sources[keep], delta_sources))
+        targets = numpy.concatenate((self.targets[keep], delta_targets))
+        scores = numpy.concatenate((scores[keep], delta_scores))
+        ttls = numpy.concatenate((ttls[keep], delta_ttls))
+
+        # Every interned node gets a (possibly empty) row
+        node_count = len(self.node_names)
+
+        # Outgoing edges, sorted by source and target
+        order = numpy.lexsort((targets, sources))
+        self.targets = targets[order]
+        self.scores = scores[order]
+        self.ttls = ttls[order]
+        self.offsets = self._offsets(sources, node_count)
+
+        # Incoming edges, sorted by target and source
+        order = numpy.lexsort((sources, targets))
+        self.sources = sources[order]
+        self.in_offsets = self._offsets(targets, node_count)
+
+        # Empty delta buffer
+        self.edges_from = {}
+        self.edges_to = {}
+        self.edge_score = {}
+        self.edge_ttl = {}
+        self.removed = set()
+        self.pending = 0
+
+        assert self.edge_count == len(self.targets)
+
+    def _unmasked_find(self, from_id, to_id):
+        """ Return array index of a merged edge, ignoring `removed`. """
+        start, end = self._row(from_id)
+        index = start + numpy.searchsorted(self.targets[start:end], to_id)
+
+        if index < end and self.targets[index] == to_id:
+            return index
+
+        return None
+
+    def _offsets(self, node_ids, node_count):
+        """ Return CSR row offsets for a sorted array of row node ids. """
+        counts = numpy.bincount(node_ids, minlength=node_count)
+
+        offsets = numpy.zeros(len(counts) + 1, dtype=numpy.int64)
+        numpy.cumsum(counts, out=offsets[1:])
+
+        return offsets
+
+    # Edges
+
+    def add_edge(self, from_id, to_id):
+        """ Add an edge, returns False if it was already present. """
+        if self._find(from_id, to_id) is not None:
+            return False
+
+        if (from_id, to_id) in self.removed:
+            # Recreated, drop values buffered for the merged edge
+            self.edge_score.pop((from_id, to_id), None)
+            self.edge_ttl.pop((from_id, to_id), None)
+
+        added = super(CSRGraphStore, self).add_edge(from_id, to_id)
+
+        if added:
+            self._changed()
+
+        return added
+
+    def add_edges(self, rows):
+        """
+        Add edges from an iterable of `(from id, to id, score, ttl)` rows
+        one by one, merging the delta buffer when required.
+        """
+        BaseGraphStore.add_edges(self, rows)
+
+    def remove_edge(self, from_id, to_id):
+        """ Remove an edge along with its score and ttl. """
+        if to_id in self.edges_from.get(from_id, ()):
+            super(CSRGraphStore, self).remove_edge(from_id, to_id)
+
+        else:
+            if self._find(from_id, to_id) is None:
+                raise KeyError((from_id, to_id))
+
+            self._add_score_out(from_id, -self.get_score(from_id, to_id))
+
+            self.removed.add((from_id, to_id))
+
+            self.edge_count -= 1
+
+            self.edge_score.pop((from_id, to_id), None)
+            self.edge_ttl.pop((from_id, to_id), None)
+
+        self._changed()
+
+    def has_edge(self, from_id, to_id):
+        """ Return whether an edge is present in the store. """
+        return (
+            to_id in self.edges_from.get(from_id, ()) or
+            self._find(from_id, to_id) is not None
+        )
+
+    def iter_edges(self):
+        """ Iterate over all edges as `(from id, to id)` pairs. """
+        removed = self.removed
+
+        for from_id in xrange(len(self.offsets) - 1):
+            start, end = self.offsets[from_id], self.offsets[from_id + 1]
+
+            for to_id in self.targets[start:end].tolist():
+                if (from_id, to_id) not in removed:
+                    yield (from_id, to_id)
+
+        for edge in super(CSRGraphStore, self).iter_edges():
+            yield edge
+
+    def edges_out(self, from_id):
+        """ Return the ids of nodes linked from node id. """
+        to_ids = self._merged_out(from_id)
+        to_ids.extend(self.edges_from.get(from_id, ()))
+
+        return to_ids
+
+    def edges_in(self, to_id):
+        """ Return the ids of nodes linked to node id. """
+        if to_id + 1 < len(self.in_offsets):
+            start, end = self.in_offsets[to_id], self.in_offsets[to_id + 1]
+            from_ids = self.sources[start:end].tolist()
+        else:
+            from_ids = []
+
+        if self.removed:
+            removed = self.removed
+            from_ids = [
+                from_id for from_id in from_ids
+                if (from_id, to_id) not in removed
+            ]
+
+        from_ids.extend(self.edges_to.get(to_id, ()))
+
+        return from_ids
+
+    def scores_out(self, from_id):
+        """ Return `(to id, score)` pairs for edges from node id. """
+        start, end = self._row(from_id)
+
+        to_ids = self.targets[start:end].tolist()
+        scores = self.scores[start:end].tolist()
+
+        edge_score = self.edge_score
+        removed = self.removed
+
+        pairs = [
+            (to_id, edge_score.get((from_id, to_id), score))
+            for to_id, score in zip(to_ids, scores)
+            if (from_id, to_id) not in removed
+        ]
+
+        pairs.extend(super(CSRGraphStore, self).scores_out(from_id))
+
+        return pairs
+
+    def iter_scores(self):
+        """
+        Iterate over all edges as `(from id, to id, score)` rows, grouped by
+        from id for merged edges.
+        """
+        from_ids, to_ids, scores = self.score_arrays()
+
+        return iter(zip(from_ids.tolist(), to_ids.tolist(), scores.tolist()))
+
+    def score_arrays(self):
+        """
+        Return arrays of from ids, to ids and scores for all edges, sorted
+        by from id and to id, merging the delta buffer if required.
+        """
+        if self.pending:
+            self.merge()
+
+        from_ids = numpy.repeat(
+            numpy.arange(len(self.offsets) - 1, dtype=numpy.int64),
+            numpy.diff(self.offsets)
+        )
+
+        return from_ids, self.targets, self.scores
+
+    def ttls_out(self, from_id):
+        """
+        Return `(to id, ttl)` pairs for edges from node id, with a ttl of
+        None for edges without explicitly set ttl.
+        """
+        start, end = self._row(from_id)
+
+        to_ids = self.targets[start:end].tolist()
+        ttls = self.ttls[start:end].tolist()
+
+        edge_ttl = self.edge_ttl
+        removed = self.removed
+        no_ttl = self.NO_TTL
+
+        pairs = [
+            (to_id, edge_ttl.get(
+                (from_id, to_id), None if ttl == no_ttl else ttl
+            ))
+            for to_id, ttl in zip(to_ids, ttls)
+            if (from_id, to_id) not in removed
+        ]
+
+        pairs.extend(super(CSRGraphStore, self).ttls_out(from_id))
+
+        return pairs
+
+    def get_score(self, from_id, to_id):
+        """ Return the score for an edge, 0 by default. """
+        try:
+            return self.edge_score[(from_id, to_id)]
+        except KeyError:
+            pass
+
+        index = self._find(from_id, to_id)
+
+        if index is None:
+            return 0
+
+        return int(self.scores[index])
+
+    def set_score(self, from_id, to_id, score):
+        """ Set the score for an edge. """
+        super(CSRGraphStore, self).set_score(from_id, to_id, score)
+
+        self._changed()
+
+    def delete_score(self, from_id, to_id):
+        """ Reset the score for an edge. """
+        self.set_score(from_id, to_id, 0)
+
+    def increase_score(self, from_id, to_id, delta):
+        """
+        Add delta to the score of an edge, never decreasing it below 0.
+        Returns the new score.
+        """
+        return BaseGraphStore.increase_score(self, from_id, to_id, delta)
+
+    def increase_scores(self, deltas):
+        """
+        Add deltas to the scores of edges from an iterable of
+        `(from id, to id, delta)` rows one by one, merging the delta buffer
+        when required.
+        """
+        BaseGraphStore.increase_scores(self, deltas)
+
+    def get_edge_ttl(self, from_id, to_id, default=None):
+        """ Return explicitly set ttl for an edge or default. """
+        try:
+            return self.edge_ttl[(from_id, to_id)]
+        except KeyError:
+            pass
+
+        index = self._find(from_id, to_id)
+
+        if index is None or self.ttls[index] == self.NO_TTL:
+            return default
+
+        return int(self.ttls[index])
+
+    def set_edge_ttl(self, from_id, to_id, ttl):
+        """ Explicitly set ttl for an edge. """
+        super(CSRGraphStore, self).set_edge_ttl(from_id, to_id, ttl)
+
+        self._changed()
@@ -0,0 +1,26 @@
+-- MySQL dump 10.19  Distrib 10.3.38-MariaDB, for debian-linux-gnu (x86_64)
+--
+-- Sample of the English Wikipedia page table in the format of the dumps
+-- published at https://dumps.wikimedia.org/; titles are real, rows are not.
+-- ------------------------------------------------------
+
+CREATE TABLE `page` (
+  `page_id` int(8) unsigned NOT NULL AUTO_INCREMENT,
+  `page_namespace` int(11) NOT NULL DEFAULT 0,
+  `page_title` varbinary(255) NOT NULL DEFAULT '',
+  `page_is_redirect` tinyint(1) unsigned NOT NULL DEFAULT 0,
+  `page_is_new` tinyint(1) unsigned NOT NULL DEFAULT 0,
+  `page_random` double unsigned NOT NULL DEFAULT 0,
+  `page_touched` binary(14) NOT NULL,
+  `page_links_updated` varbinary(14) DEFAULT NULL,
+  `page_latest` int(8) unsigned NOT NULL DEFAULT 0,
+  `page_len` int(8) unsigned NOT NULL DEFAULT 0,
+  `page_content_model` varbinary(32) DEFAULT NULL,
+  `page_lang` varbinary(35) DEFAULT NULL,
+  PRIMARY KEY (`page_id`)
+);
+
+LOCK TABLES `page` WRITE;
+INSERT INTO `page` VALUES (10,0,'Amsterdam',0,0,0.4251774387679699,'20240101000000','20240101000000',1000010,5145,'wikitext',NULL),(11,0,'Netherlands',0,0,0.4017907441031212,'20240101000000','20240101000000',1000011,81105,'wikitext',NULL),(12,0,'Europe',0,0,0.7556802767539017,'20240101000000','20240101000000',1000012,35289,'wikitext',NULL),(13,0,'Rotterdam',0,0,0.5129936892517285,'20240101000000','20240101000000',1000013,37159,'wikitext',NULL),(14,0,'The_Hague',0,0,0.5541121791815827,'20240101000000','20240101000000',1000014,51085,'wikitext',NULL),(15,0,'Utrecht',0,0,0.7659815867894937,'20240101000000','20240101000000',1000015,80911,'wikitext',NULL),(16,0,'Eindhoven',0,0,0.05553062341613002,'20240101000000','20240101000000',1000016,35743,'wikitext',NULL),(17,0,'Groningen',0,0,0.08102618730957845,'20240101000000','20240101000000',1000017,74339,'wikitext',NULL),(18,0,'Belgium',0,0,0.7008511160762302,'20240101000000','20240101000000',1000018,50408,'wikitext',NULL),(19,0,'Brussels',0,0,0.9446085310491896,'20240101000000','20240101000000',1000019,62894,'wikitext',NULL),(20,0,'Antwerp',0,0,0.7467169943470232,'20240101000000','20240101000000',1000020,45160,'wikitext',NULL),(21,0,'Germany',0,0,0.276569461034037,'20240101000000','20240101000000',1000021,16818,'wikitext',NULL),(22,0,'Berlin',0,0,0.8356091515035523,'20240101000000','20240101000000',1000022,52787,'wikitext',NULL),(23,0,'Hamburg',0,0,0.7273015572890617,'20240101000000','20240101000000',1000023,19962,'wikitext',NULL),(24,0,'Munich',0,0,0.12720170313747103,'20240101000000','20240101000000',1000024,30151,'wikitext',NULL),(25,0,'Cologne',0,0,0.38990947207666404,'20240101000000','20240101000000',1000025,72002,'wikitext',NULL),(26,0,'France',0,0,0.625057769032722,'20240101000000','20240101000000',1000026,57967,'wikitext',NULL),(27,0,'Paris',0,0,0.7665072410131641,'20240101000000','20240101000000',1000027,22228,'wikitext',NULL),(28,0,'Lyon',0,0,0.922709701142321,'20240101000000','20240101000000',1000028,78863,'wikitext',NULL),(29,0,'Marseille',0,0,0.013781179274285682,'20240101000000','20240101000000',1000029,22725,'wikitext',NULL),(30,0,'Switzerland',0,0,0.5201887502006339,'20240101000000','20240101000000',1000030,15248,'wikitext',NULL),(31,0,'Zürich',0,0,0.6263315279871349,'20240101000000','20240101000000',1000031,78332,'wikitext',NULL),(32,0,'Geneva',0,0,0.14869929761654588,'20240101000000','20240101000000',1000032,18888,'wikitext',NULL),(33,0,'Bern',0,0,0.08787762309007918,'20240101000000','20240101000000',1000033,3636,'wikitext',NULL),(34,0,'Austria',0,0,0.6765263633288007,'20240101000000','20240101000000',1000034,45792,'wikitext',NULL),(35,0,'Vienna',0,0,0.9337212511499828,'20240101000000','20240101000000',1000035,86447,'wikitext',NULL),(36,0,'European_Union',0,0,0.7829604692457701,'20240101000000','20240101000000',1000036,11899,'wikitext',NULL),(37,0,'Euro',0,0,0.6894920917780822,'20240101000000','20240101000000',1000037,51867,'wikitext',NULL),(38,0,'North_Sea',0,0,0.7561931565635758,'20240101000000','20240101000000',1000038,80896,'wikitext',NULL),(39,0,'Rhine',0,0,0.8157599449485918,'20240101000000','20240101000000',1000039,62172,'wikitext',NULL),(40,0,'Meuse',0,0,0.26776622519676785,'20240101000000','20240101000000',1000040,27176,'wikitext',NULL),(41,0,'Amstel',0,0,0.2793961783785649,'20240101000000','20240101000000',1000041,15057,'wikitext',NULL);
+INSERT INTO `page` VALUES (42,0,'Dutch_language',0,0,0.8419585868722521,'20240101000000','20240101000000',1000042,11718,'wikitext',NULL),(43,0,'German_language',0,0,0.7037311905167051,'20240101000000','20240101000000',1000043,46633,'wikitext',NULL),(44,0,'French_language',0,0,0.04552433785138699,'20240101000000','20240101000000',1000044,80892,'wikitext',NULL),(45,0,'Dutch_Golden_Age',0,0,0.13711893562251043,'20240101000000','20240101000000',1000045,15018,'wikitext',NULL),(46,0,'Rembrandt',0,0,0.5132069431606168,'20240101000000','20240101000000',1000046,47486,'wikitext',NULL),(47,0,'Vincent_van_Gogh',0,0,0.9876212242758781,'20240101000000','20240101000000',1000047,41582,'wikitext',NULL),(48,0,'Johannes_Vermeer',0,0,0.9484250993521118,'20240101000000','20240101000000',1000048,62681,'wikitext',NULL),(49,0,'Anne_Frank',0,0,0.4018974287587065,'20240101000000','20240101000000',1000049,71844,'wikitext',NULL),(50,0,'Rijksmuseum',0,0,0.054174376404269586,'20240101000000','20240101000000',1000050,28907,'wikitext',NULL),(51,0,'Van_Gogh_Museum',0,0,0.5784205120042624,'20240101000000','20240101000000',1000051,81233,'wikitext',NULL),(52,0,'Anne_Frank_House',0,0,0.624330687991566,'20240101000000','20240101000000',1000052,80511,'wikitext',NULL),(53,0,'Schiphol_Airport',0,0,0.37107845909330206,'20240101000000','20240101000000',1000053,44674,'wikitext',NULL),(54,0,'KLM',0,0,0.8495460800336788,'20240101000000','20240101000000',1000054,22171,'wikitext',NULL),(55,0,'Dutch_East_India_Company',0,0,0.3718408204975624,'20240101000000','20240101000000',1000055,88935,'wikitext',NULL),(56,0,'Tulip_mania',0,0,0.5541005093588721,'20240101000000','20240101000000',1000056,88062,'wikitext',NULL),(57,0,'Windmill',0,0,0.394782546761846,'20240101000000','20240101000000',1000057,11730,'wikitext',NULL),(58,0,'Canal',0,0,0.7645687368493611,'20240101000000','20240101000000',1000058,47627,'wikitext',NULL),(59,0,'Bicycle',0,0,0.8898398157505661,'20240101000000','20240101000000',1000059,28725,'wikitext',NULL),(60,0,'Cheese',0,0,0.828089815704722,'20240101000000','20240101000000',1000060,75481,'wikitext',NULL),(61,0,'Gouda_cheese',0,0,0.6417997743177807,'20240101000000','20240101000000',1000061,77273,'wikitext',NULL),(62,0,'Edam_cheese',0,0,0.5048599961263698,'20240101000000','20240101000000',1000062,41814,'wikitext',NULL),(63,0,'Delft',0,0,0.67010851966195,'20240101000000','20240101000000',1000063,81132,'wikitext',NULL),(64,0,'Leiden',0,0,0.12686154476481004,'20240101000000','20240101000000',1000064,59122,'wikitext',NULL),(65,0,'Leiden_University',0,0,0.11319553338407762,'20240101000000','20240101000000',1000065,70942,'wikitext',NULL),(66,0,'Haarlem',0,0,0.7761861404086101,'20240101000000','20240101000000',1000066,83646,'wikitext',NULL),(67,0,'Randstad',0,0,0.12712125742511005,'20240101000000','20240101000000',1000067,25350,'wikitext',NULL),(68,0,'Polder',0,0,0.10655959341458632,'20240101000000','20240101000000',1000068,80667,'wikitext',NULL),(69,0,'Delta_Works',0,0,0.7837643354037572,'20240101000000','20240101000000',1000069,36144,'wikitext',NULL),(70,0,'Flood_control',0,0,0.17477173140479718,'20240101000000','20240101000000',1000070,65525,'wikitext',NULL),(71,0,'Hitchhiker\'s_Guide_to_Amsterdam',0,0,0.7223576416431166,'20240101000000','20240101000000',1000071,56185,'wikitext',NULL),(72,0,'Amsterdam_(disambiguation)',0,0,0.9698228050914458,'20240101000000','20240101000000',1000072,838,'wikitext',NULL),(900,1,'Amsterdam',0,0,0.2163070793051095,'20240101000000','20240101000000',1000900,54016,'wikitext',NULL),(901,14,'Capitals_in_Europe',0,0,0.5669538190886297,'20240101000000','20240101000000',1000901,75394,'wikitext',NULL);
+UNLOCK TABLES;
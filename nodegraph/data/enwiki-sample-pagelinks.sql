@@ -0,0 +1,18 @@
+-- MySQL dump 10.19  Distrib 10.3.38-MariaDB, for debian-linux-gnu (x86_64)
+--
+-- Sample of the English Wikipedia pagelinks table in the format of the dumps
+-- published at https://dumps.wikimedia.org/; titles are real, rows are not.
+-- ------------------------------------------------------
+
+CREATE TABLE `pagelinks` (
+  `pl_from` int(8) unsigned NOT NULL DEFAULT 0,
+  `pl_namespace` int(11) NOT NULL DEFAULT 0,
+  `pl_title` varbinary(255) NOT NULL DEFAULT '',
+  `pl_from_namespace` int(11) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`pl_from`,`pl_namespace`,`pl_title`)
+);
+
+LOCK TABLES `pagelinks` WRITE;
+INSERT INTO `pagelinks` VALUES (10,0,'Amsterdam',0),(10,0,'Amsterdam_Light_Festival',0),(10,0,'Dutch_Golden_Age',0),(10,0,'Flood_control',0),(10,0,'France',0),(10,0,'Hamburg',0),(10,0,'Hitchhiker\'s_Guide_to_Amsterdam',0),(10,0,'North_Sea',0),(10,0,'Randstad',0),(10,0,'Rotterdam',0),(10,0,'Windmill',0),(10,14,'Capitals_in_Europe',0),(11,0,'Amsterdam',0),(11,0,'Edam_cheese',0),(11,0,'Hamburg',0),(11,0,'Hitchhiker\'s_Guide_to_Amsterdam',0),(11,0,'Rijksmuseum',0),(12,0,'Amsterdam',0),(12,0,'Amsterdam_(disambiguation)',0),(12,0,'Antwerp',0),(12,0,'Delta_Works',0),(12,0,'Europe',0),(12,0,'Flood_control',0),(12,0,'France',0),(12,0,'Netherlands',0),(12,0,'Rotterdam',0),(12,0,'Windmill',0),(13,0,'Leiden',0),(13,0,'Polder',0),(13,0,'Rotterdam',0),(14,0,'Amsterdam',0),(14,0,'Brussels',0),(14,0,'Cologne',0),(14,0,'European_Union',0),(14,0,'Flood_control',0),(14,0,'French_language',0),(14,0,'Leiden_University',0),(14,0,'Lyon',0),(14,0,'Rotterdam',0),(14,0,'Switzerland',0),(14,0,'Tulip_mania',0),(15,0,'Anne_Frank_House',0),(15,0,'Europe',0),(15,0,'French_language',0),(15,0,'Netherlands',0),(15,0,'Rotterdam',0),(15,0,'The_Hague',0),(16,0,'Amsterdam',0),(16,0,'Antwerp',0),(16,0,'Cheese',0),(16,0,'Europe',0),(16,0,'Germany',0),(16,0,'Marseille',0),(16,0,'Netherlands',0),(16,0,'Rhine',0),(16,0,'Rotterdam',0),(16,0,'Van_Gogh_Museum',0),(16,0,'Zürich',0),(17,0,'Cheese',0),(17,0,'Europe',0),(17,0,'Germany',0),(17,0,'Netherlands',0),(17,0,'Rotterdam',0),(18,0,'Anne_Frank',0),(18,0,'Dutch_East_India_Company',0),(18,0,'Edam_cheese',0),(18,0,'Haarlem',0),(18,0,'Netherlands',0),(19,0,'Amsterdam',0),(19,0,'Berlin',0),(19,0,'Cologne',0),(19,0,'Edam_cheese',0),(19,0,'Europe',0),(19,0,'Haarlem',0),(19,0,'Johannes_Vermeer',0),(19,0,'Munich',0),(19,0,'Randstad',0),(19,0,'Rotterdam',0),(19,0,'Utrecht',0),(20,0,'Amsterdam',0),(20,0,'Bern',0),(20,0,'Brussels',0),(20,0,'Dutch_language',0),(20,0,'Leiden',0),(20,0,'Rotterdam',0),(21,0,'Dutch_East_India_Company',0),(21,0,'Europe',0),(21,0,'The_Hague',0),(22,0,'Cheese',0),(22,0,'Dutch_Golden_Age',0),(22,0,'Eindhoven',0),(22,0,'France',0),(22,0,'German_language',0),(22,0,'Haarlem',0),(22,0,'Randstad',0),(22,0,'Rotterdam',0),(22,0,'Tulip_mania',0),(22,0,'Utrecht',0),(23,0,'Amstel',0),(23,0,'Austria',0),(23,0,'Canal',0),(23,0,'Delta_Works',0),(23,0,'Eindhoven',0),(23,0,'German_language',0),(23,0,'Netherlands',0),(23,0,'Switzerland',0),(23,0,'Tulip_mania',0),(23,0,'Vienna',0),(24,0,'Amsterdam',0),(24,0,'Amsterdam_(disambiguation)',0),(24,0,'Anne_Frank_House',0),(24,0,'German_language',0),(24,0,'Rotterdam',0),(25,0,'Amsterdam_(disambiguation)',0),(25,0,'Anne_Frank',0),(25,0,'Belgium',0),(25,0,'Flood_control',0),(25,0,'Germany',0),(25,0,'Gouda_cheese',0),(25,0,'Haarlem',0),(25,0,'Lyon',0),(25,0,'Netherlands',0),(25,0,'Rhine',0),(25,0,'Zürich',0),(26,0,'Canal',0),(26,0,'Delft',0),(26,0,'Europe',0),(26,0,'Haarlem',0),(26,0,'KLM',0),(26,0,'North_Sea',0),(26,0,'Rotterdam',0),(26,0,'Windmill',0),(27,0,'Amsterdam',0),(27,0,'Geneva',0),(27,0,'Munich',0),(27,0,'Netherlands',0),(27,0,'Polder',0),(28,0,'Amsterdam',0),(28,0,'Europe',0),(28,0,'Leiden_University',0),(28,0,'Netherlands',0),(28,0,'Van_Gogh_Museum',0),(28,0,'Vincent_van_Gogh',0),(29,0,'Amsterdam',0),(29,0,'Cologne',0),(29,0,'Eindhoven',0),(29,0,'Europe',0),(29,0,'Geneva',0),(29,0,'Germany',0),(29,0,'Lyon',0),(29,0,'Netherlands',0),(29,0,'Paris',0),(29,0,'Rotterdam',0),(30,0,'Amsterdam',0),(30,0,'Europe',0),(30,0,'Haarlem',0),(31,0,'Amsterdam',0),(31,0,'Eindhoven',0),(31,0,'Europe',0),(31,0,'French_language',0),(31,0,'Hamburg',0),(32,0,'Amsterdam',0),(32,0,'Antwerp',0),(32,0,'Dutch_Golden_Age',0),(32,0,'Europe',0),(32,0,'Flood_control',0),(32,0,'Johannes_Vermeer',0),(32,0,'Netherlands',0),(32,0,'Paris',0),(32,0,'Rotterdam',0),(32,0,'Switzerland',0),(32,0,'Windmill',0),(33,0,'Amsterdam_(disambiguation)',0),(33,0,'Austria',0),(33,0,'Groningen',0),(33,0,'Lyon',0),(33,0,'Munich',0),(33,0,'Netherlands',0),(33,0,'Randstad',0),(33,0,'Rotterdam',0),(33,0,'The_Hague',0),(34,0,'Europe',0),(34,0,'Leiden',0),(34,0,'Netherlands',0),(35,0,'Austria',0),(35,0,'Dutch_East_India_Company',0),(35,0,'Europe',0),(35,0,'Groningen',0),(35,0,'Van_Gogh_Museum',0),(36,0,'Bern',0),(36,0,'Dutch_Golden_Age',0),(36,0,'Europe',0),(36,0,'Hamburg',0),(36,0,'Netherlands',0),(36,0,'Rotterdam',0),(36,0,'Zürich',0),(37,0,'Amstel',0),(37,0,'Anne_Frank',0),(37,0,'Austria',0),(37,0,'Brussels',0),(37,0,'Europe',0),(37,0,'Flood_control',0),(37,0,'Munich',0),(37,0,'Netherlands',0),(37,0,'Rembrandt',0),(37,0,'Schiphol_Airport',0),(38,0,'Amsterdam',0),(38,0,'Anne_Frank_House',0),(38,0,'Hitchhiker\'s_Guide_to_Amsterdam',0),(38,0,'Netherlands',0),(38,0,'North_Sea',0),(39,0,'Europe',0),(39,0,'Lyon',0),(39,0,'Netherlands',0),(39,0,'Rotterdam',0),(40,0,'Amsterdam',0),(40,0,'Antwerp',0),(40,0,'Europe',0),(40,0,'Netherlands',0);
+INSERT INTO `pagelinks` VALUES (40,0,'Rhine',0),(40,0,'Rotterdam',0),(40,0,'The_Hague',0),(41,0,'Amsterdam',0),(41,0,'Anne_Frank',0),(41,0,'Dutch_Golden_Age',0),(41,0,'German_language',0),(41,0,'Netherlands',0),(41,0,'Tulip_mania',0),(42,0,'Amsterdam',0),(42,0,'Belgium',0),(42,0,'Berlin',0),(42,0,'Netherlands',0),(42,0,'Rotterdam',0),(43,0,'Belgium',0),(43,0,'Europe',0),(43,0,'Groningen',0),(43,0,'Polder',0),(43,0,'Vincent_van_Gogh',0),(44,0,'Canal',0),(44,0,'Europe',0),(44,0,'Groningen',0),(44,0,'Vienna',0),(45,0,'Amstel',0),(45,0,'Amsterdam',0),(45,0,'Austria',0),(45,0,'Bicycle',0),(45,0,'Canal',0),(45,0,'Dutch_Golden_Age',0),(45,0,'Europe',0),(45,0,'Germany',0),(45,0,'Haarlem',0),(45,0,'Rotterdam',0),(46,0,'Amsterdam',0),(46,0,'Anne_Frank_House',0),(46,0,'Bern',0),(46,0,'Bicycle',0),(46,0,'Groningen',0),(46,0,'Meuse',0),(46,0,'Netherlands',0),(46,0,'North_Sea',0),(46,0,'Rotterdam',0),(46,0,'Vienna',0),(47,0,'Amsterdam',0),(47,0,'Netherlands',0),(47,0,'Zürich',0),(48,0,'Amsterdam',0),(48,0,'Delft',0),(48,0,'Europe',0),(48,0,'Gouda_cheese',0),(49,0,'Flood_control',0),(49,0,'The_Hague',0),(49,0,'Vincent_van_Gogh',0),(49,0,'Zürich',0),(50,0,'Amstel',0),(50,0,'Amsterdam',0),(50,0,'Europe',0),(50,0,'French_language',0),(50,0,'Netherlands',0),(51,0,'Amstel',0),(51,0,'Amsterdam_(disambiguation)',0),(51,0,'Brussels',0),(51,0,'Europe',0),(51,0,'Hamburg',0),(51,0,'Netherlands',0),(51,0,'Rotterdam',0),(52,0,'Amsterdam',0),(52,0,'Rotterdam',0),(52,0,'Tulip_mania',0),(52,0,'Windmill',0),(53,0,'Amsterdam',0),(53,0,'Amsterdam_(disambiguation)',0),(53,0,'Anne_Frank_House',0),(53,0,'Dutch_East_India_Company',0),(53,0,'Dutch_language',0),(53,0,'Europe',0),(53,0,'Netherlands',0),(53,0,'Randstad',0),(53,0,'Utrecht',0),(54,0,'Delft',0),(54,0,'Johannes_Vermeer',0),(54,0,'Marseille',0),(54,0,'Rotterdam',0),(54,0,'Vincent_van_Gogh',0),(55,0,'Amstel',0),(55,0,'Delta_Works',0),(55,0,'Edam_cheese',0),(55,0,'Europe',0),(56,0,'Amsterdam',0),(56,0,'Europe',0),(56,0,'Flood_control',0),(56,0,'German_language',0),(56,0,'Germany',0),(56,0,'Haarlem',0),(56,0,'Netherlands',0),(56,0,'Polder',0),(56,0,'Randstad',0),(56,0,'Rotterdam',0),(57,0,'Amstel',0),(57,0,'Amsterdam',0),(57,0,'Antwerp',0),(57,0,'Belgium',0),(57,0,'Netherlands',0),(58,0,'Delta_Works',0),(58,0,'Dutch_Golden_Age',0),(58,0,'Vincent_van_Gogh',0),(59,0,'Amsterdam',0),(59,0,'Berlin',0),(59,0,'Europe',0),(59,0,'German_language',0),(59,0,'Netherlands',0),(59,0,'Rotterdam',0),(59,0,'Schiphol_Airport',0),(59,0,'Van_Gogh_Museum',0),(60,0,'Amsterdam',0),(60,0,'Delta_Works',0),(60,0,'Edam_cheese',0),(60,0,'Munich',0),(60,0,'Netherlands',0),(60,0,'Rotterdam',0),(60,0,'Switzerland',0),(61,0,'Amstel',0),(61,0,'Amsterdam',0),(61,0,'Bern',0),(61,0,'Dutch_Golden_Age',0),(61,0,'Europe',0),(61,0,'Groningen',0),(61,0,'Leiden',0),(61,0,'Netherlands',0),(61,0,'Rotterdam',0),(61,0,'Van_Gogh_Museum',0),(62,0,'Anne_Frank',0),(62,0,'Delta_Works',0),(62,0,'German_language',0),(62,0,'Hitchhiker\'s_Guide_to_Amsterdam',0),(62,0,'Johannes_Vermeer',0),(62,0,'Lyon',0),(62,0,'Netherlands',0),(62,0,'North_Sea',0),(62,0,'Polder',0),(62,0,'Rotterdam',0),(63,0,'Amsterdam_(disambiguation)',0),(63,0,'Anne_Frank_House',0),(63,0,'Europe',0),(63,0,'French_language',0),(63,0,'Netherlands',0),(64,0,'Amsterdam',0),(64,0,'Amsterdam_(disambiguation)',0),(64,0,'Brussels',0),(64,0,'Dutch_Golden_Age',0),(64,0,'Edam_cheese',0),(64,0,'Europe',0),(64,0,'Flood_control',0),(64,0,'Germany',0),(64,0,'Netherlands',0),(64,0,'Rijksmuseum',0),(64,0,'Vienna',0),(65,0,'Amsterdam',0),(65,0,'Anne_Frank_House',0),(65,0,'Canal',0),(65,0,'Dutch_East_India_Company',0),(65,0,'Haarlem',0),(65,0,'Johannes_Vermeer',0),(65,0,'Munich',0),(65,0,'Netherlands',0),(65,0,'Utrecht',0),(65,0,'Vienna',0),(66,0,'Amsterdam',0),(66,0,'Cheese',0),(66,0,'Groningen',0),(66,0,'KLM',0),(66,0,'Netherlands',0),(66,0,'Paris',0),(66,0,'Rhine',0),(66,0,'Rotterdam',0),(67,0,'Amsterdam',0),(67,0,'Amsterdam_(disambiguation)',0),(67,0,'Europe',0),(67,0,'Netherlands',0),(67,0,'Switzerland',0),(67,0,'Van_Gogh_Museum',0),(68,0,'Amsterdam',0),(68,0,'Bicycle',0),(68,0,'Dutch_Golden_Age',0),(68,0,'Dutch_language',0),(68,0,'Europe',0),(68,0,'Netherlands',0),(68,0,'Rijksmuseum',0),(69,0,'Austria',0),(69,0,'Flood_control',0),(69,0,'German_language',0),(69,0,'Rotterdam',0),(70,0,'Amsterdam',0),(70,0,'Antwerp',0),(70,0,'Delta_Works',0),(70,0,'Edam_cheese',0),(70,0,'French_language',0),(70,0,'Netherlands',0),(70,0,'North_Sea',0),(70,0,'Switzerland',0),(70,0,'Windmill',0),(71,0,'Amsterdam',0),(71,0,'Europe',0),(71,0,'European_Union',0),(71,0,'German_language',0),(71,0,'Germany',0),(71,0,'Leiden',0),(71,0,'Netherlands',0),(71,0,'Rotterdam',0),(72,0,'Amsterdam',0),(72,0,'Anne_Frank_House',0),(72,0,'Antwerp',0),(72,0,'Euro',0),(72,0,'Europe',0),(72,0,'Haarlem',0),(72,0,'Munich',0),(72,0,'Rotterdam',0),(72,0,'Schiphol_Airport',0),(72,0,'The_Hague',0),(900,0,'Netherlands',1);
+UNLOCK TABLES;
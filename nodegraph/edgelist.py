@@ -0,0 +1,189 @@
+"""
+Streaming import and export of Graphs as edge lists.
+
+An edge list is a CSV or TSV file with one Edge per row: the names of the
+Nodes it links, its score and its explicitly set ttl, left empty for Edges
+without ttl. Files ending in `.gz` are gzip-compressed.
+
+    from_node,to_node,score,ttl
+    Amsterdam,Netherlands,300,
+    Netherlands,Europe,100,3600
+
+Rows are streamed and written to the store in batches of `batch_size` Edges,
+so memory use is bounded regardless of the size of the file; see
+`benchmarks/edgelist.py` for throughput.
+"""
+import csv
+import gzip
+import io
+import itertools
+
+# Column names for the header row
+HEADER = ('from_node', 'to_node', 'score', 'ttl')
+
+
+def _encode(name):
+    """ Return name as UTF-8 encoded bytes. """
+    if isinstance(name, unicode):
+        return name.encode('utf-8')
+
+    return name
+
+
+def get_delimiter(path):
+    """ Return the delimiter for a path; tabs for .tsv, commas otherwise. """
+    if path.endswith('.gz'):
+        path = path[:-3]
+
+    if path.endswith('.tsv'):
+        return '\t'
+
+    return ','
+
+
+def open_edge_list(path, mode='rb'):
+    """ Open an edge list for reading or writing, gzipped for .gz paths. """
+    if path.endswith('.gz'):
+        f = gzip.open(path, mode)
+
+        # GzipFile reads lines very slowly on its own
+        if 'r' in mode:
+            return io.BufferedReader(f)
+
+        return io.BufferedWriter(f)
+
+    return open(path, mode)
+
+
+def read_edges(f, delimiter=',', header=True):
+    """
+    Generator yielding `(from name, to name, score, ttl)` for the rows in
+    an edge list file, with a ttl of None for Edges without ttl.
+    """
+    reader = csv.reader(f, delimiter=delimiter)
+
+    if header:
+        next(reader, None)
+
+    for from_name, to_name, score, ttl in reader:
+        if ttl:
+            ttl = int(ttl)
+        else:
+            ttl = None
+
+        yield (
+            from_name.decode('utf-8'), to_name.decode('utf-8'),
+            int(score), ttl
+        )
+
+
+def write_edges(f, rows, delimiter=',', header=True):
+    """
+    Write `(from name, to name, score, ttl)` rows to an edge list file,
+    returns the number of rows written.
+    """
+    writer = csv.writer(f, delimiter=delimiter, lineterminator='\n')
+
+    if header:
+        writer.writerow(HEADER)
+
+    count = 0
+    for from_name, to_name, score, ttl in rows:
+        if ttl is None:
+            ttl = ''
+
+        writer.writerow((_encode(from_name), _encode(to_name), score, ttl))
+
+        count += 1
+
+    return count
+
+
+def iter_edges(graph):
+    """
+    Generator yielding `(from name, to name, score, ttl)` for all Edges in
+    a Graph, reading the store one Node at a time.
+    """
+    store = graph.store
+    get_name = store.get_name
+
+    for from_id in store.iter_nodes():
+        scores = store.scores_out(from_id)
+
+        if not scores:
+            continue
+
+        # Edges may change between both reads, concurrently added Edges are
+        # skipped and removed Edges lack a ttl
+        ttls = dict(store.ttls_out(from_id))
+
+        from_name = get_name(from_id)
+
+        for to_id, score in scores:
+            yield (from_name, get_name(to_id), score, ttls.get(to_id))
+
+
+def insert_edges(graph, rows, batch_size=10000):
+    """
+    Insert `(from name, to name, score, ttl)` rows into a Graph in batches
+    of batch_size, returns the number of rows written, including rows
+    updating existing Edges. Nodes are created as needed, existing Edges
+    take the score of the row and its ttl, when set. Rows linking a Node to
+    itself are skipped and not counted.
+    """
+    store = graph.store
+    intern = store.intern
+
+    rows = (row for row in rows if row[0] != row[1])
+
+    count = 0
+    while True:
+        batch = [
+            (intern(from_name), intern(to_name), score, ttl)
+            for from_name, to_name, score, ttl
+            in itertools.islice(rows, batch_size)
+        ]
+
+        if not batch:
+            break
+
+        store.add_nodes(set(
+            node_id for row in batch for node_id in row[:2]
+        ))
+        store.add_edges(batch)
+
+        # Cached values depending on Edges from the originating Nodes
+        store.cache.invalidate_many(set(row[0] for row in batch))
+
+        count += len(batch)
+
+    return count
+
+
+def import_edges(graph, path, delimiter=None, header=True, batch_size=10000):
+    """
+    Import Nodes and Edges from an edge list at path into a Graph using
+    insert_edges(), returns the number of rows written.
+    """
+    if delimiter is None:
+        delimiter = get_delimiter(path)
+
+    with open_edge_list(path, 'rb') as f:
+        return insert_edges(
+            graph, read_edges(f, delimiter=delimiter, header=header),
+            batch_size=batch_size
+        )
+
+
+def export_edges(graph, path, delimiter=None, header=True):
+    """
+    Export all Edges in a Graph to an edge list at path, returns the number
+    of rows written. Nodes without Edges are not exported.
+    """
+    if delimiter is None:
+        delimiter = get_delimiter(path)
+
+    with open_edge_list(path, 'wb') as f:
+        return write_edges(
+            f, iter_edges(graph), delimiter=delimiter, header=header
+        )
@@ -23,3 +23,7 @@ class NodeNotFound(ObjectNotFound):
 class EdgeNotFound(ObjectNotFound):
     """ Exception raised when a queried edge could not be found. """
     object_type = 'Edge'
+
+
+class ReadOnlyError(Exception):
+    """ Exception raised when changing data in a read-only store. """
@@ -0,0 +1,92 @@
+"""
+Seeded generators for synthetic Graphs resembling production data.
+
+Edges are drawn between Nodes with probabilities following a power law in
+the rank of the Node (Chung-Lu), independently for the originating and the
+receiving end, so both in- and out-degrees have power-law distributions
+with hubs on either side. Scores follow a log-normal distribution: most
+Edges have a score close to the median, few have very large scores.
+
+The same arguments always generate the same Graph:
+
+    graph = Graph(name='synthetic')
+    generate_graph(graph, edge_count=100000, seed=1)
+"""
+import bisect
+import random
+
+from .edgelist import insert_edges
+
+
+def rank_weights(node_count, exponent=2.1, hub_offset=1):
+    """
+    Return cumulative weights for Nodes ranked 0 to node_count - 1 for a
+    power-law degree distribution with the given exponent. Increasing
+    hub_offset reduces the weight of the highest ranked Nodes, making hubs
+    smaller.
+    """
+    assert exponent > 1
+    assert hub_offset > 0
+
+    alpha = 1.0 / (exponent - 1)
+
+    total = 0.0
+    cumulative = []
+    for rank in xrange(node_count):
+        total += (rank + hub_offset) ** -alpha
+        cumulative.append(total)
+
+    return cumulative
+
+
+def powerlaw_edges(edge_count, node_count=None, exponent=2.1, hub_offset=1,
+                   score_median=100, score_sigma=1.0, seed=0):
+    """
+    Generator yielding edge_count `(from name, to name, score, ttl)` rows
+    for Nodes named `node_<number>`; node_count defaults to a tenth of the
+    number of Edges.
+
+    Rows may link a Node to itself or repeat an Edge; inserted Graphs hold
+    slightly fewer Edges than rows generated, more so for small hub_offset.
+    """
+    if node_count is None:
+        node_count = max(edge_count // 10, 2)
+
+    rng = random.Random(seed)
+
+    cumulative = rank_weights(node_count, exponent, hub_offset)
+    total = cumulative[-1]
+
+    # Out and in hubs are different Nodes
+    sources = range(node_count)
+    targets = range(node_count)
+    rng.shuffle(sources)
+    rng.shuffle(targets)
+
+    names = ['node_{0}'.format(number) for number in xrange(node_count)]
+
+    # Local lookups for the inner loop
+    find = bisect.bisect_right
+    uniform = rng.random
+    lognormal = rng.lognormvariate
+
+    for i in xrange(edge_count):
+        from_rank = find(cumulative, uniform() * total)
+        to_rank = find(cumulative, uniform() * total)
+
+        # Log-normal with the given median, at least 1
+        score = max(int(score_median * lognormal(0, score_sigma)), 1)
+
+        yield (
+            names[sources[from_rank]], names[targets[to_rank]], score, None
+        )
+
+
+def generate_graph(graph, edge_count, batch_size=10000, **kwargs):
+    """
+    Insert a synthetic power-law Graph into graph, returns the number of
+    rows inserted. Keyword arguments are passed to powerlaw_edges().
+    """
+    return insert_edges(
+        graph, powerlaw_edges(edge_count, **kwargs), batch_size=batch_size
+    )
@@ -1,13 +1,17 @@
 from .managers import EdgeManager, NodeManager, PathManager, EnsembleManager
 
-from .store import GraphStore
+from .store import BaseGraphStore, GraphStore
 
 
 class Graph(object):
     """
     Named container for graph objects.
 
-    The information in this backend is lost as soon as the process dies.
+    Data is kept in the given store, by default an in-memory GraphStore of
+    which the information is lost as soon as the process dies.
+
+    Score changes through Edges are combined in `score_buffer` when set to
+    a ScoreBuffer for the store, see nodegraph.buffer.
     """
 
     def __init__(self, name, store=None):
@@ -16,10 +20,15 @@ class Graph(object):
         self._name = name
 
         # Initialize the store, passing the (immutable) graph name
-        if not store:
-            self.store = GraphStore(name=self.name)
+        if store is None:
+            store = GraphStore(name=self.name)
+
+        self.store = store
+
+        assert isinstance(self.store, BaseGraphStore)
 
-        assert isinstance(self.store, GraphStore)
+        # Optional write-combining of Edge score deltas
+        self.score_buffer = None
 
         # Initialize managers
         self.edges = EdgeManager(graph=self)
@@ -37,6 +46,13 @@ class Graph(object):
     def __hash__(self):
         return hash(self.key())
 
+    def cache_stats(self):
+        """
+        Statistics per kind of cached value, e.g. `edge_weight`, see
+        GraphCache.stats().
+        """
+        return self.store.cache.stats()
+
     @property
     def ttl(self):
         """
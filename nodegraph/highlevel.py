@@ -67,7 +67,14 @@ class Path(object):
 
         return min_ttl
 
-    @cache_value('weight')
+    def get_sources(self):
+        """
+        Returns the ids of the Nodes whose outgoing Edges determine the
+        weight of this Path.
+        """
+        return set(edge.from_node.id for edge in self.edges)
+
+    @cache_value('weight', kind='path_weight')
     def get_weight(self):
         """
         Returns the weight for this path.
@@ -122,7 +129,7 @@ class Ensemble(object):
                 if not self.graph is path.graph:
                     raise AssertionError('Path is on a different Graph.')
 
-                if not self.from_node is path.from_node:
+                if not self.from_node == path.from_node:
                     raise AssertionError(
                         'From node should be the same for all Paths.'
                         'Ensemble: {0} Path: {1}'.format(
@@ -130,7 +137,7 @@ class Ensemble(object):
                         )
                     )
 
-                if not self.to_node is path.to_node:
+                if not self.to_node == path.to_node:
                     raise AssertionError(
                         'To node should be the same for all Paths.'
                         'Ensemble: {0} Path: {1}'.format(
@@ -174,7 +181,18 @@ class Ensemble(object):
 
         return min_ttl
 
-    @cache_value('weight')
+    def get_sources(self):
+        """
+        Returns the ids of the Nodes whose outgoing Edges determine the
+        weight of any of the Paths in this Ensemble.
+        """
+        sources = set()
+        for path in self.paths:
+            sources.update(path.get_sources())
+
+        return sources
+
+    @cache_value('weight', kind='ensemble_weight')
     def get_weight(self):
         """
         Returns the weight for this Ensemble.
@@ -1,28 +1,86 @@
 import sys
 
+from .cache import cache_value
+
+
+# Stores maintaining outgoing score totals do not need cached weights,
+# values including buffered deltas are not cached
+def _uncached(obj):
+    """
+    Return whether the store of obj maintains score totals, or deltas for
+    Edges from the Node obj depends on are buffered.
+    """
+    graph = obj.graph
+
+    if graph.store.aggregates:
+        return True
+
+    buffer = graph.score_buffer
+
+    return buffer is not None and any(
+        buffer.has_pending(node_id) for node_id in obj.get_sources()
+    )
+
+
+# Bypasses the read-only __setattr__ of Node and Edge
+_set = object.__setattr__
+
 
 class Node(object):
     """
-    Named node in a graph.
+    Named node in a graph; a view on a node id in the Graph's store.
+
+    Nodes are immutable; key and hash are computed once on creation.
     """
 
-    def __init__(self, graph, name):
-        # Set name
-        assert isinstance(name, basestring)
-        self.name = name
+    __slots__ = ('graph', 'id', '_name', '_key', '_hash')
+
+    def __init__(self, graph, node_id, name=None):
+        # Set id
+        assert isinstance(node_id, (int, long))
+        _set(self, 'id', node_id)
+
+        # Set name, read from the store's name table when first used if None
+        assert name is None or isinstance(name, basestring)
+        _set(self, '_name', name)
 
         # Associate with graph
-        self.graph = graph
+        _set(self, 'graph', graph)
+
+        # Precompute key and hash
+        key = (graph.key(), node_id)
+        _set(self, '_key', key)
+        _set(self, '_hash', hash(key))
+
+    def __setattr__(self, name, value):
+        if name in Node.__slots__ or name == 'name':
+            raise AttributeError('Node attributes are read-only.')
+
+        _set(self, name, value)
+
+    @property
+    def name(self):
+        """ Node name, from the store's name table. """
+        if self._name is None:
+            _set(self, '_name', self.graph.store.get_name(self.id))
+
+        return self._name
+
+    def __reduce__(self):
+        return (Node, (self.graph, self.id, self.name))
 
     def key(self):
         """ Key used for hashing and comparisons. """
-        return (self.graph.key(), self.name)
+        return self._key
 
     def __eq__(x, y):
-        return x.key() == y.key()
+        return x is y or x._key == y._key
+
+    def __ne__(x, y):
+        return not x == y
 
     def __hash__(self):
-        return hash(self.key())
+        return self._hash
 
     def __repr__(self):
         return '<Node {0}>'.format(self.name)
@@ -32,122 +90,162 @@ class Node(object):
         """
         Node ttl storage wrapper, returns explicitly set ttl or graph default.
         """
-        return self.graph.store.node_ttl.get(self, self.graph.ttl)
+        return self.graph.store.get_node_ttl(self.id, self.graph.ttl)
 
     @ttl.setter
     def ttl(self, value):
         assert isinstance(value, int)
 
-        self.graph.store.node_ttl[self] = value
+        self.graph.store.set_node_ttl(self.id, value)
+        self._invalidate_ttl()
 
     @ttl.deleter
     def ttl(self):
-        del self.graph.store.node_ttl[self]
+        self.graph.store.delete_node_ttl(self.id)
+        self._invalidate_ttl()
+
+    def _invalidate_ttl(self):
+        """
+        Remove cached values depending on the ttl of this Node: those of the
+        Node itself and of Nodes linking to it without explicit Edge ttl.
+        """
+        store = self.graph.store
+        cache = store.cache
+        get_edge_ttl = store.get_edge_ttl
 
+        cache.invalidate(self.id)
+
+        for from_id in store.edges_in(self.id):
+            if get_edge_ttl(from_id, self.id) is None:
+                cache.invalidate(from_id)
+
+    def get_sources(self):
+        """ Cached values for a Node depend on its outgoing Edges. """
+        return (self.id, )
+
+    @cache_value('min_ttl_out', ttl=lambda node: node.ttl)
     def get_min_ttl_out(self):
         """
         Get the minimal ttl of all Edges pointing outward from this Node or
-        the Node's ttl if no Edges are available.
+        the Node's ttl if no Edges are available, cached for the Node's ttl.
         """
+        store = self.graph.store
+        ttls = store.ttls_out(self.id)
 
-        # Nice hashable tuple of self and 'score' identifier
-        cache_key = (self, 'min_ttl_out')
-
-        # Hit cache
-        cached = self.graph.store.cache.get(cache_key)
-        if cached is not None:
-            return cached
+        if ttls:
+            # Edge ttl defaults to the least of both Node's ttl
+            graph_ttl = self.graph.ttl
+            node_ttl = self.ttl
 
-        # No cache available -> calculate!
-        edges = self.graph.edges.from_node(self)
+            # Node ttl's for Edges without explicit ttl
+            node_ttls = store.node_ttls(
+                [to_id for to_id, ttl in ttls if ttl is None], graph_ttl
+            )
 
-        if edges:
             # Calculate minimal Edge ttl and total Edge score
             min_ttl = sys.maxint
-            for edge in edges:
-                if edge.ttl < min_ttl:
-                    min_ttl = edge.ttl
+            for to_id, ttl in ttls:
+                if ttl is None:
+                    ttl = min(node_ttl, node_ttls[to_id])
 
-            assert min_ttl != sys.maxint
+                if ttl < min_ttl:
+                    min_ttl = ttl
 
-            # Write to cache, using self.ttl as cache time
-            self.graph.store.cache.set(cache_key, min_ttl, self.ttl)
+            assert min_ttl != sys.maxint
 
         else:
-            # No Edges available to calculate score; use Node's ttl in which
-            # case caching is useless.
+            # No Edges available to calculate score; use Node's ttl
             min_ttl = self.ttl
 
         return min_ttl
 
+    @cache_value(
+        'score_out', ttl=lambda node: node.get_min_ttl_out(),
+        bypass=_uncached
+    )
     def get_score_out(self):
-        """ Total score of all Edges pointing outward form this Node. """
-
-        # Nice hashable tuple of self and 'score' identifier
-        cache_key = (self, 'score_out')
-
-        # Hit cache
-        cached = self.graph.store.cache.get(cache_key)
-        if cached:
-            return cached
-
-        # No cache available -> calculate!
-        edges = self.graph.edges.from_node(self)
-
-        total_score = 0
-
-        # Total Edge score
-        for edge in edges:
-            total_score += edge.score
-
-        # Get minimal ttl of outgoing Edges
-        ttl = self.get_min_ttl_out()
-
-        # Write to cache
-        self.graph.store.cache.set(cache_key, total_score, ttl)
+        """
+        Total score of all Edges pointing outward form this Node, including
+        buffered deltas. Cached for the minimal ttl of outgoing Edges, unless
+        the store maintains the total.
+        """
+        buffer = self.graph.score_buffer
+        if buffer is not None:
+            return buffer.get_score_out(self.id)
 
-        return total_score
+        return self.graph.store.score_out(self.id)
 
 
 class Edge(object):
     """
     Weighed connection between two Nodes with implicit weight derived from
     score which can only be increased or decreased.
+
+    Edges are views on a `(from id, to id)` pair in the Graph's store.
     """
 
+    __slots__ = ('graph', 'from_node', 'to_node', '_key', '_hash')
+
     def __init__(self, graph, from_node, to_node):
         # Initialize properties
         assert isinstance(from_node, Node)
         assert isinstance(to_node, Node)
-        assert from_node is not to_node, 'From node to node are the same.'
+        assert from_node != to_node, 'From node to node are the same.'
         assert from_node.graph == graph
         assert to_node.graph == graph
 
-        self.graph = graph
-        self.from_node = from_node
-        self.to_node = to_node
+        _set(self, 'graph', graph)
+        _set(self, 'from_node', from_node)
+        _set(self, 'to_node', to_node)
+
+        # Precompute key and hash
+        key = (graph.key(), from_node.id, to_node.id)
+        _set(self, '_key', key)
+        _set(self, '_hash', hash(key))
+
+    def __setattr__(self, name, value):
+        if name in Edge.__slots__:
+            raise AttributeError('Edge attributes are read-only.')
+
+        _set(self, name, value)
+
+    def __reduce__(self):
+        return (Edge, (self.graph, self.from_node, self.to_node))
 
     def increase_score(self, amount=100):
         """ Increase the score with the given amount. """
-        self.score += amount
+        buffer = self.graph.score_buffer
+        if buffer is not None:
+            buffer.add(self.from_node.id, self.to_node.id, amount)
+            return
+
+        store = self.graph.store
+        store.increase_score(self.from_node.id, self.to_node.id, amount)
+        store.cache.invalidate(self.from_node.id)
 
     def decrease_score(self, amount=100):
         """ Decrease the score with the given amount - but never less than 0. """
+        buffer = self.graph.score_buffer
+        if buffer is not None:
+            buffer.add(self.from_node.id, self.to_node.id, -amount)
+            return
 
-        if amount > self.score:
-            self.score = 0
-        else:
-            self.score -= amount
+        store = self.graph.store
+        store.increase_score(self.from_node.id, self.to_node.id, -amount)
+        store.cache.invalidate(self.from_node.id)
 
     def key(self):
         """ Key used for hashing and comparisons. """
-        return (self.from_node.key(), self.to_node.key())
+        return self._key
 
     def __eq__(x, y):
-        return x.key() == y.key()
+        return x is y or x._key == y._key
+
+    def __ne__(x, y):
+        return not x == y
 
     def __hash__(self):
-        return hash(self.key())
+        return self._hash
 
     def __repr__(self):
         return "<Edge {0}, {1}>".format(
@@ -159,55 +257,79 @@ class Edge(object):
         """
         Edge ttl property wrapper. Returns minimum ttl of nodes as default.
         """
-        return self.graph.store.edge_ttl.get(self,
-            min(self.from_node.ttl, self.to_node.ttl)
-        )
+        ttl = self.graph.store.get_edge_ttl(self.from_node.id, self.to_node.id)
+
+        if ttl is None:
+            ttl = min(self.from_node.ttl, self.to_node.ttl)
+
+        return ttl
 
     @ttl.setter
     def ttl(self, value):
         assert isinstance(value, int)
 
-        self.graph.store.edge_ttl[self] = value
+        store = self.graph.store
+        store.set_edge_ttl(self.from_node.id, self.to_node.id, value)
+
+        # Cached values depending on Edges from the originating Node
+        store.cache.invalidate(self.from_node.id)
 
     @property
     def score(self):
-        """ Score storage wrapper. """
-        return self.graph.store.edge_score.get(self, 0)
+        """ Score storage wrapper, including buffered deltas. """
+        buffer = self.graph.score_buffer
+        if buffer is not None:
+            return buffer.get_score(self.from_node.id, self.to_node.id)
+
+        return self.graph.store.get_score(self.from_node.id, self.to_node.id)
 
     @score.setter
     def score(self, value):
         assert isinstance(value, int)
 
-        self.graph.store.edge_score[self] = value
+        self._discard_buffered()
+
+        store = self.graph.store
+        store.set_score(self.from_node.id, self.to_node.id, value)
+        store.cache.invalidate(self.from_node.id)
 
     @score.deleter
     def score(self):
-        del self.graph.store.edge_score[self]
-
+        self._discard_buffered()
+
+        store = self.graph.store
+        store.delete_score(self.from_node.id, self.to_node.id)
+        store.cache.invalidate(self.from_node.id)
+
+    def _discard_buffered(self):
+        """ Drop buffered deltas, before the score is replaced. """
+        buffer = self.graph.score_buffer
+        if buffer is not None:
+            buffer.discard(self.from_node.id, self.to_node.id)
+
+    def get_sources(self):
+        """ The weight depends on all Edges from the originating Node. """
+        return (self.from_node.id, )
+
+    @cache_value(
+        'weight', kind='edge_weight',
+        ttl=lambda edge: edge.from_node.get_min_ttl_out(),
+        bypass=_uncached
+    )
     def get_weight(self):
-        """ Return the current weight. """
-
-        # Nice hashable tuple of self and identifier
-        cache_key = (self, 'weight')
-
-        # Hit cache
-        cached = self.graph.store.cache.get(cache_key)
-        if cached is not None:
-            return cached
-
+        """
+        Return the current weight, including buffered deltas. Cached for the
+        minimal ttl of Edges from the originating Node, unless the store
+        maintains score totals.
+        """
         # No score, no weight: simple optimizations, prevents division by zero
-        if self.score:
+        score = self.score
+        if score:
             total_score = self.from_node.get_score_out()
             assert total_score
 
-            weight = self.score / float(total_score)
+            weight = score / float(total_score)
         else:
             weight = 0.0
 
-        # Get minimal outgoing ttl for Edges
-        ttl = self.from_node.get_min_ttl_out()
-
-        # Write to cache
-        self.graph.store.cache.set(cache_key, weight, ttl)
-
         return weight
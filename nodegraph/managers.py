@@ -11,49 +11,159 @@ class NodeManager(object):
         self.graph = graph
 
         # Shorthand for storage
-        self._nodes = graph.store.nodes
+        self._store = graph.store
 
     def create(self, name):
-        """ Create a Node and add it to the graph. Returns Node. """
+        """
+        Create a Node and add it to the graph. Returns Node, which is equal
+        to the existing Node when one with the same name is already present.
+        """
 
-        node = Node(graph=self.graph, name=name)
+        node_id = self._store.intern(name)
+        self._store.add_node(node_id)
 
-        self._nodes.add(node)
+        return Node(graph=self.graph, node_id=node_id, name=name)
 
-        return node
+    def create_many(self, names):
+        """
+        Create Nodes for an iterable of names and add them to the graph in a
+        single batch. Returns a list of Nodes in the same order.
+        """
+        intern = self._store.intern
+        graph = self.graph
+
+        nodes = [
+            Node(graph=graph, node_id=intern(name), name=name)
+            for name in names
+        ]
+
+        self._store.add_nodes(node.id for node in nodes)
+
+        return nodes
 
     def all(self):
         """ Return all nodes in the current graph. """
-        return self._nodes
+        return set(self.get_by_id(node_id)
+            for node_id in self._store.iter_nodes()
+        )
 
     def remove(self, node):
-        """ Remove a Npde from the Graph. """
+        """
+        Remove a Node from the Graph, along with all Edges pointing to or
+        from it, their scores and ttl's and any cached values for the Node.
+        """
         # isinstance(node, Node)
 
-        self._nodes.remove(node)
+        # Cascade to incident Edges using the adjacency indexes
+        remove_edge = self.graph.edges.remove
+
+        for edge in self.graph.edges.from_node(node):
+            remove_edge(edge)
+
+        for edge in self.graph.edges.to_node(node):
+            remove_edge(edge)
+
+        # Node and explicitly set ttl
+        self._store.remove_node(node.id)
+
+        # Cached values
+        self._store.cache.invalidate(node.id)
+
+    def remove_many(self, nodes):
+        """ Remove an iterable of Nodes from the Graph. """
+        for node in nodes:
+            self.remove(node)
 
     def get(self, name):
         """ Get a single node by name. """
-        for node in self._nodes:
-            if node.name == name:
-                return node
-
-        # Not found, raise exception
-        raise NodeNotFound(name=name)
+        node_id = self._store.lookup(name)
+
+        if node_id is None or not self._store.has_node(node_id):
+            # Not found, raise exception
+            raise NodeNotFound(name=name)
+
+        return Node(graph=self.graph, node_id=node_id, name=name)
+
+    def get_many(self, names):
+        """
+        Get a list of nodes for an iterable of names, in the same order.
+        Raises NodeNotFound listing all names which could not be found.
+        """
+        lookup = self._store.lookup
+        has_node = self._store.has_node
+        graph = self.graph
+
+        nodes = []
+        missing = []
+        for name in names:
+            node_id = lookup(name)
+
+            if node_id is None or not has_node(node_id):
+                missing.append(name)
+            else:
+                nodes.append(Node(graph=graph, node_id=node_id, name=name))
 
-    def linked_to(self, node):
-        """ Return all nodes linked to node. """
-        edges = self.graph.edges.to_node(node)
-        nodes = [edge.node_from for edge in edges]
+        if missing:
+            raise NodeNotFound(names=missing)
 
         return nodes
 
-    def linked_from(self, node):
-        """ Return all nodes linked from node. """
-        edges = self.graph.edges.from_node(node)
-        nodes = [edge.node_to for edge in edges]
+    def get_by_id(self, node_id):
+        """ Return a Node for a node id in the store. """
+        return Node(graph=self.graph, node_id=node_id)
 
-        return nodes
+    def linked_to(self, node):
+        """ Return set of nodes linked to node. """
+        return set(
+            self.get_by_id(from_id)
+            for from_id in self._store.edges_in(node.id)
+        )
+
+    def linked_from(self, node):
+        """ Return set of nodes linked from node. """
+        return set(
+            self.get_by_id(to_id)
+            for to_id in self._store.edges_out(node.id)
+        )
+
+    def neighbors_to(self, nodes):
+        """
+        Generator yielding `(node, neighbor, score, weight)` for every Edge
+        from a neighbor to node, for a single Node or an iterable of Nodes.
+        Score and weight are those of the Edge from neighbor to node.
+        """
+        if isinstance(nodes, Node):
+            nodes = (nodes, )
+
+        graph = self.graph
+        get_node = self.get_by_id
+        edges_in = self._store.edges_in
+
+        for node in nodes:
+            # Iterate a copy, the store may change while yielding
+            for from_id in list(edges_in(node.id)):
+                edge = Edge(graph, get_node(from_id), node)
+
+                yield (node, edge.from_node, edge.score, edge.get_weight())
+
+    def neighbors_from(self, nodes):
+        """
+        Generator yielding `(node, neighbor, score, weight)` for every Edge
+        from node to a neighbor, for a single Node or an iterable of Nodes.
+        """
+        if isinstance(nodes, Node):
+            nodes = (nodes, )
+
+        graph = self.graph
+        get_node = self.get_by_id
+        edges_out = self._store.edges_out
+
+        for node in nodes:
+            # Iterate a copy, the store may change while yielding
+            for to_id in list(edges_out(node.id)):
+                edge = Edge(graph, node, get_node(to_id))
+
+                yield (node, edge.to_node, edge.score, edge.get_weight())
 
 
 class EdgeManager(object):
@@ -63,63 +173,157 @@ class EdgeManager(object):
         self.graph = graph
 
         # Shorthand for storage
-        self._edges = graph.store.edges
+        self._store = graph.store
 
     def all(self):
         """ Return edges in the current graph. """
-        return self._edges
+        get_node = self.graph.nodes.get_by_id
+
+        return set(
+            Edge(self.graph, get_node(from_id), get_node(to_id))
+            for from_id, to_id in self._store.iter_edges()
+        )
 
     def create(self, from_node, to_node):
-        """ Create an Edge and add it to the Graph. Returns Edge. """
+        """
+        Create an Edge and add it to the Graph. Returns Edge, which is equal
+        to the existing Edge when the two Nodes are already linked.
+        """
 
         edge = Edge(graph=self.graph, from_node=from_node, to_node=to_node)
 
-        # Add oneself to graph
-        self._edges.add(edge)
+        store = self._store
+        if not store.has_edge(from_node.id, to_node.id):
+            # Add oneself to graph
+            store.add_edge(from_node.id, to_node.id)
+
+            # The new Edge's ttl counts towards the minimal outgoing ttl
+            store.cache.invalidate(from_node.id)
 
         return edge
 
+    def create_many(self, pairs):
+        """
+        Create Edges for an iterable of `(from node, to node)` pairs and add
+        them to the Graph in a single batch. Returns a list of Edges in the
+        same order.
+        """
+        graph = self.graph
+
+        edges = [
+            Edge(graph=graph, from_node=from_node, to_node=to_node)
+            for from_node, to_node in pairs
+        ]
+
+        store = self._store
+        store.add_edges(
+            (edge.from_node.id, edge.to_node.id, None, None)
+            for edge in edges
+        )
+
+        store.cache.invalidate_many(
+            set(edge.from_node.id for edge in edges)
+        )
+
+        return edges
+
+    def increase_score_many(self, deltas, create=False):
+        """
+        Add deltas to the scores of Edges for an iterable of
+        `(from node, to node, delta)` rows in a single batch. Negative
+        deltas decrease scores, but never below 0.
+
+        Like Edge.increase_score(), Edges should exist: raises EdgeNotFound
+        listing all missing `(from node, to node)` pairs before changing any
+        score, unless create is true, in which case they are created.
+
+        Deltas are added to the Graph's score_buffer when set, like those of
+        Edge.increase_score(), so they apply in order. Otherwise cached
+        values depending on the originating Nodes are invalidated once per
+        Node.
+        """
+        nodes = set()
+        rows = []
+        pairs = {}
+
+        for from_node, to_node, delta in deltas:
+            nodes.add(from_node.id)
+            rows.append((from_node.id, to_node.id, delta))
+            pairs[(from_node.id, to_node.id)] = (from_node, to_node)
+
+        store = self._store
+        if create:
+            store.add_edges(
+                (from_id, to_id, None, None) for from_id, to_id in pairs
+            )
+
+            # New Edges' ttls count towards the minimal outgoing ttl
+            store.cache.invalidate_many(nodes)
+
+        else:
+            missing = [
+                pair for key, pair in pairs.iteritems()
+                if not store.has_edge(*key)
+            ]
+
+            if missing:
+                raise EdgeNotFound(pairs=missing)
+
+        buffer = self.graph.score_buffer
+        if buffer is not None:
+            for from_id, to_id, delta in rows:
+                buffer.add(from_id, to_id, delta)
+
+            return
+
+        store.increase_scores(rows)
+
+        store.cache.invalidate_many(nodes)
+
     def remove(self, edge):
-        """ Remove an Edge from the Graph. """
+        """
+        Remove an Edge from the Graph, along with its score, ttl and cached
+        values depending on it.
+        """
         # assert isinstance(edge, Edge)
 
-        self._edges.remove(edge)
+        edge._discard_buffered()
+
+        self._store.remove_edge(edge.from_node.id, edge.to_node.id)
+
+        # Cached values depending on Edges from the originating Node
+        self._store.cache.invalidate(edge.from_node.id)
 
     def to_node(self, node):
         """ Return set of edges ending at node. """
-        edges = set()
-
-        for edge in self._edges:
-            if edge.to_node == node:
-                edges.add(edge)
+        get_node = self.graph.nodes.get_by_id
 
-        return edges
+        return set(
+            Edge(self.graph, get_node(from_id), node)
+            for from_id in self._store.edges_in(node.id)
+        )
 
     def from_node(self, node):
         """ Return set of edges starting at node. """
-        edges = set()
-
-        for edge in self._edges:
-            if edge.from_node == node:
-                edges.add(edge)
+        get_node = self.graph.nodes.get_by_id
 
-        return edges
+        return set(
+            Edge(self.graph, node, get_node(to_id))
+            for to_id in self._store.edges_out(node.id)
+        )
 
     def get(self, from_node, to_node):
         """ Return the edge linking two nodes. """
 
-        from_nodes = self.from_node(from_node)
-        to_nodes = self.to_node(to_node)
-
-        edges = from_nodes.intersection(to_nodes)
-
-        if not edges:
+        if not self._store.has_edge(from_node.id, to_node.id):
             raise EdgeNotFound(from_node=from_node, to_node=to_node)
 
-        # There can only ever be one edge connecting two nodes
-        assert len(edges) == 1
+        return Edge(graph=self.graph, from_node=from_node, to_node=to_node)
+
+    def exists(self, from_node, to_node):
+        """ Return whether an edge links two nodes. """
 
-        return edges.pop()
+        return self._store.has_edge(from_node.id, to_node.id)
 
 
 class PathManager(object):
@@ -140,25 +344,45 @@ class EnsembleManager(object):
 
         paths = set()
 
-        for edge in self.graph.edges.from_node(from_node):
-            if prepend_path:
-                new_path = Path(prepend_path.edges + [edge])
-            else:
-                new_path = Path([edge])
-
-            # Only process when the initial Edge has weight
-            if new_path.get_weight() > self.graph.ensemble_weight_cutoff:
-
-                if new_path.to_node is to_node:
-                    # This is a direct connection, create and add Path
-                    paths.add(new_path)
-
-                # Recurse further
-                if len(new_path.edges) <= self.graph.ensemble_max_recursion:
-                    ensemble = self.get(new_path.to_node, to_node, new_path)
-
-                    # Create non-trivial paths
-                    for path in ensemble.paths:
-                        paths.add(path)
+        self._extend([(prepend_path, from_node)], to_node, paths)
 
         return Ensemble(paths)
+
+    def _extend(self, frontier, to_node, paths):
+        """
+        Extend `(path, end node)` pairs by the Edges from their end node,
+        adding Paths reaching to_node to paths, then recurse on the extended
+        Paths. A path of None stands for the empty Path.
+
+        All pairs of a recursion level are extended together, so the store
+        can prefetch the Edges of all end nodes at once.
+        """
+        graph = self.graph
+        cutoff = graph.ensemble_weight_cutoff
+        max_recursion = graph.ensemble_max_recursion
+        from_node = graph.edges.from_node
+
+        extended = []
+
+        with graph.store.prefetch(node.id for path, node in frontier):
+            for prepend_path, node in frontier:
+                for edge in from_node(node):
+                    if prepend_path:
+                        new_path = Path(prepend_path.edges + [edge])
+                    else:
+                        new_path = Path([edge])
+
+                    # Only process when the initial Edge has weight
+                    if new_path.get_weight() > cutoff:
+
+                        if new_path.to_node == to_node:
+                            # This is a direct connection, add Path
+                            paths.add(new_path)
+
+                        # Recurse further
+                        if len(new_path.edges) <= max_recursion:
+                            extended.append((new_path, new_path.to_node))
+
+            # Nested, keeping prefetched data for the ttls of earlier Edges
+            if extended:
+                self._extend(extended, to_node, paths)
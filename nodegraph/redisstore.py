@@ -0,0 +1,547 @@
+import contextlib
+import threading
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from .store import BaseGraphStore, Setting
+
+
+# Connection pools (url -> ConnectionPool) shared between stores
+_pools = {}
+
+
+def get_connection_pool(url):
+    """ Return the shared connection pool for a Redis url. """
+    try:
+        return _pools[url]
+    except KeyError:
+        pool = redis.ConnectionPool.from_url(url)
+        _pools[url] = pool
+
+        return pool
+
+
+def _int(value, default=None):
+    """ Convert a Redis reply to int, returning default for None. """
+    if value is None:
+        return default
+
+    return int(value)
+
+
+class RedisGraphStore(BaseGraphStore):
+    """
+    Store for Graph data in Redis, shared between processes; requires the
+    redis package.
+
+    All keys are prefixed with `nodegraph:<name>:`. The name table is kept
+    in the hashes `names` and `ids`, present nodes in the set `nodes` and
+    node ttl's in the hash `node_ttl`. Adjacency is kept in sets `out:<id>`
+    and `in:<id>`, scores and ttl's of outgoing edges in the hashes
+    `score:<id>` and `ttl:<id>`, so reading all outgoing scores or ttl's of
+    a node is a single round trip.
+
+    Stores for the same url share a connection pool. Graph settings are
+    read when the store is created.
+
+    Within prefetch() the adjacency, scores and ttls of a batch of nodes are
+    read in two round trips and served from memory to the current thread,
+    so EnsembleManager.get() costs two round trips per level of recursion.
+    """
+
+    graph_ttl = Setting('graph_ttl', 0)
+    path_dampening = Setting('path_dampening', 0.90)
+    ensemble_weight_cutoff = Setting('ensemble_weight_cutoff', 0.001)
+    ensemble_max_recursion = Setting('ensemble_max_recursion', 100)
+
+    # Clients are shared between threads, prefetched reads are per thread
+    thread_safe = True
+
+    def __init__(self, name, url='redis://localhost:6379/0', client=None):
+        if redis is None:
+            raise ImportError('RedisGraphStore requires redis.')
+
+        super(RedisGraphStore, self).__init__(name=name)
+
+        if client is None:
+            client = redis.StrictRedis(connection_pool=get_connection_pool(url))
+
+        self.redis = client
+
+        # Prefetched reads, per thread
+        self._local = threading.local()
+
+        self.prefix = 'nodegraph:{0}:'.format(name)
+
+        # Load settings, converting to the type of the default
+        settings = self.redis.hgetall(self._key('settings'))
+
+        self.settings = {}
+        for key, value in settings.iteritems():
+            default = getattr(type(self), key).default
+            self.settings[key] = type(default)(value)
+
+    def _key(self, *parts):
+        """ Return a prefixed Redis key. """
+        return self.prefix + ':'.join(str(part) for part in parts)
+
+    def save_setting(self, key, value):
+        """ Persist a Graph setting. """
+        self.redis.hset(self._key('settings'), key, value)
+
+    def clear(self):
+        """ Delete all data for this store. """
+        keys = list(self.redis.scan_iter(match=self.prefix + '*'))
+
+        if keys:
+            self.redis.delete(*keys)
+
+        self.settings = {}
+
+    @property
+    def edge_count(self):
+        """ Number of edges in the store. """
+        return _int(self.redis.get(self._key('edge_count')), 0)
+
+    # Name table
+
+    def intern(self, name):
+        """
+        Return the id for name, assigning a new one when required.
+
+        Ids are allocated from a counter; when two processes intern the same
+        name at once the id allocated by one of them remains unused.
+        """
+        node_id = self.lookup(name)
+
+        if node_id is None:
+            node_id = self.redis.incr(self._key('next_id')) - 1
+
+            if self.redis.hsetnx(self._key('names'), name, node_id):
+                self.redis.hset(self._key('ids'), node_id, name)
+            else:
+                node_id = self.lookup(name)
+
+        return node_id
+
+    def lookup(self, name):
+        """ Return the id for name, or None if it has never been interned. """
+        return _int(self.redis.hget(self._key('names'), name))
+
+    def get_name(self, node_id):
+        """ Return the name for a node id. """
+        name = self.redis.hget(self._key('ids'), node_id)
+
+        if name is None:
+            raise IndexError(node_id)
+
+        return name
+
+    # Nodes
+
+    def add_node(self, node_id):
+        """ Add a node id to the store. """
+        self.redis.sadd(self._key('nodes'), node_id)
+
+    def add_nodes(self, node_ids):
+        """ Add an iterable of node ids to the store. """
+        node_ids = list(node_ids)
+
+        if node_ids:
+            self.redis.sadd(self._key('nodes'), *node_ids)
+
+    def remove_node(self, node_id):
+        """
+        Remove a node id and its ttl from the store. Edges should have been
+        removed beforehand. The interned name is retained.
+        """
+        pipe = self.redis.pipeline()
+        pipe.srem(self._key('nodes'), node_id)
+        pipe.hdel(self._key('node_ttl'), node_id)
+        removed, _ = pipe.execute()
+
+        if not removed:
+            raise KeyError(node_id)
+
+    def has_node(self, node_id):
+        """ Return whether a node id is present in the store. """
+        return self.redis.sismember(self._key('nodes'), node_id)
+
+    def iter_nodes(self):
+        """ Iterate over all node ids. """
+        for node_id in self.redis.sscan_iter(self._key('nodes')):
+            yield int(node_id)
+
+    def get_node_ttl(self, node_id, default=None):
+        """ Return explicitly set ttl for node id or default. """
+        node_ttls = self._prefetched('node_ttls')
+
+        if node_ttls is not None and node_id in node_ttls:
+            return _int(node_ttls[node_id], default)
+
+        return _int(self.redis.hget(self._key('node_ttl'), node_id), default)
+
+    def node_ttls(self, node_ids, default=None):
+        """
+        Return a dictionary (id -> ttl) for an iterable of node ids, using
+        default for nodes without explicitly set ttl.
+        """
+        node_ids = list(node_ids)
+
+        if not node_ids:
+            return {}
+
+        prefetched = self._prefetched('node_ttls')
+
+        if prefetched is not None and all(
+            node_id in prefetched for node_id in node_ids
+        ):
+            ttls = [prefetched[node_id] for node_id in node_ids]
+        else:
+            ttls = self.redis.hmget(self._key('node_ttl'), node_ids)
+
+        return dict(
+            (node_id, _int(ttl, default))
+            for node_id, ttl in zip(node_ids, ttls)
+        )
+
+    def set_node_ttl(self, node_id, ttl):
+        """ Explicitly set ttl for node id. """
+        self.redis.hset(self._key('node_ttl'), node_id, ttl)
+
+    def delete_node_ttl(self, node_id):
+        """ Remove explicitly set ttl for node id. """
+        if not self.redis.hdel(self._key('node_ttl'), node_id):
+            raise KeyError(node_id)
+
+    # Edges
+
+    def add_edge(self, from_id, to_id):
+        """ Add an edge, returns False if it was already present. """
+        pipe = self.redis.pipeline()
+        pipe.sadd(self._key('out', from_id), to_id)
+        pipe.sadd(self._key('in', to_id), from_id)
+        added, _ = pipe.execute()
+
+        if added:
+            self.redis.incr(self._key('edge_count'))
+
+        return bool(added)
+
+    def add_edges(self, rows):
+        """
+        Add edges from an iterable of `(from id, to id, score, ttl)` rows in
+        a single round trip. Existing edges take the score and ttl of the
+        row; a score or ttl of None leaves it unchanged.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+
+        # Reply positions of the adjacency inserts
+        positions = []
+
+        for from_id, to_id, score, ttl in rows:
+            positions.append(len(pipe))
+
+            pipe.sadd(self._key('out', from_id), to_id)
+            pipe.sadd(self._key('in', to_id), from_id)
+            if score is not None:
+                pipe.hset(self._key('score', from_id), to_id, score)
+
+            if ttl is not None:
+                pipe.hset(self._key('ttl', from_id), to_id, ttl)
+
+        replies = pipe.execute()
+
+        added = sum(replies[position] for position in positions)
+
+        if added:
+            self.redis.incrby(self._key('edge_count'), added)
+
+    def remove_edge(self, from_id, to_id):
+        """ Remove an edge along with its score and ttl. """
+        pipe = self.redis.pipeline()
+        pipe.srem(self._key('out', from_id), to_id)
+        pipe.srem(self._key('in', to_id), from_id)
+        pipe.hdel(self._key('score', from_id), to_id)
+        pipe.hdel(self._key('ttl', from_id), to_id)
+        removed = pipe.execute()[0]
+
+        if not removed:
+            raise KeyError((from_id, to_id))
+
+        self.redis.decr(self._key('edge_count'))
+
+    def has_edge(self, from_id, to_id):
+        """ Return whether an edge is present in the store. """
+        return self.redis.sismember(self._key('out', from_id), to_id)
+
+    def iter_edges(self, chunk_size=1000):
+        """ Iterate over all edges as `(from id, to id)` pairs. """
+        chunk = []
+
+        for from_id in self.iter_nodes():
+            chunk.append(from_id)
+
+            if len(chunk) >= chunk_size:
+                for edge in self._edges_out_many(chunk):
+                    yield edge
+
+                chunk = []
+
+        for edge in self._edges_out_many(chunk):
+            yield edge
+
+    def _edges_out_many(self, from_ids):
+        """ Return `(from id, to id)` pairs for edges from node ids. """
+        pipe = self.redis.pipeline()
+        for from_id in from_ids:
+            pipe.smembers(self._key('out', from_id))
+
+        return [
+            (from_id, int(to_id))
+            for from_id, to_ids in zip(from_ids, pipe.execute())
+            for to_id in to_ids
+        ]
+
+    def edges_out(self, from_id):
+        """ Return the ids of nodes linked from node id. """
+        prefetched = self._prefetched_out(from_id)
+
+        if prefetched is not None:
+            to_ids = prefetched[0]
+        else:
+            to_ids = self.redis.smembers(self._key('out', from_id))
+
+        return [int(to_id) for to_id in to_ids]
+
+    @contextlib.contextmanager
+    def prefetch(self, from_ids):
+        """
+        Context manager reading the adjacency, scores and ttls of edges from
+        node ids in one pipeline, and the ttls of the nodes involved in a
+        second, serving reads of these from memory within the context.
+        Nested contexts add to the data of the outer one.
+
+        Writes within the context are not reflected in prefetched reads.
+        """
+        local = self._local
+
+        outer = getattr(local, 'out', None) is not None
+        if not outer:
+            local.out = {}
+            local.node_ttls = {}
+
+        out = local.out
+        node_ttls = local.node_ttls
+
+        from_ids = [from_id for from_id in set(from_ids) if from_id not in out]
+
+        replies = []
+        if from_ids:
+            pipe = self.redis.pipeline(transaction=False)
+            for from_id in from_ids:
+                pipe.smembers(self._key('out', from_id))
+                pipe.hgetall(self._key('score', from_id))
+                pipe.hgetall(self._key('ttl', from_id))
+
+            replies = pipe.execute()
+
+        # Nodes linked from node ids, without ttl read yet
+        node_ids = set(from_ids)
+        for index, from_id in enumerate(from_ids):
+            values = replies[3 * index:3 * index + 3]
+            out[from_id] = values
+
+            node_ids.update(int(to_id) for to_id in values[0])
+
+        node_ids = [
+            node_id for node_id in node_ids if node_id not in node_ttls
+        ]
+
+        if node_ids:
+            node_ttls.update(zip(
+                node_ids, self.redis.hmget(self._key('node_ttl'), node_ids)
+            ))
+
+        try:
+            yield
+
+        finally:
+            if not outer:
+                local.out = local.node_ttls = None
+
+    def _prefetched(self, name):
+        """ Return prefetched data of the current thread or None. """
+        return getattr(self._local, name, None)
+
+    def _prefetched_out(self, from_id):
+        """
+        Return prefetched `(to ids, scores, ttls)` replies for edges from
+        node id or None.
+        """
+        out = self._prefetched('out')
+
+        if out is None:
+            return None
+
+        return out.get(from_id)
+
+    def edges_in(self, to_id):
+        """ Return the ids of nodes linked to node id. """
+        return [
+            int(from_id)
+            for from_id in self.redis.smembers(self._key('in', to_id))
+        ]
+
+    def _values_out(self, from_id, hash_name, default):
+        """
+        Return `(to id, value)` pairs for edges from node id, read from
+        adjacency and the given hash in a single round trip.
+        """
+        prefetched = self._prefetched_out(from_id)
+
+        if prefetched is not None:
+            to_ids, scores, ttls = prefetched
+            values = scores if hash_name == 'score' else ttls
+
+        else:
+            pipe = self.redis.pipeline()
+            pipe.smembers(self._key('out', from_id))
+            pipe.hgetall(self._key(hash_name, from_id))
+            to_ids, values = pipe.execute()
+
+        return [
+            (int(to_id), _int(values.get(to_id), default))
+            for to_id in to_ids
+        ]
+
+    def scores_out(self, from_id):
+        """ Return `(to id, score)` pairs for edges from node id. """
+        return self._values_out(from_id, 'score', 0)
+
+    def ttls_out(self, from_id):
+        """
+        Return `(to id, ttl)` pairs for edges from node id, with a ttl of
+        None for edges without explicitly set ttl.
+        """
+        return self._values_out(from_id, 'ttl', None)
+
+    def get_score(self, from_id, to_id):
+        """ Return the score for an edge, 0 by default. """
+        prefetched = self._prefetched_out(from_id)
+
+        if prefetched is not None:
+            return _int(prefetched[1].get(str(to_id)), 0)
+
+        return _int(self.redis.hget(self._key('score', from_id), to_id), 0)
+
+    def set_score(self, from_id, to_id, score):
+        """
+        Set the score for an edge. Like in GraphStore, scores for edges not
+        in the store are ignored.
+        """
+        out_key = self._key('out', from_id)
+        key = self._key('score', from_id)
+
+        def write(pipe):
+            if pipe.sismember(out_key, to_id):
+                pipe.multi()
+                pipe.hset(key, to_id, score)
+
+        self.redis.transaction(write, out_key)
+
+    def delete_score(self, from_id, to_id):
+        """ Reset the score for an edge. """
+        self.redis.hdel(self._key('score', from_id), to_id)
+
+    def increase_score(self, from_id, to_id, delta):
+        """
+        Add delta to the score of an edge, never decreasing it below 0.
+        Returns the new score, 0 for edges not in the store.
+
+        The edge and its score are read and written in a transaction
+        watching the adjacency and scores of the node, retried when another
+        client changes them meanwhile, so concurrent increments are never
+        lost.
+        """
+        out_key = self._key('out', from_id)
+        key = self._key('score', from_id)
+
+        def increase(pipe):
+            if not pipe.sismember(out_key, to_id):
+                return 0
+
+            score = max(_int(pipe.hget(key, to_id), 0) + delta, 0)
+
+            pipe.multi()
+            pipe.hset(key, to_id, score)
+
+            return score
+
+        return self.redis.transaction(
+            increase, out_key, key, value_from_callable=True
+        )
+
+    def increase_scores(self, deltas):
+        """
+        Add deltas to the scores of edges from an iterable of
+        `(from id, to id, delta)` rows, never decreasing a score below 0.
+        Rows for edges not in the store are ignored.
+
+        Like increase_score(), this is a single transaction watching the
+        nodes involved, costing three round trips: the edges and scores are
+        read in one pipeline and the new scores written at once, so other
+        clients never see intermediate scores.
+        """
+        deltas = list(deltas)
+
+        if not deltas:
+            return
+
+        keys = set()
+        for from_id, to_id, delta in deltas:
+            keys.add(self._key('out', from_id))
+            keys.add(self._key('score', from_id))
+
+        def increase(pipe):
+            # Read after watching, changes from here on abort the write
+            reads = self.redis.pipeline(transaction=False)
+            for from_id, to_id, delta in deltas:
+                reads.sismember(self._key('out', from_id), to_id)
+                reads.hget(self._key('score', from_id), to_id)
+
+            replies = reads.execute()
+
+            # Apply deltas in order, clamping at 0 at every step
+            scores = {}
+            for index, (from_id, to_id, delta) in enumerate(deltas):
+                present, score = replies[2 * index:2 * index + 2]
+
+                if not present:
+                    continue
+
+                edge = (from_id, to_id)
+                score = scores.get(edge, _int(score, 0)) + delta
+                scores[edge] = max(score, 0)
+
+            pipe.multi()
+            for (from_id, to_id), score in scores.iteritems():
+                pipe.hset(self._key('score', from_id), to_id, score)
+
+        self.redis.transaction(increase, *keys)
+
+    def get_edge_ttl(self, from_id, to_id, default=None):
+        """ Return explicitly set ttl for an edge or default. """
+        prefetched = self._prefetched_out(from_id)
+
+        if prefetched is not None:
+            return _int(prefetched[2].get(str(to_id)), default)
+
+        return _int(self.redis.hget(self._key('ttl', from_id), to_id), default)
+
+    def set_edge_ttl(self, from_id, to_id, ttl):
+        """ Explicitly set ttl for an edge. """
+        self.redis.hset(self._key('ttl', from_id), to_id, ttl)
@@ -0,0 +1,433 @@
+import bisect
+import mmap
+import struct
+
+from .exceptions import ReadOnlyError
+from .store import BaseGraphStore
+
+
+# File identification and version
+MAGIC = 'NGSNAP01'
+
+# Magic, node count, edge count, graph_ttl, path_dampening,
+# ensemble_weight_cutoff, ensemble_max_recursion
+HEADER = struct.Struct('<8sqqqddq')
+
+# Marker for nodes without explicitly set ttl
+NO_TTL = -2 ** 63
+
+# Item formats for the sections, in file order
+SECTIONS = (
+    # Present flag per node id
+    ('present', 'B'),
+    # Explicit ttl per node id
+    ('node_ttl', 'q'),
+    # Outgoing adjacency in CSR form
+    ('out_offsets', 'q'),
+    ('out_targets', 'I'),
+    ('out_scores', 'q'),
+    ('out_ttls', 'q'),
+    # Incoming adjacency in CSR form
+    ('in_offsets', 'q'),
+    ('in_sources', 'I'),
+    # Name table; offsets into name data and node ids sorted by name
+    ('name_offsets', 'q'),
+    ('name_index', 'I'),
+    # UTF-8 encoded names
+    ('name_data', 'B'),
+)
+
+
+def _encode(name):
+    """ Return name as UTF-8 encoded bytes. """
+    if isinstance(name, unicode):
+        return name.encode('utf-8')
+
+    return name
+
+
+def _align(position):
+    """ Round position up to a multiple of 8 bytes. """
+    return (position + 7) & ~7
+
+
+def _layout(node_count, edge_count, name_size):
+    """ Return a dictionary (section -> (offset, format)) for a snapshot. """
+    counts = {
+        'present': node_count,
+        'node_ttl': node_count,
+        'out_offsets': node_count + 1,
+        'out_targets': edge_count,
+        'out_scores': edge_count,
+        'out_ttls': edge_count,
+        'in_offsets': node_count + 1,
+        'in_sources': edge_count,
+        'name_offsets': node_count + 1,
+        'name_index': node_count,
+        'name_data': name_size,
+    }
+
+    layout = {}
+    position = HEADER.size
+
+    for section, item_format in SECTIONS:
+        position = _align(position)
+        layout[section] = (position, item_format)
+
+        position += counts[section] * struct.calcsize(item_format)
+
+    return layout
+
+
+def _pack(item_format, values):
+    """ Pack a sequence of values as little-endian items. """
+    return struct.pack('<{0}{1}'.format(len(values), item_format), *values)
+
+
+def save_snapshot(store, f):
+    """
+    Write a snapshot of store to a file-like object opened for writing in
+    binary mode.
+
+    Rows are written one node at a time; apart from the name table, the
+    graph is never held in memory as a whole.
+    """
+    node_ids = sorted(store.iter_nodes())
+
+    if node_ids:
+        node_count = node_ids[-1] + 1
+    else:
+        node_count = 0
+
+    edge_count = store.edge_count
+
+    # Name table
+    names = {}
+    for node_id in node_ids:
+        names[node_id] = _encode(store.get_name(node_id))
+
+    name_size = sum(len(name) for name in names.itervalues())
+
+    layout = _layout(node_count, edge_count, name_size)
+
+    f.write(HEADER.pack(
+        MAGIC, node_count, edge_count, store.graph_ttl, store.path_dampening,
+        store.ensemble_weight_cutoff, store.ensemble_max_recursion
+    ))
+
+    def write(section, values, index=0):
+        """ Write values at index into a section. """
+        offset, item_format = layout[section]
+
+        f.seek(offset + index * struct.calcsize(item_format))
+        f.write(_pack(item_format, values))
+
+    # Nodes
+    present = set(node_ids)
+    write('present', [
+        int(node_id in present) for node_id in xrange(node_count)
+    ])
+
+    node_ttls = store.node_ttls(node_ids, NO_TTL)
+    write('node_ttl', [
+        node_ttls.get(node_id, NO_TTL) for node_id in xrange(node_count)
+    ])
+
+    # Outgoing edges, sorted by target within each row
+    position = 0
+    out_offsets = [0]
+
+    for node_id in xrange(node_count):
+        ttls = dict(store.ttls_out(node_id))
+        row = sorted(store.scores_out(node_id))
+
+        write('out_targets', [to_id for to_id, score in row], position)
+        write('out_scores', [score for to_id, score in row], position)
+        write('out_ttls', [
+            NO_TTL if ttls[to_id] is None else ttls[to_id]
+            for to_id, score in row
+        ], position)
+
+        position += len(row)
+        out_offsets.append(position)
+
+    assert position == edge_count
+
+    write('out_offsets', out_offsets)
+
+    # Incoming edges, sorted by source within each row
+    position = 0
+    in_offsets = [0]
+
+    for node_id in xrange(node_count):
+        row = sorted(store.edges_in(node_id))
+
+        write('in_sources', row, position)
+
+        position += len(row)
+        in_offsets.append(position)
+
+    write('in_offsets', in_offsets)
+
+    # Name table
+    position = 0
+    name_offsets = [0]
+
+    offset, item_format = layout['name_data']
+    f.seek(offset)
+
+    for node_id in xrange(node_count):
+        name = names.get(node_id, '')
+
+        f.write(name)
+
+        position += len(name)
+        name_offsets.append(position)
+
+    write('name_offsets', name_offsets)
+    # Absent node ids have an empty name
+    write('name_index', sorted(
+        xrange(node_count), key=lambda node_id: names.get(node_id, '')
+    ))
+
+
+class SnapshotGraphStore(BaseGraphStore):
+    """
+    Read-only store serving Graph data from a snapshot file written by
+    save_snapshot().
+
+    The file is memory mapped; pages are loaded by the operating system as
+    they are used and shared between all processes opening the same file.
+    Only the header is read on opening, so queries can be served right away.
+
+    Graph settings are read from the snapshot and may be changed for the
+    lifetime of the store; all other changes raise ReadOnlyError.
+    """
+
+    def __init__(self, name, path):
+        super(SnapshotGraphStore, self).__init__(name=name)
+
+        self.path = path
+
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic, self.node_count, self.edge_count, self.graph_ttl,
+            self.path_dampening, self.ensemble_weight_cutoff,
+            self.ensemble_max_recursion
+        ) = HEADER.unpack_from(self.mmap)
+
+        if magic != MAGIC:
+            raise ValueError('{0} is not a nodegraph snapshot.'.format(path))
+
+        # Find out name data size from the last name offset
+        layout = _layout(self.node_count, self.edge_count, 0)
+        name_size = self._read(layout, 'name_offsets', self.node_count)
+
+        self.layout = _layout(self.node_count, self.edge_count, name_size)
+
+    def close(self):
+        """ Unmap the snapshot. """
+        self.mmap.close()
+
+    def _read(self, layout, section, index):
+        """ Read a single item from a section. """
+        offset, item_format = layout[section]
+        size = struct.calcsize(item_format)
+
+        return struct.unpack_from(
+            '<' + item_format, self.mmap, offset + index * size
+        )[0]
+
+    def _get(self, section, index):
+        """ Read a single item from a section. """
+        return self._read(self.layout, section, index)
+
+    def _slice(self, section, start, end):
+        """ Read items start up to end from a section as a tuple. """
+        offset, item_format = self.layout[section]
+        size = struct.calcsize(item_format)
+
+        return struct.unpack_from(
+            '<{0}{1}'.format(end - start, item_format),
+            self.mmap, offset + start * size
+        )
+
+    def _row(self, offsets, node_id):
+        """ Return (start, end) of the row for node id. """
+        if 0 <= node_id < self.node_count:
+            return self._slice(offsets, node_id, node_id + 2)
+
+        return 0, 0
+
+    def _find(self, from_id, to_id):
+        """ Return the position of an edge in the outgoing section. """
+        start, end = self._row('out_offsets', from_id)
+        targets = self._slice('out_targets', start, end)
+
+        index = bisect.bisect_left(targets, to_id)
+
+        if index < len(targets) and targets[index] == to_id:
+            return start + index
+
+        return None
+
+    def _read_only(self, *args):
+        raise ReadOnlyError('Snapshot stores are read-only.')
+
+    # Name table
+
+    def intern(self, name):
+        """ Return the id for name, raises ReadOnlyError for new names. """
+        node_id = self.lookup(name)
+
+        if node_id is None:
+            self._read_only()
+
+        return node_id
+
+    def lookup(self, name):
+        """ Return the id for name, or None if it is not in the snapshot. """
+        encoded = _encode(name)
+
+        # Binary search on node ids sorted by name
+        low, high = 0, self.node_count
+        while low < high:
+            middle = (low + high) // 2
+            node_id = self._get('name_index', middle)
+
+            if self._name(node_id) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self.node_count:
+            node_id = self._get('name_index', low)
+
+            if self._name(node_id) == encoded and self.has_node(node_id):
+                return node_id
+
+        return None
+
+    def _name(self, node_id):
+        """ Return the encoded name for a node id. """
+        start, end = self._slice('name_offsets', node_id, node_id + 2)
+        offset, item_format = self.layout['name_data']
+
+        return self.mmap[offset + start:offset + end]
+
+    def get_name(self, node_id):
+        """ Return the name for a node id. """
+        if not self.has_node(node_id):
+            raise IndexError(node_id)
+
+        return self._name(node_id).decode('utf-8')
+
+    # Nodes
+
+    add_node = add_nodes = remove_node = _read_only
+
+    def has_node(self, node_id):
+        """ Return whether a node id is present in the store. """
+        return (
+            0 <= node_id < self.node_count and
+            bool(self._get('present', node_id))
+        )
+
+    def iter_nodes(self):
+        """ Iterate over all node ids. """
+        for node_id in xrange(self.node_count):
+            if self._get('present', node_id):
+                yield node_id
+
+    def get_node_ttl(self, node_id, default=None):
+        """ Return explicitly set ttl for node id or default. """
+        if not 0 <= node_id < self.node_count:
+            return default
+
+        ttl = self._get('node_ttl', node_id)
+
+        if ttl == NO_TTL:
+            return default
+
+        return ttl
+
+    set_node_ttl = delete_node_ttl = _read_only
+
+    # Edges
+
+    add_edge = add_edges = remove_edge = _read_only
+
+    def has_edge(self, from_id, to_id):
+        """ Return whether an edge is present in the store. """
+        return self._find(from_id, to_id) is not None
+
+    def iter_edges(self):
+        """ Iterate over all edges as `(from id, to id)` pairs. """
+        for from_id in xrange(self.node_count):
+            for to_id in self.edges_out(from_id):
+                yield (from_id, to_id)
+
+    def edges_out(self, from_id):
+        """ Return the ids of nodes linked from node id. """
+        start, end = self._row('out_offsets', from_id)
+
+        return self._slice('out_targets', start, end)
+
+    def edges_in(self, to_id):
+        """ Return the ids of nodes linked to node id. """
+        start, end = self._row('in_offsets', to_id)
+
+        return self._slice('in_sources', start, end)
+
+    def scores_out(self, from_id):
+        """ Return `(to id, score)` pairs for edges from node id. """
+        start, end = self._row('out_offsets', from_id)
+
+        return zip(
+            self._slice('out_targets', start, end),
+            self._slice('out_scores', start, end)
+        )
+
+    def ttls_out(self, from_id):
+        """
+        Return `(to id, ttl)` pairs for edges from node id, with a ttl of
+        None for edges without explicitly set ttl.
+        """
+        start, end = self._row('out_offsets', from_id)
+
+        return [
+            (to_id, None if ttl == NO_TTL else ttl)
+            for to_id, ttl in zip(
+                self._slice('out_targets', start, end),
+                self._slice('out_ttls', start, end)
+            )
+        ]
+
+    def get_score(self, from_id, to_id):
+        """ Return the score for an edge, 0 by default. """
+        index = self._find(from_id, to_id)
+
+        if index is None:
+            return 0
+
+        return self._get('out_scores', index)
+
+    def get_edge_ttl(self, from_id, to_id, default=None):
+        """ Return explicitly set ttl for an edge or default. """
+        index = self._find(from_id, to_id)
+
+        if index is None:
+            return default
+
+        ttl = self._get('out_ttls', index)
+
+        if ttl == NO_TTL:
+            return default
+
+        return ttl
+
+    set_score = delete_score = increase_scores = _read_only
+    increase_score = _read_only
+    set_edge_ttl = _read_only
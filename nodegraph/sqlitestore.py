@@ -0,0 +1,386 @@
+import sqlite3
+
+from .store import BaseGraphStore, Setting
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value
+);
+
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    present INTEGER NOT NULL DEFAULT 0,
+    ttl INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS edges (
+    from_id INTEGER NOT NULL,
+    to_id INTEGER NOT NULL,
+    score INTEGER NOT NULL DEFAULT 0,
+    ttl INTEGER,
+    PRIMARY KEY (from_id, to_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS edges_to ON edges (to_id, from_id);
+"""
+
+
+class SQLiteGraphStore(BaseGraphStore):
+    """
+    Store for Graph data in an SQLite database, allowing for graphs larger
+    than memory and fast restarts.
+
+    Writes are batched into transactions of `batch_size` statements; call
+    `commit()` to make pending writes durable. Reads on the same store
+    always include pending writes.
+    """
+
+    graph_ttl = Setting('graph_ttl', 0)
+    path_dampening = Setting('path_dampening', 0.90)
+    ensemble_weight_cutoff = Setting('ensemble_weight_cutoff', 0.001)
+    ensemble_max_recursion = Setting('ensemble_max_recursion', 100)
+
+    def __init__(self, name, path=':memory:', batch_size=1000):
+        super(SQLiteGraphStore, self).__init__(name=name)
+
+        self.path = path
+        self.batch_size = batch_size
+
+        # Number of writes since last commit
+        self.pending = 0
+
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+        # Load settings
+        self.settings = dict(
+            self.connection.execute('SELECT key, value FROM settings')
+        )
+
+    def execute(self, sql, parameters=()):
+        """ Execute a write, committing once batch_size is exceeded. """
+        cursor = self.connection.execute(sql, parameters)
+
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.commit()
+
+        return cursor
+
+    def executemany(self, sql, parameters):
+        """
+        Execute a write for a list of parameter tuples, counting every
+        tuple towards batch_size.
+        """
+        cursor = self.connection.executemany(sql, parameters)
+
+        self.pending += len(parameters)
+        if self.pending >= self.batch_size:
+            self.commit()
+
+        return cursor
+
+    def save_setting(self, key, value):
+        """ Persist a Graph setting. """
+        self.execute(
+            'INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)',
+            (key, value)
+        )
+
+    def commit(self):
+        """ Commit pending writes. """
+        self.connection.commit()
+
+        self.pending = 0
+
+    def close(self):
+        """ Commit pending writes and close the database. """
+        self.commit()
+        self.connection.close()
+
+    def _value(self, sql, parameters, default=None):
+        """ Return the first column of the first row for a query. """
+        row = self.connection.execute(sql, parameters).fetchone()
+
+        if row is None:
+            return default
+
+        return row[0]
+
+    @property
+    def edge_count(self):
+        """ Number of edges in the store. """
+        return self._value('SELECT COUNT(*) FROM edges', ())
+
+    # Name table
+
+    def intern(self, name):
+        """ Return the id for name, assigning a new one when required. """
+        node_id = self.lookup(name)
+
+        if node_id is None:
+            node_id = self._value('SELECT MAX(id) FROM nodes', ())
+
+            if node_id is None:
+                node_id = 0
+            else:
+                node_id += 1
+
+            self.execute(
+                'INSERT INTO nodes (id, name) VALUES (?, ?)', (node_id, name)
+            )
+
+        return node_id
+
+    def lookup(self, name):
+        """ Return the id for name, or None if it has never been interned. """
+        return self._value('SELECT id FROM nodes WHERE name = ?', (name, ))
+
+    def get_name(self, node_id):
+        """ Return the name for a node id. """
+        name = self._value('SELECT name FROM nodes WHERE id = ?', (node_id, ))
+
+        if name is None:
+            raise IndexError(node_id)
+
+        return name
+
+    # Nodes
+
+    def add_node(self, node_id):
+        """ Add a node id to the store. """
+        self.execute('UPDATE nodes SET present = 1 WHERE id = ?', (node_id, ))
+
+    def add_nodes(self, node_ids):
+        """ Add an iterable of node ids to the store. """
+        self.executemany(
+            'UPDATE nodes SET present = 1 WHERE id = ?',
+            [(node_id, ) for node_id in node_ids]
+        )
+
+    def remove_node(self, node_id):
+        """
+        Remove a node id and its ttl from the store. Edges should have been
+        removed beforehand. The interned name is retained.
+        """
+        cursor = self.execute(
+            'UPDATE nodes SET present = 0, ttl = NULL '
+            'WHERE id = ? AND present = 1', (node_id, )
+        )
+
+        if not cursor.rowcount:
+            raise KeyError(node_id)
+
+    def has_node(self, node_id):
+        """ Return whether a node id is present in the store. """
+        return bool(self._value(
+            'SELECT present FROM nodes WHERE id = ?', (node_id, )
+        ))
+
+    def iter_nodes(self):
+        """ Iterate over all node ids. """
+        for row in self.connection.execute(
+            'SELECT id FROM nodes WHERE present = 1'
+        ):
+            yield row[0]
+
+    def get_node_ttl(self, node_id, default=None):
+        """ Return explicitly set ttl for node id or default. """
+        ttl = self._value('SELECT ttl FROM nodes WHERE id = ?', (node_id, ))
+
+        if ttl is None:
+            return default
+
+        return ttl
+
+    def node_ttls(self, node_ids, default=None):
+        """
+        Return a dictionary (id -> ttl) for an iterable of node ids, using
+        default for nodes without explicitly set ttl.
+        """
+        node_ids = list(node_ids)
+        ttls = dict.fromkeys(node_ids, default)
+
+        # Stay below SQLite's limit on the number of query parameters
+        for start in xrange(0, len(node_ids), 500):
+            chunk = node_ids[start:start + 500]
+
+            for node_id, ttl in self.connection.execute(
+                'SELECT id, ttl FROM nodes WHERE ttl IS NOT NULL AND id IN '
+                '({0})'.format(', '.join('?' * len(chunk))), chunk
+            ):
+                ttls[node_id] = ttl
+
+        return ttls
+
+    def set_node_ttl(self, node_id, ttl):
+        """ Explicitly set ttl for node id. """
+        self.execute('UPDATE nodes SET ttl = ? WHERE id = ?', (ttl, node_id))
+
+    def delete_node_ttl(self, node_id):
+        """ Remove explicitly set ttl for node id. """
+        self.execute('UPDATE nodes SET ttl = NULL WHERE id = ?', (node_id, ))
+
+    # Edges
+
+    def add_edge(self, from_id, to_id):
+        """ Add an edge, returns False if it was already present. """
+        cursor = self.execute(
+            'INSERT OR IGNORE INTO edges (from_id, to_id) VALUES (?, ?)',
+            (from_id, to_id)
+        )
+
+        return cursor.rowcount == 1
+
+    def add_edges(self, rows):
+        """
+        Add edges from an iterable of `(from id, to id, score, ttl)` rows.
+        Existing edges take the score and ttl of the row; a score or ttl of
+        None leaves it unchanged.
+        """
+        rows = list(rows)
+
+        self.executemany(
+            'INSERT OR IGNORE INTO edges (from_id, to_id) VALUES (?, ?)',
+            [(from_id, to_id) for from_id, to_id, score, ttl in rows]
+        )
+        self.executemany(
+            'UPDATE edges SET score = COALESCE(?, score), '
+            'ttl = COALESCE(?, ttl) '
+            'WHERE from_id = ? AND to_id = ?',
+            [
+                (score, ttl, from_id, to_id)
+                for from_id, to_id, score, ttl in rows
+            ]
+        )
+
+    def remove_edge(self, from_id, to_id):
+        """ Remove an edge along with its score and ttl. """
+        cursor = self.execute(
+            'DELETE FROM edges WHERE from_id = ? AND to_id = ?',
+            (from_id, to_id)
+        )
+
+        if not cursor.rowcount:
+            raise KeyError((from_id, to_id))
+
+    def has_edge(self, from_id, to_id):
+        """ Return whether an edge is present in the store. """
+        return self._value(
+            'SELECT 1 FROM edges WHERE from_id = ? AND to_id = ?',
+            (from_id, to_id)
+        ) is not None
+
+    def iter_edges(self):
+        """ Iterate over all edges as `(from id, to id)` pairs. """
+        for row in self.connection.execute(
+            'SELECT from_id, to_id FROM edges'
+        ):
+            yield row
+
+    def edges_out(self, from_id):
+        """ Return the ids of nodes linked from node id. """
+        return [row[0] for row in self.connection.execute(
+            'SELECT to_id FROM edges WHERE from_id = ?', (from_id, )
+        )]
+
+    def edges_in(self, to_id):
+        """ Return the ids of nodes linked to node id. """
+        return [row[0] for row in self.connection.execute(
+            'SELECT from_id FROM edges WHERE to_id = ?', (to_id, )
+        )]
+
+    def scores_out(self, from_id):
+        """ Return `(to id, score)` pairs for edges from node id. """
+        return self.connection.execute(
+            'SELECT to_id, score FROM edges WHERE from_id = ?', (from_id, )
+        ).fetchall()
+
+    def iter_scores(self):
+        """
+        Iterate over all edges as `(from id, to id, score)` rows, grouped by
+        from id.
+        """
+        return self.connection.execute(
+            'SELECT from_id, to_id, score FROM edges ORDER BY from_id'
+        )
+
+    def score_out(self, from_id):
+        """ Return the total score of edges from node id. """
+        return self._value(
+            'SELECT COALESCE(SUM(score), 0) FROM edges WHERE from_id = ?',
+            (from_id, ), 0
+        )
+
+    def ttls_out(self, from_id):
+        """
+        Return `(to id, ttl)` pairs for edges from node id, with a ttl of
+        None for edges without explicitly set ttl.
+        """
+        return self.connection.execute(
+            'SELECT to_id, ttl FROM edges WHERE from_id = ?', (from_id, )
+        ).fetchall()
+
+    def get_score(self, from_id, to_id):
+        """ Return the score for an edge, 0 by default. """
+        return self._value(
+            'SELECT score FROM edges WHERE from_id = ? AND to_id = ?',
+            (from_id, to_id), 0
+        )
+
+    def set_score(self, from_id, to_id, score):
+        """ Set the score for an edge. """
+        self.execute(
+            'UPDATE edges SET score = ? WHERE from_id = ? AND to_id = ?',
+            (score, from_id, to_id)
+        )
+
+    def delete_score(self, from_id, to_id):
+        """ Reset the score for an edge. """
+        self.set_score(from_id, to_id, 0)
+
+    def increase_score(self, from_id, to_id, delta):
+        """
+        Add delta to the score of an edge in a single statement, never
+        decreasing it below 0. Returns the new score.
+        """
+        self.execute(
+            'UPDATE edges SET score = MAX(score + ?, 0) '
+            'WHERE from_id = ? AND to_id = ?',
+            (delta, from_id, to_id)
+        )
+
+        return self.get_score(from_id, to_id)
+
+    def increase_scores(self, deltas):
+        """
+        Add deltas to the scores of edges from an iterable of
+        `(from id, to id, delta)` rows, never decreasing a score below 0.
+        """
+        self.executemany(
+            'UPDATE edges SET score = MAX(score + ?, 0) '
+            'WHERE from_id = ? AND to_id = ?',
+            [(delta, from_id, to_id) for from_id, to_id, delta in deltas]
+        )
+
+    def get_edge_ttl(self, from_id, to_id, default=None):
+        """ Return explicitly set ttl for an edge or default. """
+        ttl = self._value(
+            'SELECT ttl FROM edges WHERE from_id = ? AND to_id = ?',
+            (from_id, to_id)
+        )
+
+        if ttl is None:
+            return default
+
+        return ttl
+
+    def set_edge_ttl(self, from_id, to_id, ttl):
+        """ Explicitly set ttl for an edge. """
+        self.execute(
+            'UPDATE edges SET ttl = ? WHERE from_id = ? AND to_id = ?',
+            (ttl, from_id, to_id)
+        )
@@ -1,51 +1,67 @@
+import contextlib
 import cPickle as pickle
+import threading
 
 from .cache import GraphCache
 
 
-class GraphStore(object):
+class Setting(object):
+    """
+    Descriptor for Graph settings kept in memory in the `settings`
+    dictionary of a store and persisted through its `save_setting()`.
     """
-    Store for Graph data; Edges (scores) and Nodes are stored here.
 
-    The idea is to be able to have pluggable storage backends with the default
-    (for now) being an in-memory store.
+    def __init__(self, key, default):
+        self.key = key
+        self.default = default
 
-    store = GraphStore(name=...)
-    store.edges = ...
-    store.nodes = ...
-    store.scores[node] = ...
-    """
+    def __get__(self, store, owner):
+        if store is None:
+            return self
 
-    def __init__(self, name):
-        # Graph TTL container
-        self.name = name
+        return store.settings.get(self.key, self.default)
 
-        # Set initial ttl to 0
-        self.graph_ttl = 0
+    def __set__(self, store, value):
+        store.settings[self.key] = value
 
-        # Set initial graph dampening to 0
-        self.path_dampening = 0.90
+        store.save_setting(self.key, value)
 
-        # Set initial recursion weight cutoff for ensembles
-        self.ensemble_weight_cutoff = 0.001
 
-        # Maximum iteration depth for ensemble recursion
-        self.ensemble_max_recursion = 100
+class BaseGraphStore(object):
+    """
+    Interface for Graph storage backends.
 
-        # Create empty set for storage of nodes
-        self.nodes = set()
+    Nodes are identified by dense integer ids assigned through an interned
+    name table, Edges by `(from id, to id)` pairs. Node and Edge objects are
+    lightweight views over these ids.
 
-        # Create a dictionary (Node -> ttl) for storing node ttl's
-        self.node_ttl = {}
+    Backends implement the methods below raising NotImplementedError and
+    provide the Graph settings `graph_ttl`, `path_dampening`,
+    `ensemble_weight_cutoff` and `ensemble_max_recursion` as attributes,
+    as well as the number of edges as `edge_count`. A GraphCache is
+    available as `cache`.
 
-        # Create emtpy set for storage of edges
-        self.edges = set()
+    Backends setting `aggregates` maintain the total outgoing score per
+    node, making score_out() O(1); weights are then computed directly
+    instead of cached. Backends setting `thread_safe` may be written from
+    several threads.
 
-        # Create empty dictionery (Edge -> ttl_ for storing edge ttl's
-        self.edge_ttl = {}
+    store = Store(name=...)
+    node_id = store.intern(name)
+    store.add_node(node_id)
+    store.add_edge(from_id, to_id)
+    store.set_score(from_id, to_id, ...)
+    """
 
-        # Create a dictionary for storing Edge -> score pairs
-        self.edge_score = {}
+    # Whether score_out() is maintained incrementally
+    aggregates = False
+
+    # Whether writes from several threads are supported
+    thread_safe = False
+
+    def __init__(self, name):
+        # Graph TTL container
+        self.name = name
 
         # Key-value cache
         self.cache = GraphCache()
@@ -60,6 +76,329 @@ class GraphStore(object):
     def __hash__(self):
         return hash(self.key())
 
+    # Name table
+
+    def intern(self, name):
+        """ Return the id for name, assigning a new one when required. """
+        raise NotImplementedError
+
+    def lookup(self, name):
+        """ Return the id for name, or None if it has never been interned. """
+        raise NotImplementedError
+
+    def get_name(self, node_id):
+        """ Return the name for a node id. """
+        raise NotImplementedError
+
+    # Nodes
+
+    def add_node(self, node_id):
+        """ Add a node id to the store. """
+        raise NotImplementedError
+
+    def add_nodes(self, node_ids):
+        """ Add an iterable of node ids to the store. """
+        for node_id in node_ids:
+            self.add_node(node_id)
+
+    def remove_node(self, node_id):
+        """
+        Remove a node id and its ttl from the store. Edges should have been
+        removed beforehand. The interned name is retained.
+        """
+        raise NotImplementedError
+
+    def has_node(self, node_id):
+        """ Return whether a node id is present in the store. """
+        raise NotImplementedError
+
+    def iter_nodes(self):
+        """ Iterate over all node ids. """
+        raise NotImplementedError
+
+    def get_node_ttl(self, node_id, default=None):
+        """ Return explicitly set ttl for node id or default. """
+        raise NotImplementedError
+
+    def node_ttls(self, node_ids, default=None):
+        """
+        Return a dictionary (id -> ttl) for an iterable of node ids, using
+        default for nodes without explicitly set ttl.
+        """
+        return dict(
+            (node_id, self.get_node_ttl(node_id, default))
+            for node_id in node_ids
+        )
+
+    def set_node_ttl(self, node_id, ttl):
+        """ Explicitly set ttl for node id. """
+        raise NotImplementedError
+
+    def delete_node_ttl(self, node_id):
+        """ Remove explicitly set ttl for node id. """
+        raise NotImplementedError
+
+    # Edges
+
+    def add_edge(self, from_id, to_id):
+        """ Add an edge, returns False if it was already present. """
+        raise NotImplementedError
+
+    def add_edges(self, rows):
+        """
+        Add edges from an iterable of `(from id, to id, score, ttl)` rows.
+        Existing edges take the score and ttl of the row; a score or ttl of
+        None leaves it unchanged.
+        """
+        for from_id, to_id, score, ttl in rows:
+            self.add_edge(from_id, to_id)
+
+            if score is not None:
+                self.set_score(from_id, to_id, score)
+
+            if ttl is not None:
+                self.set_edge_ttl(from_id, to_id, ttl)
+
+    def increase_score(self, from_id, to_id, delta):
+        """
+        Add delta to the score of an edge, never decreasing it below 0.
+        Returns the new score, 0 for edges not in the store.
+        """
+        if not self.has_edge(from_id, to_id):
+            return 0
+
+        score = max(self.get_score(from_id, to_id) + delta, 0)
+
+        self.set_score(from_id, to_id, score)
+
+        return score
+
+    def increase_scores(self, deltas):
+        """
+        Add deltas to the scores of edges from an iterable of
+        `(from id, to id, delta)` rows, never decreasing a score below 0.
+        """
+        for from_id, to_id, delta in deltas:
+            score = self.get_score(from_id, to_id) + delta
+
+            self.set_score(from_id, to_id, max(score, 0))
+
+    def remove_edge(self, from_id, to_id):
+        """ Remove an edge along with its score and ttl. """
+        raise NotImplementedError
+
+    def has_edge(self, from_id, to_id):
+        """ Return whether an edge is present in the store. """
+        raise NotImplementedError
+
+    def iter_edges(self):
+        """ Iterate over all edges as `(from id, to id)` pairs. """
+        raise NotImplementedError
+
+    def iter_scores(self):
+        """
+        Iterate over all edges as `(from id, to id, score)` rows, grouped by
+        from id.
+        """
+        for from_id in self.iter_nodes():
+            for to_id, score in self.scores_out(from_id):
+                yield (from_id, to_id, score)
+
+    def edges_out(self, from_id):
+        """ Return the ids of nodes linked from node id. """
+        raise NotImplementedError
+
+    @contextlib.contextmanager
+    def prefetch(self, from_ids):
+        """
+        Context manager announcing reads of the edges from node ids, their
+        scores and ttls and the ttls of the nodes involved. Stores with
+        costly reads may fetch these in a batch and serve reads from it
+        within the context; by default it does nothing.
+        """
+        yield
+
+    def edges_in(self, to_id):
+        """ Return the ids of nodes linked to node id. """
+        raise NotImplementedError
+
+    def scores_out(self, from_id):
+        """ Return `(to id, score)` pairs for edges from node id. """
+        return [
+            (to_id, self.get_score(from_id, to_id))
+            for to_id in self.edges_out(from_id)
+        ]
+
+    def score_out(self, from_id):
+        """ Return the total score of edges from node id. """
+        return sum(score for to_id, score in self.scores_out(from_id))
+
+    def ttls_out(self, from_id):
+        """
+        Return `(to id, ttl)` pairs for edges from node id, with a ttl of
+        None for edges without explicitly set ttl.
+        """
+        return [
+            (to_id, self.get_edge_ttl(from_id, to_id))
+            for to_id in self.edges_out(from_id)
+        ]
+
+    def get_score(self, from_id, to_id):
+        """ Return the score for an edge, 0 by default. """
+        raise NotImplementedError
+
+    def set_score(self, from_id, to_id, score):
+        """ Set the score for an edge. """
+        raise NotImplementedError
+
+    def delete_score(self, from_id, to_id):
+        """ Reset the score for an edge. """
+        raise NotImplementedError
+
+    def get_edge_ttl(self, from_id, to_id, default=None):
+        """ Return explicitly set ttl for an edge or default. """
+        raise NotImplementedError
+
+    def set_edge_ttl(self, from_id, to_id, ttl):
+        """ Explicitly set ttl for an edge. """
+        raise NotImplementedError
+
+
+class GraphStore(BaseGraphStore):
+    """
+    In-memory store for Graph data; Edges (scores) and Nodes are stored here.
+
+    The total score of outgoing edges per node is updated on every score
+    write and edge removal.
+
+    Concurrent writers are supported: edges, scores and totals are guarded
+    by `stripes` locks selected by node id, see lock() and lock_edge(), so
+    increase_score() is atomic and writers to different nodes rarely
+    contend. Edges and their values are read as copies taken under the
+    lock. Subclasses writing to other structures, like CSRGraphStore,
+    are not thread-safe.
+    """
+
+    aggregates = True
+    thread_safe = True
+
+    # Set initial ttl to 0
+    graph_ttl = Setting('graph_ttl', 0)
+
+    # Set initial graph dampening to 0
+    path_dampening = Setting('path_dampening', 0.90)
+
+    # Set initial recursion weight cutoff for ensembles
+    ensemble_weight_cutoff = Setting('ensemble_weight_cutoff', 0.001)
+
+    # Maximum iteration depth for ensemble recursion
+    ensemble_max_recursion = Setting('ensemble_max_recursion', 100)
+
+    def __init__(self, name, stripes=64):
+        super(GraphStore, self).__init__(name=name)
+
+        # Striped locks for edges by from id, and locks for the name table
+        # and edge count
+        self.stripes = stripes
+        self._create_locks()
+
+        # Graph settings differing from the defaults
+        self.settings = {}
+
+        # Interned name table; list (id -> name) and dictionary (name -> id)
+        self.node_names = []
+        self.node_ids = {}
+
+        # Create empty set for storage of node ids
+        self.nodes = set()
+
+        # Create a dictionary (id -> ttl) for storing node ttl's
+        self.node_ttl = {}
+
+        # Adjacency indexes (id -> set of ids) for outgoing and incoming
+        # Edges; together these define the set of edges
+        self.edges_from = {}
+        self.edges_to = {}
+
+        # Number of edges in the adjacency indexes
+        self.edge_count = 0
+
+        # Create empty dictionery ((from id, to id) -> ttl) for edge ttl's
+        self.edge_ttl = {}
+
+        # Create a dictionary for storing (from id, to id) -> score pairs
+        self.edge_score = {}
+
+        # Total score of outgoing edges (id -> score)
+        self.edge_score_out = {}
+
+    def _create_locks(self):
+        """ Create the locks guarding the store. """
+        self.locks = [threading.Lock() for i in xrange(self.stripes)]
+
+        self._intern_lock = threading.Lock()
+        self._count_lock = threading.Lock()
+
+    def lock(self, node_id):
+        """
+        Return the lock guarding edges from node id, their scores, ttls and
+        total score, and the index of edges to node id.
+        """
+        return self.locks[node_id % self.stripes]
+
+    @contextlib.contextmanager
+    def lock_edge(self, from_id, to_id):
+        """
+        Context manager holding the locks for both nodes of an edge,
+        acquired in stripe order to prevent deadlocks.
+        """
+        stripes = self.stripes
+        first, second = sorted((from_id % stripes, to_id % stripes))
+
+        with self.locks[first]:
+            if first == second:
+                yield
+            else:
+                with self.locks[second]:
+                    yield
+
+    def __getstate__(self):
+        """
+        The cache holds Node and Edge views and is not persisted, neither
+        are locks.
+        """
+        state = self.__dict__.copy()
+        del state['cache']
+        del state['locks']
+        del state['_intern_lock']
+        del state['_count_lock']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        self.cache = GraphCache()
+
+        # Stores pickled before locks were striped
+        if 'stripes' not in state:
+            self.stripes = 64
+
+        self._create_locks()
+
+        # Stores pickled before totals were maintained
+        if 'edge_score_out' not in state:
+            self.edge_score_out = {}
+
+            for from_id in self.edges_from.keys():
+                self._add_score_out(
+                    from_id, BaseGraphStore.score_out(self, from_id)
+                )
+
+    def save_setting(self, key, value):
+        """ Settings are only kept in memory. """
+        pass
+
     def save(self, f):
         """ Save pickled Graph to file-like object. """
 
@@ -70,3 +409,313 @@ class GraphStore(object):
         """ Load pickled Graph from file-like object. """
 
         return pickle.load(f)
+
+    # Name table
+
+    def intern(self, name):
+        """ Return the id for name, assigning a new one when required. """
+        try:
+            return self.node_ids[name]
+        except KeyError:
+            pass
+
+        with self._intern_lock:
+            # Interned by another thread meanwhile
+            if name in self.node_ids:
+                return self.node_ids[name]
+
+            node_id = len(self.node_names)
+
+            self.node_names.append(name)
+            self.node_ids[name] = node_id
+
+            return node_id
+
+    def lookup(self, name):
+        """ Return the id for name, or None if it has never been interned. """
+        return self.node_ids.get(name)
+
+    def get_name(self, node_id):
+        """ Return the name for a node id. """
+        return self.node_names[node_id]
+
+    # Nodes
+
+    def add_node(self, node_id):
+        """ Add a node id to the store. """
+        self.nodes.add(node_id)
+
+    def add_nodes(self, node_ids):
+        """ Add an iterable of node ids to the store. """
+        self.nodes.update(node_ids)
+
+    def remove_node(self, node_id):
+        """
+        Remove a node id and its ttl from the store. Edges should have been
+        removed beforehand. The interned name is retained.
+        """
+        self.nodes.remove(node_id)
+        self.node_ttl.pop(node_id, None)
+
+    def has_node(self, node_id):
+        """ Return whether a node id is present in the store. """
+        return node_id in self.nodes
+
+    def iter_nodes(self):
+        """ Iterate over all node ids. """
+        return iter(self.nodes)
+
+    def get_node_ttl(self, node_id, default=None):
+        """ Return explicitly set ttl for node id or default. """
+        return self.node_ttl.get(node_id, default)
+
+    def set_node_ttl(self, node_id, ttl):
+        """ Explicitly set ttl for node id. """
+        self.node_ttl[node_id] = ttl
+
+    def delete_node_ttl(self, node_id):
+        """ Remove explicitly set ttl for node id. """
+        del self.node_ttl[node_id]
+
+    # Edges
+
+    def add_edge(self, from_id, to_id):
+        """ Add an edge, returns False if it was already present. """
+        with self.lock_edge(from_id, to_id):
+            targets = self.edges_from.setdefault(from_id, set())
+
+            if to_id in targets:
+                return False
+
+            targets.add(to_id)
+            self.edges_to.setdefault(to_id, set()).add(from_id)
+
+        with self._count_lock:
+            self.edge_count += 1
+
+        return True
+
+    def add_edges(self, rows):
+        """
+        Add edges from an iterable of `(from id, to id, score, ttl)` rows.
+        Existing edges take the score and ttl of the row; a score or ttl of
+        None leaves it unchanged.
+        """
+        # Local lookups for the inner loop
+        edges_from = self.edges_from
+        edges_to = self.edges_to
+        edge_score = self.edge_score
+        edge_ttl = self.edge_ttl
+        edge_score_out = self.edge_score_out
+        lock_edge = self.lock_edge
+
+        added = 0
+        for from_id, to_id, score, ttl in rows:
+            with lock_edge(from_id, to_id):
+                targets = edges_from.get(from_id)
+                if targets is None:
+                    targets = edges_from[from_id] = set()
+
+                if to_id not in targets:
+                    targets.add(to_id)
+
+                    edges_to.setdefault(to_id, set()).add(from_id)
+
+                    added += 1
+
+                if score is not None:
+                    key = (from_id, to_id)
+
+                    edge_score_out[from_id] = (
+                        edge_score_out.get(from_id, 0) + score -
+                        edge_score.get(key, 0)
+                    )
+                    edge_score[key] = score
+
+                if ttl is not None:
+                    edge_ttl[(from_id, to_id)] = ttl
+
+        with self._count_lock:
+            self.edge_count += added
+
+    def remove_edge(self, from_id, to_id):
+        """ Remove an edge along with its score and ttl. """
+        with self.lock_edge(from_id, to_id):
+            self._unindex(self.edges_from, from_id, to_id)
+            self._unindex(self.edges_to, to_id, from_id)
+
+            self._add_score_out(
+                from_id, -self.edge_score.pop((from_id, to_id), 0)
+            )
+            self.edge_ttl.pop((from_id, to_id), None)
+
+        with self._count_lock:
+            self.edge_count -= 1
+
+    def _unindex(self, index, node_id, other_id):
+        """ Remove other_id from the adjacency index for node_id. """
+        node_ids = index[node_id]
+        node_ids.remove(other_id)
+
+        if not node_ids:
+            del index[node_id]
+
+    def has_edge(self, from_id, to_id):
+        """ Return whether an edge is present in the store. """
+        return to_id in self.edges_from.get(from_id, ())
+
+    def iter_edges(self):
+        """
+        Iterate over all edges as `(from id, to id)` pairs, reading the
+        edges from every node at once.
+        """
+        for from_id in self.edges_from.keys():
+            for to_id in GraphStore.edges_out(self, from_id):
+                yield (from_id, to_id)
+
+    def iter_scores(self):
+        """
+        Iterate over all edges as `(from id, to id, score)` rows, grouped by
+        from id.
+        """
+        for from_id in self.edges_from.keys():
+            for to_id, score in GraphStore.scores_out(self, from_id):
+                yield (from_id, to_id, score)
+
+    def edges_out(self, from_id):
+        """
+        Return a list of the ids of nodes linked from node id, copied under
+        the lock of the node.
+        """
+        with self.lock(from_id):
+            return list(self.edges_from.get(from_id, ()))
+
+    def edges_in(self, to_id):
+        """
+        Return a list of the ids of nodes linked to node id, copied under
+        the lock of the node.
+        """
+        with self.lock(to_id):
+            return list(self.edges_to.get(to_id, ()))
+
+    def scores_out(self, from_id):
+        """ Return `(to id, score)` pairs for edges from node id. """
+        edge_score = self.edge_score
+
+        with self.lock(from_id):
+            return [
+                (to_id, edge_score.get((from_id, to_id), 0))
+                for to_id in self.edges_from.get(from_id, ())
+            ]
+
+    def score_out(self, from_id):
+        """ Return the total score of edges from node id. """
+        return self.edge_score_out.get(from_id, 0)
+
+    def _add_score_out(self, from_id, delta):
+        """
+        Add delta to the total score of edges from node id, the lock for
+        the node should be held.
+        """
+        if delta:
+            self.edge_score_out[from_id] = (
+                self.edge_score_out.get(from_id, 0) + delta
+            )
+
+    def ttls_out(self, from_id):
+        """
+        Return `(to id, ttl)` pairs for edges from node id, with a ttl of
+        None for edges without explicitly set ttl.
+        """
+        edge_ttl = self.edge_ttl
+
+        with self.lock(from_id):
+            return [
+                (to_id, edge_ttl.get((from_id, to_id)))
+                for to_id in self.edges_from.get(from_id, ())
+            ]
+
+    def get_score(self, from_id, to_id):
+        """ Return the score for an edge, 0 by default. """
+        return self.edge_score.get((from_id, to_id), 0)
+
+    def set_score(self, from_id, to_id, score):
+        """
+        Set the score for an edge. Like in SQLiteGraphStore, scores for
+        edges not in the store are ignored, keeping totals consistent.
+        """
+        with self.lock(from_id):
+            if not self.has_edge(from_id, to_id):
+                return
+
+            self._add_score_out(
+                from_id, score - self.get_score(from_id, to_id)
+            )
+
+            self.edge_score[(from_id, to_id)] = score
+
+    def delete_score(self, from_id, to_id):
+        """ Reset the score for an edge. """
+        with self.lock(from_id):
+            self._add_score_out(
+                from_id, -self.edge_score.pop((from_id, to_id))
+            )
+
+    def increase_score(self, from_id, to_id, delta):
+        """
+        Atomically add delta to the score of an edge, never decreasing it
+        below 0. Returns the new score, 0 for edges not in the store.
+        """
+        with self.lock(from_id):
+            if not self.has_edge(from_id, to_id):
+                return 0
+
+            previous = self.get_score(from_id, to_id)
+
+            score = previous + delta
+            if score < 0:
+                score = 0
+
+            self.edge_score[(from_id, to_id)] = score
+            self._add_score_out(from_id, score - previous)
+
+        return score
+
+    def increase_scores(self, deltas):
+        """
+        Add deltas to the scores of edges from an iterable of
+        `(from id, to id, delta)` rows, never decreasing a score below 0.
+        Rows for edges not in the store are ignored.
+        """
+        edges_from = self.edges_from
+        edge_score = self.edge_score
+        edge_score_out = self.edge_score_out
+        locks = self.locks
+        stripes = self.stripes
+
+        for from_id, to_id, delta in deltas:
+            key = (from_id, to_id)
+
+            with locks[from_id % stripes]:
+                if to_id not in edges_from.get(from_id, ()):
+                    continue
+
+                previous = edge_score.get(key, 0)
+                score = previous + delta
+
+                if score < 0:
+                    score = 0
+
+                edge_score[key] = score
+                edge_score_out[from_id] = (
+                    edge_score_out.get(from_id, 0) + score - previous
+                )
+
+    def get_edge_ttl(self, from_id, to_id, default=None):
+        """ Return explicitly set ttl for an edge or default. """
+        return self.edge_ttl.get((from_id, to_id), default)
+
+    def set_edge_ttl(self, from_id, to_id, ttl):
+        """ Explicitly set ttl for an edge. """
+        with self.lock(from_id):
+            self.edge_ttl[(from_id, to_id)] = ttl
@@ -1,6 +1,7 @@
 from ..cache import GraphCache
 from ..graph import Graph
 from ..highlevel import Path, Ensemble
+from ..store import GraphStore
 
 
 class GraphTestMixin(object):
@@ -9,7 +10,11 @@ class GraphTestMixin(object):
     def setUp(self):
         super(GraphTestMixin, self).setUp()
 
-        self.g = Graph(name='test_graph')
+        self.g = Graph(name='test_graph', store=self.create_store())
+
+    def create_store(self):
+        """ Return the store for `self.g`, override to test other stores. """
+        return GraphStore(name='test_graph')
 
 
 class CacheTestMixin(GraphTestMixin):
@@ -0,0 +1,207 @@
+import time
+import unittest
+
+from ..buffer import ScoreBuffer, _buffers
+from ..graph import Graph
+from ..sqlitestore import SQLiteGraphStore
+
+from .mixins import EdgeTestMixin
+
+
+class TestScoreBuffer(EdgeTestMixin, unittest.TestCase):
+    """ Tests for ScoreBuffer. """
+
+    def setUp(self):
+        super(TestScoreBuffer, self).setUp()
+
+        # Initialize mock time
+        self.time = 0
+
+        def mock_timer():
+            """ Mock timer, simply returns static value `self.time`. """
+
+            return self.time
+
+        self.b = ScoreBuffer(
+            self.g.store, flush_size=2, flush_interval=10, timer=mock_timer
+        )
+        self.g.score_buffer = self.b
+
+        self.e2 = self.g.edges.create(from_node=self.n, to_node=self.n3)
+        self.e3 = self.g.edges.create(from_node=self.n2, to_node=self.n3)
+
+    def tearDown(self):
+        self.b.close()
+
+        super(TestScoreBuffer, self).tearDown()
+
+    def stored(self, edge):
+        """ Return the score of edge in the store. """
+        return self.g.store.get_score(edge.from_node.id, edge.to_node.id)
+
+    def test_combine(self):
+        """ Test deltas are combined per Edge and readable right away. """
+
+        for i in xrange(10):
+            self.e.increase_score(1)
+        self.e.decrease_score(3)
+
+        self.assertEquals(self.e.score, 7)
+        self.assertEquals(self.stored(self.e), 0)
+        self.assertEquals(self.b.deltas, 11)
+
+        self.assertEquals(self.b.flush(), 1)
+        self.assertEquals(self.stored(self.e), 7)
+        self.assertEquals(self.e.score, 7)
+        self.assertEquals(self.b.writes, 1)
+
+        # Nothing left to write
+        self.assertEquals(self.b.flush(), 0)
+
+    def test_flush_size(self):
+        """ Test flushing once `flush_size` Edges have pending deltas. """
+
+        self.e.increase_score(1)
+        self.e.increase_score(1)
+        self.assertEquals(self.stored(self.e), 0)
+
+        self.e2.increase_score(1)
+        self.assertEquals(self.stored(self.e), 2)
+        self.assertEquals(self.stored(self.e2), 1)
+        self.assertEquals(self.b.pending, {})
+
+    def test_flush_interval(self):
+        """ Test flushing once `flush_interval` seconds have passed. """
+
+        self.e.increase_score(1)
+
+        self.time = 10
+        self.e.increase_score(1)
+
+        self.assertEquals(self.stored(self.e), 2)
+
+    def test_clamp(self):
+        """ Test scores never decrease below 0 at any step. """
+
+        self.e.score = 5
+        self.e2.score = 5
+
+        self.e.decrease_score(10)
+        self.e.increase_score(3)
+        self.e3.decrease_score(1)
+        self.e3.increase_score(2)
+
+        self.assertEquals(self.e.score, 3)
+        self.assertEquals(self.e3.score, 2)
+
+        self.b.flush()
+
+        self.assertEquals(self.stored(self.e), 3)
+        self.assertEquals(self.stored(self.e3), 2)
+        self.assertEquals(self.g.store.score_out(self.n.id), 8)
+
+    def test_weight(self):
+        """ Test weights and totals include buffered deltas. """
+        self.b.flush_size = 10
+
+        self.e.score = 100
+        self.e2.score = 100
+        self.assertAlmostEqual(self.e.get_weight(), 0.5)
+
+        self.e.increase_score(200)
+        self.e2.decrease_score(50)
+
+        self.assertEquals(self.e.score, 300)
+        self.assertEquals(self.n.get_score_out(), 350)
+        self.assertAlmostEqual(self.e.get_weight(), 300 / 350.0)
+        self.assertAlmostEqual(self.e2.get_weight(), 50 / 350.0)
+
+        # Stored values are unchanged until the flush
+        self.assertEquals(self.g.store.score_out(self.n.id), 200)
+
+        self.b.flush()
+
+        self.assertEquals(self.g.store.score_out(self.n.id), 350)
+        self.assertEquals(self.n.get_score_out(), 350)
+        self.assertAlmostEqual(self.e.get_weight(), 300 / 350.0)
+
+    def test_discard(self):
+        """ Test setting a score or removing an Edge drops pending deltas. """
+
+        self.e.increase_score(5)
+        self.e.score = 2
+        self.assertEquals(self.e.score, 2)
+
+        self.e3.increase_score(5)
+        self.g.edges.remove(self.e3)
+
+        self.assertEquals(self.b.pending, {})
+
+    def test_increase_score_many(self):
+        """ Test increase_score_many() adds to the buffer in order. """
+        self.b.flush_size = 10
+
+        self.e.score = 5
+        self.e.decrease_score(10)
+
+        self.g.edges.increase_score_many([(self.n, self.n2, 3)])
+
+        self.assertEquals(self.e.score, 3)
+        self.assertEquals(self.stored(self.e), 5)
+
+        self.b.flush()
+        self.assertEquals(self.stored(self.e), 3)
+
+
+class TestScoreBufferTimer(unittest.TestCase):
+    """ Tests for timed flushes of ScoreBuffer. """
+
+    def test_flush_timer(self):
+        """ Test pending deltas are written without further deltas. """
+        g = Graph(name='test_graph')
+        b = g.score_buffer = ScoreBuffer(g.store, flush_interval=0.01)
+
+        e = g.edges.create(g.nodes.create('a'), g.nodes.create('b'))
+        e.increase_score(5)
+
+        for i in xrange(200):
+            if not b.pending:
+                break
+
+            time.sleep(0.01)
+
+        self.assertEquals(g.store.get_score(e.from_node.id, e.to_node.id), 5)
+
+    def test_close(self):
+        """ Test pending deltas are written on close. """
+        g = Graph(name='test_graph')
+        b = g.score_buffer = ScoreBuffer(g.store, flush_interval=None)
+
+        e = g.edges.create(g.nodes.create('a'), g.nodes.create('b'))
+        e.increase_score(5)
+
+        self.assertEquals(b._flush_timer, None)
+        self.assertTrue(b in _buffers)
+
+        b.close()
+        self.assertEquals(g.store.get_score(e.from_node.id, e.to_node.id), 5)
+
+        # No longer closed at exit
+        self.assertFalse(b in _buffers)
+
+    def test_thread_unsafe(self):
+        """ Test stores which are not thread-safe are not flushed by timer. """
+        g = Graph(name='test_graph', store=SQLiteGraphStore('test_graph'))
+        b = g.score_buffer = ScoreBuffer(g.store, flush_interval=0.01)
+
+        e = g.edges.create(g.nodes.create('a'), g.nodes.create('b'))
+        e.increase_score(5)
+
+        self.assertEquals(b._flush_timer, None)
+
+        time.sleep(0.02)
+        self.assertEquals(g.store.get_score(e.from_node.id, e.to_node.id), 0)
+
+        # Checked on the calling thread when deltas are added
+        e.increase_score(5)
+        self.assertEquals(g.store.get_score(e.from_node.id, e.to_node.id), 10)
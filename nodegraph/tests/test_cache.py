@@ -1,5 +1,7 @@
 import unittest
 
+from ..cache import GraphCache
+from ..highlevel import Path
 from .mixins import CacheTestMixin
 
 
@@ -28,6 +30,18 @@ class TestGraphCache(CacheTestMixin, unittest.TestCase):
         self.assertEquals(self.c.get('test-key-1'), 'test-value-1')
         self.assertEquals(self.c.get('test-key-2'), 'test-value-2')
 
+    def test_delete(self):
+        """ Test deleting a key from the cache. """
+
+        self.c.set('test-key', 'test-value', 1)
+        self.c.delete('test-key')
+
+        self.assertEquals(self.c.get('test-key'), None)
+        self.assertEquals(self.c.get_expires('test-key'), None)
+
+        # Deleting a missing key is a no-op
+        self.c.delete('test-key')
+
     def test_generate_expires(self):
         """ Test making an expiration time. """
         self.time = 1
@@ -45,6 +59,317 @@ class TestGraphCache(CacheTestMixin, unittest.TestCase):
         # After 2 seconds, it should be gone
         self.time = 2
         self.assertEquals(self.c.get('test-key'), None)
+        self.assertEquals(self.c.expirations, 1)
+
+    def test_sweep_on_set(self):
+        """ Test reclaiming expired entries which are never read again. """
+
+        for i in xrange(10):
+            self.c.set(i, i, 1)
+
+        # Every write reclaims up to two expired entries
+        self.time = 2
+        for i in xrange(10, 15):
+            self.c.set(i, i, 10)
+
+        self.assertEquals(len(self.c), 5)
+        self.assertEquals(self.c.expirations, 10)
+        self.assertEquals(sorted(self.c.keys()), range(10, 15))
+
+    def test_sweep(self):
+        """ Test sweeping expired entries in order of expiry. """
+
+        for i in xrange(10):
+            self.c.set(i, i, i)
+
+        self.time = 5
+        self.assertEquals(self.c.sweep(limit=2), 2)
+        self.assertEquals(sorted(self.c.keys()), range(2, 10))
+
+        self.assertEquals(self.c.sweep(), 3)
+        self.assertEquals(sorted(self.c.keys()), range(5, 10))
+        self.assertEquals(self.c.expirations, 5)
+
+        # Nothing left to sweep
+        self.assertEquals(self.c.sweep(), 0)
+
+    def test_sweep_outdated(self):
+        """ Test sweeping keys which were set again or deleted. """
+
+        self.c.set('test-key', 'test-value', 1)
+        self.c.set('test-key', 'test-value', 10)
+        self.c.set('test-deleted', 'test-value', 1)
+        self.c.delete('test-deleted')
+
+        self.time = 5
+        self.assertEquals(self.c.sweep(), 0)
+        self.assertEquals(self.c.get('test-key'), 'test-value')
+
+    def test_sweep_heap_size(self):
+        """ Test that setting the same keys does not grow the heap. """
+
+        for i in xrange(1000):
+            self.c.set(i % 10, i, 100)
+
+        self.assertEquals(len(self.c), 10)
+        self.assertTrue(len(self.c._heap) <= 2 * 10 + 64)
+
+        # The rebuilt heap still expires the current values
+        self.time = 101
+        self.assertEquals(self.c.sweep(), 10)
+        self.assertEquals(len(self.c._heap), 0)
+
+    def test_invalidate(self):
+        """ Test removing entries depending on a source. """
+
+        self.c.set('test-key-1', 'test-value', 1, sources=(1, ))
+        self.c.set('test-key-2', 'test-value', 1, sources=(1, 2))
+        self.c.set('test-key-3', 'test-value', 1, sources=(2, ))
+        self.c.set('test-key-4', 'test-value', 1)
+
+        self.assertEquals(self.c.invalidate(1), 2)
+        self.assertEquals(sorted(self.c.keys()), ['test-key-3', 'test-key-4'])
+
+        # Unknown sources are a no-op
+        self.assertEquals(self.c.invalidate(1), 0)
+        self.assertEquals(self.c.invalidate(3), 0)
+
+        self.assertEquals(self.c.invalidate_many([2, 3]), 1)
+        self.assertEquals(self.c.keys(), ['test-key-4'])
+        self.assertEquals(self.c.invalidations, 3)
+
+        # No dependencies are left behind
+        self.assertEquals(self.c._dependents, {})
+        self.assertEquals(self.c._sources, {})
+
+    def test_invalidate_set_again(self):
+        """ Test replacing the sources of a key by setting it again. """
+
+        self.c.set('test-key', 'test-value', 1, sources=(1, ))
+        self.c.set('test-key', 'test-value', 1, sources=(2, ))
+
+        self.assertEquals(self.c.invalidate(1), 0)
+        self.assertEquals(self.c.invalidate(2), 1)
+
+    def test_invalidate_removed(self):
+        """ Test that deleted and expired entries drop their sources. """
+
+        self.c.set('test-key-1', 'test-value', 1, sources=(1, ))
+        self.c.set('test-key-2', 'test-value', 1, sources=(1, 2))
+        self.c.delete('test-key-1')
+
+        self.time = 2
+        self.assertEquals(self.c.get('test-key-2'), None)
+
+        self.assertEquals(self.c._dependents, {})
+        self.assertEquals(self.c._sources, {})
+
+    def test_invalidate_version(self):
+        """ Test that values computed before an invalidation are rejected. """
+
+        version = self.c.version
+        self.c.invalidate(1)
+
+        self.assertFalse(
+            self.c.set('test-key', 'stale', 1, sources=(1, ), version=version)
+        )
+        self.assertEquals(self.c.get('test-key'), None)
+
+        self.assertTrue(
+            self.c.set('test-key', 'fresh', 1, version=self.c.version)
+        )
+        self.assertEquals(self.c.get('test-key'), 'fresh')
+
+    def test_invalidate_version_sources(self):
+        """ Test that invalidating other sources does not reject values. """
+
+        version = self.c.version
+        self.c.invalidate(2)
+
+        self.assertTrue(
+            self.c.set('test-key', 'value', 1, sources=(1, ), version=version)
+        )
+        self.assertEquals(self.c.get('test-key'), 'value')
+
+        # Flushing rejects any value computed before
+        version = self.c.version
+        self.c.flush()
+
+        self.assertFalse(
+            self.c.set('test-key', 'stale', 1, sources=(1, ), version=version)
+        )
+
+    def test_key_kind(self):
+        """ Test kinds of keys used for statistics. """
+        n = self.g.nodes.create(name='node_1')
+        n2 = self.g.nodes.create(name='node_2')
+        e = self.g.edges.create(n, n2)
+
+        self.assertEquals(self.c.key_kind((n, 'score_out')), 'score_out')
+        self.assertEquals(self.c.key_kind((e, 'weight')), 'edge_weight')
+        self.assertEquals(self.c.key_kind('test-key'), 'other')
+
+    def test_stats(self):
+        """ Test statistics per kind of key. """
+        self.c.set('test-key-1', 'test-value', 1, sources=(1, ))
+        self.c.set('test-key-2', 'test-value', 1)
+        self.c.set('test-key-3', 'test-value', 5)
+        self.c.invalidate(1)
+
+        self.time = 2
+        self.c.get('test-key-2')
+
+        self.c.count('hits', 'other', 3)
+
+        stats = self.c.stats()
+        self.assertEquals(stats.keys(), ['other'])
+        self.assertEquals(stats['other'], {
+            'hits': 3, 'misses': 0, 'miss_seconds': 0, 'expirations': 1,
+            'evictions': 0, 'invalidations': 1, 'size': 1
+        })
+
+        # Statistics are kept when flushing
+        self.c.flush()
+        self.assertEquals(self.c.stats()['other']['size'], 0)
+        self.assertEquals(self.c.stats()['other']['hits'], 3)
+
+        self.c.reset_stats()
+        self.assertEquals(self.c.stats(), {})
+
+    def test_graph_stats(self):
+        """ Test hits and misses of cached Graph values. """
+        n = self.g.nodes.create(name='node_1')
+        n2 = self.g.nodes.create(name='node_2')
+        e = self.g.edges.create(n, n2)
+        e.increase_score()
+
+        p = Path(edges=[e])
+        p.get_weight()
+        p.get_weight()
+        n.get_min_ttl_out()
+        n.get_min_ttl_out()
+
+        stats = self.g.cache_stats()
+        self.assertEquals(sorted(stats), ['min_ttl_out', 'path_weight'])
+
+        self.assertEquals(stats['path_weight']['hits'], 1)
+        self.assertEquals(stats['path_weight']['misses'], 1)
+        self.assertEquals(stats['path_weight']['size'], 1)
+        self.assertTrue(stats['path_weight']['miss_seconds'] >= 0)
+
+        self.assertEquals(stats['min_ttl_out']['hits'], 1)
+        self.assertEquals(stats['min_ttl_out']['misses'], 1)
+
+        # Changing the score invalidates both
+        e.increase_score()
+
+        stats = self.g.cache_stats()
+        for kind in stats:
+            self.assertEquals(stats[kind]['invalidations'], 1)
+            self.assertEquals(stats[kind]['size'], 0)
+
+    def bounded(self, **kwargs):
+        """ Return a bounded GraphCache using the mock timer. """
+        return GraphCache(timer=self.c.timer, **kwargs)
+
+    def test_unbounded(self):
+        """ Test that an unbounded cache never evicts. """
+
+        for i in xrange(100):
+            self.c.set(i, i, 1)
+
+        self.assertEquals(len(self.c), 100)
+        self.assertEquals(self.c.evictions, 0)
+
+    def test_max_entries_lru(self):
+        """ Test evicting least recently used entries. """
+        c = self.bounded(max_entries=10, evict_fraction=0.2)
+
+        for i in xrange(10):
+            c.set(i, i, 1)
+
+        # Use the first entries again
+        for i in xrange(5):
+            c.get(i)
+
+        self.assertEquals(c.evictions, 0)
+
+        # Exceeding the limit evicts down to 8 entries
+        c.set(10, 10, 1)
+
+        self.assertEquals(len(c), 8)
+        self.assertEquals(c.evictions, 3)
+        self.assertEquals(sorted(c.keys()), [0, 1, 2, 3, 4, 8, 9, 10])
+
+        # Evicted keys are gone
+        self.assertEquals(c.get(5), None)
+        self.assertEquals(c.get_expires(5), None)
+
+    def test_max_entries_lfu(self):
+        """ Test evicting least frequently used entries. """
+        c = self.bounded(max_entries=4, policy='lfu', evict_fraction=0.25)
+
+        for i in xrange(4):
+            c.set(i, i, 1)
+
+        # Use all but the second entry, the first one twice
+        for i in (0, 0, 2, 3):
+            c.get(i)
+
+        c.set(4, 4, 1)
+
+        self.assertEquals(c.evictions, 2)
+        self.assertEquals(sorted(c.keys()), [0, 2, 3])
+
+    def test_max_bytes(self):
+        """ Test evicting entries exceeding a byte budget. """
+        c = self.bounded(max_bytes=2000)
+
+        size = c.entry_size(0, 0)
+        for i in xrange(100):
+            c.set(i, i, 1)
+
+            self.assertTrue(c.bytes <= 2000)
+            self.assertEquals(c.bytes, len(c) * size)
+
+        self.assertEquals(c.evictions, 100 - len(c))
+
+        # Overwriting a key does not count twice
+        before = c.bytes
+        c.set(99, 99, 1)
+        self.assertEquals(c.bytes, before)
+
+        # Deleting keys frees their size
+        for key in c.keys():
+            c.delete(key)
+
+        self.assertEquals(c.bytes, 0)
+
+    def test_evict_expired_first(self):
+        """ Test removing expired entries before evicting used ones. """
+        c = self.bounded(max_entries=4)
+
+        c.set('short-1', 1, 1)
+        c.set('short-2', 2, 1)
+        c.set('long-1', 3, 10)
+        c.set('long-2', 4, 10)
+
+        self.time = 5
+        c.set('long-3', 5, 10)
+
+        self.assertEquals(c.expirations, 2)
+        self.assertEquals(c.evictions, 0)
+        self.assertEquals(sorted(c.keys()), ['long-1', 'long-2', 'long-3'])
+
+    def test_flush_bounded(self):
+        """ Test that flushing resets the tracked sizes. """
+        c = self.bounded(max_entries=10, max_bytes=10000)
+
+        c.set('test-key', 'test-value', 1)
+        c.flush()
+
+        self.assertEquals(len(c), 0)
+        self.assertEquals(c.bytes, 0)
 
 if __name__ == '__main__':
     unittest.main()
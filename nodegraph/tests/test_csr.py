@@ -0,0 +1,243 @@
+import unittest
+import tempfile
+
+from ..csr import CSRGraphStore, numpy
+from ..graph import Graph
+
+from . import (
+    test_lowlevel, test_highlevel, test_edgelist, test_weights, test_buffer
+)
+
+
+class CSRTestMixin(object):
+    """ Mixin running Graph tests on a CSRGraphStore with a delta buffer. """
+
+    def create_store(self):
+        return CSRGraphStore(name='test_graph')
+
+
+class MergedCSRTestMixin(object):
+    """ Mixin running Graph tests on a CSRGraphStore merging every change. """
+
+    def create_store(self):
+        return CSRGraphStore(name='test_graph', delta_limit=0, delta_ratio=0)
+
+
+skip = unittest.skipIf(numpy is None, 'NumPy is not installed.')
+
+
+@skip
+class TestCSRNode(CSRTestMixin, test_lowlevel.TestNode):
+    pass
+
+
+@skip
+class TestMergedCSRNode(MergedCSRTestMixin, test_lowlevel.TestNode):
+    pass
+
+
+@skip
+class TestCSRNodeManager(CSRTestMixin, test_lowlevel.TestNodeManager):
+    pass
+
+
+@skip
+class TestMergedCSRNodeManager(
+    MergedCSRTestMixin, test_lowlevel.TestNodeManager
+):
+    pass
+
+
+@skip
+class TestCSRNodeNeighbors(CSRTestMixin, test_lowlevel.TestNodeNeighbors):
+    pass
+
+
+@skip
+class TestMergedCSRNodeNeighbors(
+    MergedCSRTestMixin, test_lowlevel.TestNodeNeighbors
+):
+    pass
+
+
+@skip
+class TestCSREdge(CSRTestMixin, test_lowlevel.TestEdge):
+    pass
+
+
+@skip
+class TestMergedCSREdge(MergedCSRTestMixin, test_lowlevel.TestEdge):
+    pass
+
+
+@skip
+class TestCSREdgeManager(CSRTestMixin, test_lowlevel.TestEdgeManager):
+    pass
+
+
+@skip
+class TestMergedCSREdgeManager(
+    MergedCSRTestMixin, test_lowlevel.TestEdgeManager
+):
+    pass
+
+
+@skip
+class TestCSRComplexPath(CSRTestMixin, test_highlevel.TestComplexPath):
+    pass
+
+
+@skip
+class TestMergedCSRComplexPath(
+    MergedCSRTestMixin, test_highlevel.TestComplexPath
+):
+    pass
+
+
+@skip
+class TestCSREnsembleManager(CSRTestMixin, test_highlevel.TestEnsembleManager):
+    pass
+
+
+@skip
+class TestMergedCSREnsembleManager(
+    MergedCSRTestMixin, test_highlevel.TestEnsembleManager
+):
+    pass
+
+
+@skip
+class TestCSREdgeList(CSRTestMixin, test_edgelist.TestEdgeList):
+    pass
+
+
+@skip
+class TestMergedCSREdgeList(MergedCSRTestMixin, test_edgelist.TestEdgeList):
+    pass
+
+
+@skip
+class TestCSRWeights(CSRTestMixin, test_weights.TestWeights):
+    pass
+
+
+@skip
+class TestMergedCSRWeights(MergedCSRTestMixin, test_weights.TestWeights):
+    pass
+
+
+@skip
+class TestCSRScoreBuffer(CSRTestMixin, test_buffer.TestScoreBuffer):
+    pass
+
+
+@skip
+class TestMergedCSRScoreBuffer(
+    MergedCSRTestMixin, test_buffer.TestScoreBuffer
+):
+    pass
+
+
+@skip
+class TestCSRGraphStore(unittest.TestCase):
+    """ Tests for CSRGraphStore specifics. """
+
+    def setUp(self):
+        self.s = CSRGraphStore(name='test')
+
+        for name in ('a', 'b', 'c', 'd'):
+            self.s.add_node(self.s.intern(name))
+
+        self.s.add_edge(0, 1)
+        self.s.add_edge(0, 2)
+        self.s.add_edge(3, 0)
+        self.s.set_score(0, 1, 5)
+        self.s.set_edge_ttl(0, 2, 7)
+
+    def test_merge(self):
+        """ Merging keeps edges, scores and ttl's. """
+        self.s.merge()
+
+        self.assertEquals(self.s.edges_from, {})
+        self.assertEquals(self.s.offsets.tolist(), [0, 2, 2, 2, 3])
+        self.assertEquals(self.s.targets.tolist(), [1, 2, 0])
+
+        self.assertEquals(self.s.edge_count, 3)
+        self.assertEquals(
+            sorted(self.s.iter_edges()), [(0, 1), (0, 2), (3, 0)]
+        )
+        self.assertEquals(sorted(self.s.edges_in(0)), [3])
+        self.assertEquals(self.s.get_score(0, 1), 5)
+        self.assertEquals(self.s.get_edge_ttl(0, 2), 7)
+        self.assertEquals(self.s.get_edge_ttl(0, 1), None)
+
+    def test_overlay(self):
+        """ Writes to merged edges are visible before the next merge. """
+        self.s.merge()
+
+        self.s.set_score(0, 2, 3)
+        self.s.remove_edge(3, 0)
+        self.s.add_edge(1, 3)
+
+        self.assertEquals(sorted(self.s.scores_out(0)), [(1, 5), (2, 3)])
+        self.assertFalse(self.s.has_edge(3, 0))
+        self.assertEquals(self.s.edges_in(0), [])
+        self.assertEquals(self.s.edge_count, 3)
+
+        self.s.merge()
+
+        self.assertEquals(
+            sorted(self.s.iter_edges()), [(0, 1), (0, 2), (1, 3)]
+        )
+        self.assertEquals(self.s.get_score(0, 2), 3)
+
+    def test_recreate(self):
+        """ A removed and recreated merged edge starts without a score. """
+        self.s.merge()
+
+        self.s.remove_edge(0, 1)
+        self.assertTrue(self.s.add_edge(0, 1))
+        self.assertFalse(self.s.add_edge(0, 1))
+
+        self.assertEquals(self.s.get_score(0, 1), 0)
+        self.assertEquals(sorted(self.s.edges_out(0)), [1, 2])
+
+        self.s.merge()
+
+        self.assertEquals(self.s.get_score(0, 1), 0)
+        self.assertEquals(self.s.edge_count, 3)
+
+    def test_auto_merge(self):
+        """ The delta buffer is merged once it exceeds delta_limit. """
+        self.s.delta_limit = 5
+        self.assertEquals(self.s.pending, 5)
+        self.assertEquals(len(self.s.targets), 0)
+
+        self.s.set_score(0, 2, 1)
+
+        self.assertEquals(self.s.pending, 0)
+        self.assertEquals(len(self.s.targets), 3)
+
+    def test_pickle(self):
+        """ Pickle a merged store. """
+        self.s.merge()
+
+        with tempfile.TemporaryFile() as f:
+            self.s.save(f)
+
+            # Rewind file pointer
+            f.seek(0)
+
+            s = CSRGraphStore.load(f)
+            self.assertEquals(s.get_score(0, 1), 5)
+
+    def test_graph(self):
+        """ Graph uses the store it is given. """
+        g = Graph(name='test', store=self.s)
+
+        self.assertIs(g.store, self.s)
+        self.assertEquals(g.nodes.get('a').get_score_out(), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from StringIO import StringIO
+
+from ..graph import Graph
+from ..edgelist import (
+    read_edges, write_edges, iter_edges, import_edges, export_edges,
+    get_delimiter
+)
+
+from .mixins import GraphTestMixin
+
+
+class TestEdgeList(GraphTestMixin, unittest.TestCase):
+    """ Tests for edge list import and export. """
+
+    def setUp(self):
+        super(TestEdgeList, self).setUp()
+
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+        super(TestEdgeList, self).tearDown()
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def write(self, filename, content):
+        """ Write content to a file in the test directory. """
+        with open(self.path(filename), 'wb') as f:
+            f.write(content)
+
+    def test_delimiter(self):
+        """ Delimiters follow the file extension. """
+        self.assertEquals(get_delimiter('edges.csv'), ',')
+        self.assertEquals(get_delimiter('edges.tsv'), '\t')
+        self.assertEquals(get_delimiter('edges.tsv.gz'), '\t')
+
+    def test_read(self):
+        """ Rows are parsed into names, scores and ttl's. """
+        f = StringIO(
+            'from_node,to_node,score,ttl\n'
+            'a,b,100,\n'
+            '\xc3\xa9,a,5,60\n'
+        )
+
+        self.assertEquals(list(read_edges(f)), [
+            (u'a', u'b', 100, None),
+            (u'\xe9', u'a', 5, 60),
+        ])
+
+    def test_write(self):
+        """ Rows are written with a header and empty ttl's. """
+        f = StringIO()
+
+        count = write_edges(f, [
+            (u'a', u'b', 100, None),
+            (u'\xe9', 'a', 5, 60),
+        ], delimiter='\t')
+
+        self.assertEquals(count, 2)
+        self.assertEquals(
+            f.getvalue(),
+            'from_node\tto_node\tscore\tttl\n'
+            'a\tb\t100\t\n'
+            '\xc3\xa9\ta\t5\t60\n'
+        )
+
+    def test_import(self):
+        """ Nodes and Edges are created in batches. """
+        self.write('edges.csv',
+            'from_node,to_node,score,ttl\n'
+            'a,b,100,\n'
+            'b,c,50,7\n'
+            'a,c,0,\n'
+            'c,c,10,\n'
+        )
+
+        # Self-links are skipped
+        count = import_edges(self.g, self.path('edges.csv'), batch_size=2)
+        self.assertEquals(count, 3)
+
+        a, b, c = self.g.nodes.get_many(['a', 'b', 'c'])
+
+        self.assertEquals(self.g.edges.get(a, b).score, 100)
+        self.assertEquals(self.g.edges.get(b, c).ttl, 7)
+        self.assertEquals(self.g.edges.get(a, c).score, 0)
+        self.assertEquals(self.g.nodes.linked_from(a), set([b, c]))
+        self.assertEquals(self.g.nodes.linked_to(c), set([a, b]))
+
+        self.assertEquals(len(self.g.edges.all()), 3)
+
+    def test_import_existing(self):
+        """ Existing Edges take the score and ttl of imported rows. """
+        a = self.g.nodes.create('a')
+        b = self.g.nodes.create('b')
+        e = self.g.edges.create(a, b)
+        e.ttl = 5
+
+        self.write('edges.csv', 'a,b,300,\n')
+
+        import_edges(self.g, self.path('edges.csv'), header=False)
+
+        self.assertEquals(e.score, 300)
+        self.assertEquals(e.ttl, 5)
+        self.assertEquals(len(self.g.edges.all()), 1)
+
+    def test_roundtrip(self):
+        """ Exported gzipped TSV files import into an equal Graph. """
+        a = self.g.nodes.create('a')
+        b = self.g.nodes.create(u'\xe9')
+        c = self.g.nodes.create('c')
+
+        e = self.g.edges.create(a, b)
+        e.increase_score()
+        e.ttl = 10
+
+        self.g.edges.create(b, c).increase_score(50)
+        self.g.edges.create(c, a)
+
+        path = self.path('edges.tsv.gz')
+
+        self.assertEquals(export_edges(self.g, path), 3)
+
+        # Import in a Graph with a fresh store
+        self.g = Graph(name='test_graph', store=self.create_store())
+
+        self.assertEquals(import_edges(self.g, path), 3)
+
+        a, b, c = self.g.nodes.get_many(['a', u'\xe9', 'c'])
+
+        e = self.g.edges.get(a, b)
+        self.assertEquals(e.score, 100)
+        self.assertEquals(e.ttl, 10)
+        self.assertEquals(self.g.edges.get(b, c).score, 50)
+        self.assertEquals(self.g.edges.get(c, a).score, 0)
+
+    def test_iter_edges_concurrent(self):
+        """ Edges added while exporting do not interrupt iter_edges(). """
+        a, b, c = self.g.nodes.create_many(['a', 'b', 'c'])
+        self.g.edges.create(a, b).increase_score()
+
+        store = self.g.store
+        ttls_out = store.ttls_out
+
+        def adding(from_id):
+            """ Add an Edge from `a` right after reading its ttls. """
+            ttls = ttls_out(from_id)
+
+            if from_id == a.id and not store.has_edge(a.id, c.id):
+                store.add_edge(a.id, c.id)
+
+            return ttls
+
+        store.ttls_out = adding
+
+        self.assertEquals(list(iter_edges(self.g)), [('a', 'b', 100, None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from ..generators import rank_weights, powerlaw_edges, generate_graph
+
+from .mixins import GraphTestMixin
+
+
+class TestGenerators(GraphTestMixin, unittest.TestCase):
+    """ Tests for synthetic Graph generators. """
+
+    def counts(self, rows, column):
+        """ Return a dictionary (name -> degree) for a column of rows. """
+        counts = {}
+        for row in rows:
+            counts[row[column]] = counts.get(row[column], 0) + 1
+
+        return counts
+
+    def degrees(self, rows, column):
+        """ Return sorted degrees for Node names in a column of rows. """
+        return sorted(self.counts(rows, column).values(), reverse=True)
+
+    def hub(self, rows, column):
+        """ Return the name with the highest degree in a column of rows. """
+        counts = self.counts(rows, column)
+
+        return max(counts, key=counts.get)
+
+    def test_rank_weights(self):
+        """ Weights are cumulative and decreasing with rank. """
+        cumulative = rank_weights(3, exponent=2.0)
+
+        self.assertEquals(cumulative, [1.0, 1.5, 1.5 + 1.0 / 3])
+
+    def test_seeded(self):
+        """ The same seed generates the same rows. """
+        rows = list(powerlaw_edges(1000, seed=1))
+
+        self.assertEquals(len(rows), 1000)
+        self.assertEquals(rows, list(powerlaw_edges(1000, seed=1)))
+        self.assertNotEquals(rows, list(powerlaw_edges(1000, seed=2)))
+
+    def test_powerlaw(self):
+        """ Degrees are skewed towards hubs on both ends. """
+        rows = list(powerlaw_edges(10000, seed=1))
+
+        for column in (0, 1):
+            degrees = self.degrees(rows, column)
+
+            self.assertTrue(degrees[0] > 20 * degrees[len(degrees) // 2])
+
+        # Out and in hubs differ
+        self.assertNotEquals(self.hub(rows, 0), self.hub(rows, 1))
+
+    def test_hub_offset(self):
+        """ Increasing hub_offset makes hubs smaller. """
+        hubs = self.degrees(powerlaw_edges(10000, seed=1), 0)[0]
+        smaller = self.degrees(
+            powerlaw_edges(10000, hub_offset=100, seed=1), 0
+        )[0]
+
+        self.assertTrue(smaller < hubs / 2)
+
+    def test_scores(self):
+        """ Scores are positive with the given median. """
+        scores = sorted(
+            row[2] for row in powerlaw_edges(10000, score_median=50, seed=1)
+        )
+
+        self.assertTrue(scores[0] >= 1)
+        self.assertTrue(45 <= scores[len(scores) // 2] <= 55)
+
+    def test_generate_graph(self):
+        """ Generated rows are inserted into the Graph. """
+        count = generate_graph(self.g, 1000, node_count=50, seed=1)
+
+        self.assertTrue(count <= 1000)
+        self.assertTrue(0 < self.g.store.edge_count <= count)
+        self.assertTrue(len(self.g.nodes.all()) <= 50)
+
+        edge = iter(self.g.edges.all()).next()
+        self.assertTrue(edge.score >= 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -44,17 +44,11 @@ class TestTrivialPath(TrivialPathTestMixin, unittest.TestCase):
         self.assertEquals(self.g.store.cache.get((self.p, 'weight')), 0.0)
         self.assertTrue(self.g.store.cache.get_expires((self.p, 'weight')))
 
-        # With score increased, weight should be 1.0 - but 0.0 still in cache
+        # With score increased, weight should be 1.0
         self.e.increase_score()
 
-        # Cache should not have changed
-        self.assertEquals(self.g.store.cache.get((self.p, 'weight')), 0.0)
-        self.assertTrue(self.g.store.cache.get_expires((self.p, 'weight')))
-
-        self.assertAlmostEqual(self.p.get_weight(), 0.0)
-
-        # Flush cache
-        self.g.store.cache.flush()
+        # Cached weight including the Edge is invalidated
+        self.assertEquals(self.g.store.cache.get((self.p, 'weight')), None)
 
         # New value propagated!
         self.assertAlmostEqual(self.p.get_weight(), 1.0)
@@ -87,6 +81,25 @@ class TestDualPath(DualPathTestMixin, unittest.TestCase):
         # Path weight should still be equal to 1.0*1.0*dampening
         self.assertEqual(self.p2.get_weight(), self.g.path_dampening)
 
+    def test_weight_invalidation(self):
+        """ Test invalidating cached weights of Paths including an Edge. """
+
+        self.e.increase_score()
+        self.e2.increase_score()
+
+        # Populate the cache
+        self.assertAlmostEqual(self.p.get_weight(), 1.0)
+        self.assertEqual(self.p2.get_weight(), self.g.path_dampening)
+
+        # Changing the second Edge only affects the Path including it
+        self.e2.decrease_score()
+
+        cache = self.g.store.cache
+        self.assertEquals(cache.get((self.p, 'weight')), 1.0)
+        self.assertEquals(cache.get((self.p2, 'weight')), None)
+
+        self.assertEqual(self.p2.get_weight(), 0.0)
+
 
 class TestComplexPath(ComplexPathTestMixin, unittest.TestCase):
     """ Test behaviour of complex paths (with more than two Edges). """
@@ -202,17 +215,11 @@ class TestEnsemble(EnsembleTestMixin, unittest.TestCase):
         self.assertEquals(self.g.store.cache.get((self.es, 'weight')), 0.0)
         self.assertTrue(self.g.store.cache.get_expires((self.es, 'weight')))
 
-        # With score increased, weight should be 1.0 - but 0.0 still in cache
+        # With score increased, weight should be 1.0
         self.e.increase_score()
 
-        # Cache should not have changed
-        self.assertEquals(self.g.store.cache.get((self.es, 'weight')), 0.0)
-        self.assertTrue(self.g.store.cache.get_expires((self.es, 'weight')))
-
-        self.assertAlmostEqual(self.es.get_weight(), 0.0)
-
-        # Flush cache
-        self.g.store.cache.flush()
+        # Cached weight including the Edge is invalidated
+        self.assertEquals(self.g.store.cache.get((self.es, 'weight')), None)
 
         # New value propagated!
         self.assertAlmostEqual(self.es.get_weight(), 1.0)
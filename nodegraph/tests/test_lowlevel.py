@@ -1,6 +1,8 @@
 import unittest
 
 from ..graph import Graph
+from ..exceptions import NodeNotFound, EdgeNotFound
+from ..lowlevel import Edge
 
 from .mixins import (
     GraphTestMixin, NodeTestMixin, EdgeTestMixin, DualPathTestMixin
@@ -53,22 +55,73 @@ class TestNode(NodeTestMixin, unittest.TestCase):
         self.assertEquals(self.n.get_score_out(), 0)
 
     def test_get_score_out_cache(self):
-        """ Basic test for cache on get_score_out(). """
+        """
+        Basic test for cache on get_score_out(), bypassed for stores
+        maintaining score totals.
+        """
+        cache = self.g.store.cache
+
         # Test caching with ttl of 5
         self.g.ttl = 5
 
         # Populate cache
         self.n.get_score_out()
 
-        # Test cache
-        self.assertEquals(self.g.store.cache.get((self.n, 'score_out')), 0)
-        self.assertTrue(self.g.store.cache.get_expires((self.n, 'score_out')))
+        if self.g.store.aggregates:
+            # Totals are neither written to nor read from the cache
+            self.assertEquals(cache.get((self.n, 'score_out')), None)
+
+            cache.set((self.n, 'score_out'), 5, 5)
+            self.assertEquals(self.n.get_score_out(), 0)
 
-        # Test overriding the cache
-        self.g.store.cache.set((self.n, 'score_out'), 5, 5)
+        else:
+            # Test cache
+            self.assertEquals(cache.get((self.n, 'score_out')), 0)
+            self.assertTrue(cache.get_expires((self.n, 'score_out')))
 
-        # Now cached value should be returned
-        self.assertEquals(self.n.get_score_out(), 5)
+            # Test overriding the cache
+            cache.set((self.n, 'score_out'), 5, 5)
+
+            # Now cached value should be returned
+            self.assertEquals(self.n.get_score_out(), 5)
+
+        # Unless the cache is bypassed
+        self.assertEquals(self.n.get_score_out(use_cache=False), 0)
+        self.assertEquals(cache.get((self.n, 'score_out')), 5)
+
+    def test_get_score_out_cache_zero(self):
+        """
+        A total score of 0 is served from the cache, or read from the store
+        for stores maintaining score totals.
+        """
+        self.n.get_score_out()
+
+        # Hits do not compute the value, maintained totals are always read
+        score_out = self.g.store.score_out
+        self.g.store.score_out = lambda from_id: 7
+        try:
+            self.assertEquals(
+                self.n.get_score_out(), 7 if self.g.store.aggregates else 0
+            )
+        finally:
+            self.g.store.score_out = score_out
+
+    def test_get_score_out_change(self):
+        """ Totals are correct right after every change. """
+        e = self.g.edges.create(self.n, self.n2)
+        e2 = self.g.edges.create(self.n, self.n3)
+
+        e.increase_score(100)
+        self.assertEquals(self.n.get_score_out(), 100)
+
+        e2.increase_score(300)
+        self.assertEquals(self.n.get_score_out(), 400)
+
+        e.score = 50
+        self.assertEquals(self.n.get_score_out(), 350)
+
+        self.g.edges.remove(e2)
+        self.assertEquals(self.n.get_score_out(), 50)
 
     def test_get_min_ttl_out(self):
         """ Test minimal ttl for outgoing Edges, should return Node ttl. """
@@ -105,6 +158,13 @@ class TestNode(NodeTestMixin, unittest.TestCase):
         # Old graph has not changed
         self.test_init()
 
+    def test_immutable(self):
+        """ Node attributes cannot be changed. """
+        self.assertRaises(AttributeError, setattr, self.n, 'name', 'other')
+        self.assertRaises(AttributeError, setattr, self.n, 'foo', 'bar')
+
+        self.assertEquals(self.n.name, 'test_node')
+
     def test_ttl(self):
         """
         Assert that the ttl property functions as expected.
@@ -119,6 +179,152 @@ class TestNode(NodeTestMixin, unittest.TestCase):
         self.assertEquals(self.n.ttl, 10)
 
 
+class TestNodeManager(NodeTestMixin, unittest.TestCase):
+    """ Test methods for NodeManager. """
+
+    def test_get(self):
+        """ Test get() """
+        self.assertEquals(self.g.nodes.get('test_node'), self.n)
+
+        self.assertRaises(NodeNotFound, self.g.nodes.get, 'missing_node')
+
+    def test_get_many(self):
+        """ Test get_many() """
+        self.assertEquals(
+            self.g.nodes.get_many(['test_node_3', 'test_node']),
+            [self.n3, self.n]
+        )
+
+        self.assertRaises(
+            NodeNotFound, self.g.nodes.get_many, ['test_node', 'missing_node']
+        )
+
+    def test_create_duplicate(self):
+        """ Creating a Node with an existing name returns an equal Node. """
+        self.assertEquals(self.g.nodes.create('test_node'), self.n)
+        self.assertEquals(len(self.g.nodes.all()), 4)
+
+    def test_create_many(self):
+        """ Test create_many() """
+        nodes = self.g.nodes.create_many(['test_node_5', 'test_node'])
+
+        self.assertEquals(nodes[1], self.n)
+        self.assertEquals(nodes[0].name, 'test_node_5')
+        self.assertEquals(self.g.nodes.get('test_node_5'), nodes[0])
+        self.assertEquals(len(self.g.nodes.all()), 5)
+
+    def test_ids(self):
+        """ Node ids are dense and retained when a Node is recreated. """
+        self.assertEquals(
+            [self.n.id, self.n2.id, self.n3.id, self.n4.id], [0, 1, 2, 3]
+        )
+
+        self.g.nodes.remove(self.n2)
+        n2 = self.g.nodes.create('test_node_2')
+
+        self.assertEquals(n2.id, 1)
+        self.assertEquals(self.g.nodes.get_by_id(1).name, 'test_node_2')
+
+    def test_remove(self):
+        """ Test remove() updates the name index. """
+        self.g.nodes.remove(self.n)
+
+        self.assertRaises(NodeNotFound, self.g.nodes.get, 'test_node')
+        self.assertEquals(
+            set([self.n2, self.n3, self.n4]), self.g.nodes.all()
+        )
+
+    def test_remove_cascade(self):
+        """ Removing a Node removes its Edges, scores and cached values. """
+        self.g.ttl = 5
+
+        e = self.g.edges.create(self.n, self.n2)
+        e2 = self.g.edges.create(self.n3, self.n)
+        e.increase_score()
+        e2.increase_score()
+        e.ttl = 10
+
+        # Populate the cache
+        e.get_weight()
+        e2.get_weight()
+        self.n.get_min_ttl_out()
+
+        self.g.nodes.remove(self.n)
+
+        store = self.g.store
+        self.assertEquals(self.g.edges.all(), set())
+        self.assertEquals(store.edge_count, 0)
+        self.assertFalse(store.edges_out(self.n.id))
+        self.assertFalse(store.edges_in(self.n.id))
+        self.assertEquals(store.get_score(self.n.id, self.n2.id), 0)
+        self.assertEquals(store.get_edge_ttl(self.n.id, self.n2.id), None)
+
+        self.assertEquals(store.cache.get((e, 'weight')), None)
+        self.assertEquals(store.cache.get((e2, 'weight')), None)
+        self.assertEquals(store.cache.get((self.n, 'score_out')), None)
+        self.assertEquals(store.cache.get((self.n, 'min_ttl_out')), None)
+        self.assertEquals(store.cache.get((self.n3, 'score_out')), None)
+
+    def test_remove_many(self):
+        """ Test remove_many() """
+        self.g.edges.create(self.n, self.n2)
+
+        self.g.nodes.remove_many([self.n, self.n2])
+
+        self.assertEquals(set([self.n3, self.n4]), self.g.nodes.all())
+        self.assertEquals(self.g.edges.all(), set())
+
+
+class TestNodeNeighbors(DualPathTestMixin, unittest.TestCase):
+    """ Test neighbor queries on NodeManager. """
+
+    def test_linked(self):
+        """ Test linked_to() and linked_from() """
+        self.assertEquals(self.g.nodes.linked_from(self.n), set([self.n2]))
+        self.assertEquals(self.g.nodes.linked_from(self.n3), set())
+
+        self.assertEquals(self.g.nodes.linked_to(self.n3), set([self.n2]))
+        self.assertEquals(self.g.nodes.linked_to(self.n), set())
+
+    def test_neighbors_from(self):
+        """ Test neighbors_from() for a single Node. """
+        self.e.increase_score()
+
+        self.assertEquals(
+            list(self.g.nodes.neighbors_from(self.n)),
+            [(self.n, self.n2, 100, 1.0)]
+        )
+
+    def test_neighbors_batch(self):
+        """ Test neighbors_from() and neighbors_to() for a batch of Nodes. """
+        self.e2.increase_score(10)
+
+        self.assertEquals(
+            set(self.g.nodes.neighbors_from([self.n, self.n2, self.n3])),
+            set([(self.n, self.n2, 0, 0.0), (self.n2, self.n3, 10, 1.0)])
+        )
+
+        self.assertEquals(
+            set(self.g.nodes.neighbors_to([self.n2, self.n3])),
+            set([(self.n2, self.n, 0, 0.0), (self.n3, self.n2, 10, 1.0)])
+        )
+
+    def test_neighbors_mutation(self):
+        """ Test neighbors_from() while Edges are added and removed. """
+        neighbors = self.g.nodes.neighbors_from([self.n, self.n2])
+
+        # Change the Edges from both Nodes halfway
+        self.assertEquals(next(neighbors)[1], self.n2)
+        self.g.edges.create(from_node=self.n, to_node=self.n4)
+        self.g.edges.create(from_node=self.n2, to_node=self.n4)
+        self.g.edges.remove(self.e2)
+
+        self.assertEquals(
+            set(neighbor for node, neighbor, score, weight in neighbors),
+            set([self.n4])
+        )
+
+
 class TestEdge(EdgeTestMixin, unittest.TestCase):
     """ Tests for Edge. """
 
@@ -151,6 +357,12 @@ class TestEdge(EdgeTestMixin, unittest.TestCase):
         # Assert nothing has changed
         self.test_init()
 
+    def test_immutable(self):
+        """ Edge attributes cannot be changed. """
+        self.assertRaises(AttributeError, setattr, self.e, 'to_node', self.n3)
+
+        self.assertEquals(self.e.to_node, self.n2)
+
     def test_twographs(self):
         """ Test that two graphs do not interfere. """
 
@@ -206,13 +418,25 @@ class TestEdge(EdgeTestMixin, unittest.TestCase):
         e2 = self.g.edges.create(self.n, n3)
         e2.ttl = 3
 
-        # Value should be cached for 7 seconds
-        self.assertEquals(self.n.get_min_ttl_out(), 7)
-
-        # Flush cache, expect results!
-        self.g.store.cache.flush()
+        # Setting the ttl invalidates the cached value
         self.assertEquals(self.n.get_min_ttl_out(), 3)
 
+        self.e.ttl = 1
+        self.assertEquals(self.n.get_min_ttl_out(), 1)
+
+        # So does changing the ttl of a linked Node, for Edges without ttl
+        self.n.ttl = 10
+        n4 = self.g.nodes.create(name='node_4')
+        n4.ttl = 10
+        self.g.edges.create(self.n, n4)
+        self.assertEquals(self.n.get_min_ttl_out(), 1)
+
+        n4.ttl = 0
+        self.assertEquals(self.n.get_min_ttl_out(), 0)
+
+        n4.ttl = 10
+        self.assertEquals(self.n.get_min_ttl_out(), 1)
+
     def test_weight(self):
         """ Test weight for Graph with single Edge. """
 
@@ -266,8 +490,72 @@ class TestEdge(EdgeTestMixin, unittest.TestCase):
         self.assertAlmostEqual(self.e.get_weight(), 2.0/3)
         self.assertAlmostEqual(e2.get_weight(), 1.0/3)
 
+    def test_score_out(self):
+        """ Test totals of outgoing scores after score writes and removal. """
+        store = self.g.store
+
+        n3 = self.g.nodes.create(name='node_3')
+        e2 = self.g.edges.create(self.n, n3)
+
+        self.e.score = 50
+        e2.increase_score(30)
+        e2.decrease_score(10)
+        self.assertEquals(store.score_out(self.n.id), 70)
+
+        del self.e.score
+        self.assertEquals(store.score_out(self.n.id), 20)
+
+        self.g.edges.increase_score_many([(self.n, self.n2, 5)])
+        self.assertEquals(store.score_out(self.n.id), 25)
+
+        self.g.edges.remove(e2)
+        self.assertEquals(store.score_out(self.n.id), 5)
+        self.assertTrue(isinstance(self.n.get_score_out(), (int, long)))
+        self.assertAlmostEqual(self.e.get_weight(), 1.0)
+
+        # Stores maintaining totals compute weights without the cache
+        if store.aggregates:
+            self.assertEquals(store.cache.get((self.e, 'weight')), None)
+
+    def test_score_missing_edge(self):
+        """ Test scores of Edges not in the Graph do not count in totals. """
+        n3 = self.g.nodes.create(name='node_3')
+        missing = Edge(self.g, self.n, n3)
+
+        self.e.score = 100
+        missing.increase_score(100)
+
+        self.assertEquals(self.n.get_score_out(), 100)
+        self.assertAlmostEqual(self.e.get_weight(), 1.0)
+
+    def test_store_score_missing_edge(self):
+        """ Test stores ignore score writes to edges not in the store. """
+        store = self.g.store
+        n3 = self.g.nodes.create(name='node_3')
+
+        store.set_score(self.n.id, n3.id, 50)
+        self.assertEquals(store.increase_score(self.n.id, n3.id, 50), 0)
+        store.increase_scores(
+            [(self.n.id, n3.id, 50), (self.n.id, self.n2.id, 5)]
+        )
+
+        self.assertEquals(store.get_score(self.n.id, n3.id), 0)
+        self.assertEquals(store.score_out(self.n.id), 5)
+
+        # Scores are not revived when the edge is added later
+        store.add_edge(self.n.id, n3.id)
+
+        self.assertEquals(store.get_score(self.n.id, n3.id), 0)
+        self.assertEquals(store.score_out(self.n.id), 5)
+
     def test_weight_cache(self):
-        """ Test caching for get_weight(). """
+        """
+        Test caching for get_weight(), stores maintaining score totals
+        compute weights directly.
+        """
+        cache = self.g.store.cache
+        cached = not self.g.store.aggregates
+
         # Set some cache value
         self.e.ttl = 5
 
@@ -278,24 +566,42 @@ class TestEdge(EdgeTestMixin, unittest.TestCase):
         self.assertAlmostEqual(self.e.get_weight(), 0.0)
 
         # Test cache
-        self.assertEquals(self.g.store.cache.get((self.e, 'weight')), 0.0)
-        self.assertTrue(self.g.store.cache.get_expires((self.e, 'weight')))
+        if cached:
+            self.assertEquals(cache.get((self.e, 'weight')), 0.0)
+            self.assertTrue(cache.get_expires((self.e, 'weight')))
+        else:
+            self.assertEquals(cache.get((self.e, 'weight')), None)
 
-        # With score increased, weight should be 1.0 - but 0.0 still in cache
+        # With score increased, weight should be 1.0
         self.e.increase_score()
 
-        # Cache should not have changed
-        self.assertEquals(self.g.store.cache.get((self.e, 'weight')), 0.0)
-        self.assertTrue(self.g.store.cache.get_expires((self.e, 'weight')))
-
-        self.assertAlmostEqual(self.e.get_weight(), 0.0)
-
-        # Flush cache
-        self.g.store.cache.flush()
+        # Cached values for the originating Node are invalidated
+        self.assertEquals(cache.get((self.e, 'weight')), None)
+        self.assertEquals(cache.get((self.n, 'score_out')), None)
 
         # New value propagated!
         self.assertAlmostEqual(self.e.get_weight(), 1.0)
 
+        # Sibling Edges are invalidated as well
+        n3 = self.g.nodes.create(name='node_3')
+        e2 = self.g.edges.create(self.n, n3)
+        e2.increase_score(300)
+
+        self.assertAlmostEqual(self.e.get_weight(), 0.25)
+
+        # Cached values for other Nodes are kept
+        e3 = self.g.edges.create(self.n2, n3)
+        e3.increase_score()
+        self.assertAlmostEqual(e3.get_weight(), 1.0)
+
+        self.e.increase_score()
+        self.assertEquals(
+            cache.get((e3, 'weight')), 1.0 if cached else None
+        )
+
+        # Weights are correct right after a change
+        self.assertAlmostEqual(self.e.get_weight(), 0.4)
+
     def test_ttl(self):
         """ Test ttl behaviour for Edge. """
 
@@ -325,6 +631,85 @@ class TestEdgeManager(DualPathTestMixin, unittest.TestCase):
             self.g.edges.get(self.n, self.n2), self.e
         )
 
+        # Edges are directed
+        self.assertRaises(EdgeNotFound, self.g.edges.get, self.n2, self.n)
+
+    def test_exists(self):
+        """ Test exists() """
+        self.assertTrue(self.g.edges.exists(self.n, self.n2))
+        self.assertFalse(self.g.edges.exists(self.n2, self.n))
+        self.assertFalse(self.g.edges.exists(self.n, self.n3))
+
+    def test_create_duplicate(self):
+        """ Creating an existing Edge returns an equal Edge. """
+        self.assertEquals(self.g.edges.create(self.n, self.n2), self.e)
+        self.assertEquals(self.g.store.edge_count, 2)
+
+    def test_create_many(self):
+        """ Test create_many() keeps the scores of existing Edges. """
+        self.e.increase_score()
+
+        edges = self.g.edges.create_many([
+            (self.n, self.n2), (self.n3, self.n4)
+        ])
+
+        self.assertEquals(edges[0], self.e)
+        self.assertEquals(self.e.score, 100)
+        self.assertEquals(edges[1], self.g.edges.get(self.n3, self.n4))
+        self.assertEquals(self.g.store.edge_count, 3)
+
+    def test_increase_score_many(self):
+        """ Test increase_score_many() """
+        self.e.increase_score(50)
+
+        self.g.edges.increase_score_many([
+            (self.n, self.n2, 100),
+            (self.n2, self.n3, 20),
+            (self.n2, self.n3, -50),
+            (self.n, self.n3, 25),
+        ], create=True)
+
+        self.assertEquals(self.e.score, 150)
+        self.assertEquals(self.e2.score, 0)
+
+        # Missing Edges are created
+        e3 = self.g.edges.get(self.n, self.n3)
+        self.assertEquals(e3.score, 25)
+        self.assertEquals(self.g.store.edge_count, 3)
+
+    def test_increase_score_many_missing(self):
+        """ Test increase_score_many() requires existing Edges. """
+        with self.assertRaises(EdgeNotFound):
+            self.g.edges.increase_score_many([
+                (self.n, self.n2, 100),
+                (self.n, self.n3, 25),
+            ])
+
+        # No score was changed, no Edge created
+        self.assertEquals(self.e.score, 0)
+        self.assertFalse(self.g.edges.exists(self.n, self.n3))
+
+    def test_increase_score_many_cache(self):
+        """ Cached totals and weights for changed Nodes are invalidated. """
+        self.e.increase_score()
+        self.e2.increase_score()
+
+        # Populate the cache
+        self.assertAlmostEqual(self.e.get_weight(), 1.0)
+        self.assertAlmostEqual(self.e2.get_weight(), 1.0)
+
+        e3 = self.g.edges.create(self.n, self.n3)
+        self.g.edges.increase_score_many([(self.n, self.n3, 300)])
+
+        if not self.g.store.aggregates:
+            cache = self.g.store.cache
+            self.assertEquals(cache.get((self.e, 'weight')), None)
+            self.assertEquals(cache.get((self.n, 'score_out')), None)
+            self.assertEquals(cache.get((self.e2, 'weight')), 1.0)
+
+        self.assertAlmostEqual(self.e.get_weight(), 0.25)
+        self.assertAlmostEqual(e3.get_weight(), 0.75)
+
     def test_all(self):
         """ Test all() """
 
@@ -356,6 +741,20 @@ class TestEdgeManager(DualPathTestMixin, unittest.TestCase):
             self.g.edges.to_node(self.n3), set([self.e2])
         )
 
+    def test_remove(self):
+        """ Test remove() updates the adjacency indexes. """
+
+        self.g.edges.remove(self.e)
+
+        self.assertEquals(self.g.edges.all(), set([self.e2]))
+        self.assertFalse(self.g.edges.exists(self.n, self.n2))
+        self.assertEquals(self.g.edges.from_node(self.n), set())
+        self.assertEquals(self.g.edges.to_node(self.n2), set())
+
+        # Other Edges are unaffected
+        self.assertEquals(self.g.edges.from_node(self.n2), set([self.e2]))
+        self.assertEquals(self.g.edges.to_node(self.n3), set([self.e2]))
+
 
 if __name__ == '__main__':
     unittest.main()
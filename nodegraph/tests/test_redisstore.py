@@ -0,0 +1,199 @@
+import os
+import unittest
+
+from ..graph import Graph
+from ..redisstore import RedisGraphStore, get_connection_pool, redis
+
+from . import test_lowlevel, test_highlevel, test_edgelist
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+# Use a real server when configured, the fakeredis stand-in otherwise
+REDIS_URL = os.environ.get('NODEGRAPH_REDIS_URL')
+
+skip = unittest.skipIf(
+    redis is None or not (REDIS_URL or fakeredis),
+    'Neither NODEGRAPH_REDIS_URL nor fakeredis is available.'
+)
+
+
+def create_client():
+    """ Return an emptied Redis client for testing. """
+    if REDIS_URL:
+        client = redis.StrictRedis.from_url(REDIS_URL)
+    else:
+        client = fakeredis.FakeStrictRedis()
+
+    client.flushdb()
+
+    return client
+
+
+class RedisTestMixin(object):
+    """ Mixin running Graph tests on a RedisGraphStore. """
+
+    def create_store(self):
+        return RedisGraphStore(name='test_graph', client=create_client())
+
+
+@skip
+class TestRedisNode(RedisTestMixin, test_lowlevel.TestNode):
+    pass
+
+
+@skip
+class TestRedisNodeManager(RedisTestMixin, test_lowlevel.TestNodeManager):
+    pass
+
+
+@skip
+class TestRedisNodeNeighbors(RedisTestMixin, test_lowlevel.TestNodeNeighbors):
+    pass
+
+
+@skip
+class TestRedisEdge(RedisTestMixin, test_lowlevel.TestEdge):
+    pass
+
+
+@skip
+class TestRedisEdgeManager(RedisTestMixin, test_lowlevel.TestEdgeManager):
+    pass
+
+
+@skip
+class TestRedisComplexPath(RedisTestMixin, test_highlevel.TestComplexPath):
+    pass
+
+
+@skip
+class TestRedisEnsembleManager(
+    RedisTestMixin, test_highlevel.TestEnsembleManager
+):
+    pass
+
+
+@skip
+class TestRedisEdgeList(RedisTestMixin, test_edgelist.TestEdgeList):
+    pass
+
+
+@skip
+class TestRedisGraphStore(unittest.TestCase):
+    """ Tests for sharing a RedisGraphStore. """
+
+    def test_shared(self):
+        """ Two stores on the same server share Nodes, Edges and settings. """
+        client = create_client()
+
+        g = Graph(name='test', store=RedisGraphStore('test', client=client))
+        n = g.nodes.create('test_node')
+        n2 = g.nodes.create('test_node_2')
+        g.edges.create(n, n2).increase_score()
+        g.ttl = 5
+
+        other = Graph(
+            name='test', store=RedisGraphStore('test', client=client)
+        )
+
+        self.assertEquals(other.ttl, 5)
+        self.assertEquals(other.path_dampening, 0.9)
+        self.assertEquals(other.edges.get(n, n2).score, 100)
+        self.assertEquals(other.nodes.get('test_node').get_score_out(), 100)
+
+    def test_increase_score(self):
+        """ Increments by other clients meanwhile are not lost. """
+        client = create_client()
+
+        s = RedisGraphStore('test', client=client)
+        s.add_edge(0, 1)
+        s.set_score(0, 1, 10)
+
+        other = RedisGraphStore('test', client=client)
+        transaction = client.transaction
+
+        # Whether the other store has incremented yet
+        conflicted = []
+
+        def conflicting(func, *keys, **kwargs):
+            """ Increment from the other store during the first attempt. """
+            def wrapper(pipe):
+                value = func(pipe)
+
+                if not conflicted:
+                    conflicted.append(True)
+                    other.increase_scores([(0, 1, 5)])
+
+                return value
+
+            return transaction(wrapper, *keys, **kwargs)
+
+        client.transaction = conflicting
+
+        self.assertEquals(s.increase_score(0, 1, 1), 16)
+        self.assertEquals(s.increase_score(0, 1, -20), 0)
+        self.assertEquals(s.get_score(0, 1), 0)
+
+    def test_prefetch(self):
+        """ Reads within prefetch() are served from a batch read. """
+        client = create_client()
+
+        s = RedisGraphStore('test', client=client)
+        s.add_edges([(0, 1, 10, 5), (0, 2, 20, None), (1, 2, 30, None)])
+        s.set_node_ttl(2, 7)
+
+        expected = (
+            sorted(s.edges_out(0)), sorted(s.scores_out(0)),
+            sorted(s.ttls_out(0)), s.get_score(0, 2), s.get_edge_ttl(0, 1),
+            s.get_node_ttl(2), s.node_ttls([1, 2], 3)
+        )
+
+        with s.prefetch([0]):
+            # Not visible until the context is left
+            RedisGraphStore('test', client=client).set_score(0, 2, 40)
+
+            self.assertEquals((
+                sorted(s.edges_out(0)), sorted(s.scores_out(0)),
+                sorted(s.ttls_out(0)), s.get_score(0, 2),
+                s.get_edge_ttl(0, 1), s.get_node_ttl(2), s.node_ttls([1, 2], 3)
+            ), expected)
+
+            # Nested contexts add to the prefetched data
+            with s.prefetch([1]):
+                self.assertEquals(s.scores_out(1), [(2, 30)])
+
+            self.assertEquals(s.get_score(1, 2), 30)
+
+        self.assertEquals(s.get_score(0, 2), 40)
+
+    def test_clear(self):
+        """ clear() removes the data for one store only. """
+        client = create_client()
+
+        s = RedisGraphStore('test', client=client)
+        s.add_node(s.intern('a'))
+
+        other = RedisGraphStore('other', client=client)
+        other.add_node(other.intern('a'))
+
+        s.clear()
+
+        self.assertEquals(list(s.iter_nodes()), [])
+        self.assertEquals(list(other.iter_nodes()), [0])
+
+    def test_connection_pool(self):
+        """ Stores for the same url share a connection pool. """
+        url = 'redis://localhost:6379/0'
+
+        self.assertIs(get_connection_pool(url), get_connection_pool(url))
+        self.assertIsNot(
+            get_connection_pool(url), get_connection_pool(url + '1')
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..exceptions import ReadOnlyError, NodeNotFound
+from ..graph import Graph
+from ..snapshot import save_snapshot, SnapshotGraphStore
+
+from .mixins import EnsembleTestMixin
+
+
+class TestSnapshot(EnsembleTestMixin, unittest.TestCase):
+    """ Tests for writing and reading snapshots. """
+
+    def setUp(self):
+        super(TestSnapshot, self).setUp()
+
+        self.e.increase_score(10)
+        self.e2.increase_score(5)
+        self.e3.increase_score(15)
+        self.e2.ttl = 7
+        self.n3.ttl = 3
+        self.g.ttl = 5
+
+        # Removed Node leaves a hole in the ids
+        self.g.nodes.remove(self.n4)
+        self.unicode_node = self.g.nodes.create(u'caf\xe9')
+        self.bytes_node = self.g.nodes.create('Z\xc3\xbcrich')
+
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'graph.snapshot')
+
+        with open(self.path, 'wb') as f:
+            save_snapshot(self.g.store, f)
+
+        self.s = SnapshotGraphStore(name='test_graph', path=self.path)
+        self.snapshot = Graph(name='test_graph', store=self.s)
+
+    def tearDown(self):
+        self.s.close()
+        shutil.rmtree(self.directory)
+
+        super(TestSnapshot, self).tearDown()
+
+    def test_nodes(self):
+        """ Nodes, names and ttl's are kept. """
+        self.assertEquals(self.snapshot.nodes.all(), self.g.nodes.all())
+        self.assertEquals(self.snapshot.ttl, 5)
+
+        self.assertEquals(self.snapshot.nodes.get('test_node_3').ttl, 3)
+        self.assertEquals(self.snapshot.nodes.get('test_node').ttl, 5)
+        self.assertEquals(
+            self.snapshot.nodes.get(u'caf\xe9'), self.unicode_node
+        )
+        self.assertEquals(
+            self.snapshot.nodes.get('Z\xc3\xbcrich'), self.bytes_node
+        )
+
+        self.assertRaises(
+            NodeNotFound, self.snapshot.nodes.get, 'test_node_4'
+        )
+        self.assertRaises(NodeNotFound, self.snapshot.nodes.get, 'missing')
+
+    def test_edges(self):
+        """ Edges, scores and ttl's are kept. """
+        self.assertEquals(self.snapshot.edges.all(), self.g.edges.all())
+        self.assertEquals(self.s.edge_count, 3)
+
+        e = self.snapshot.edges.get(self.n, self.n2)
+        self.assertEquals(e.score, 10)
+        self.assertEquals(e.ttl, 5)
+
+        e2 = self.snapshot.edges.get(self.n2, self.n3)
+        self.assertEquals(e2.ttl, 7)
+
+        self.assertEquals(
+            self.snapshot.edges.to_node(self.n3), set([self.e2, self.e3])
+        )
+        self.assertFalse(self.snapshot.edges.exists(self.n2, self.n))
+
+    def test_weights(self):
+        """ Weights are equal to those on the original Graph. """
+        self.assertEquals(
+            self.snapshot.nodes.get('test_node').get_score_out(), 25
+        )
+        self.assertEquals(
+            self.snapshot.ensembles.get(self.n, self.n3).get_weight(),
+            self.g.ensembles.get(self.n, self.n3).get_weight()
+        )
+
+    def test_read_only(self):
+        """ Changes raise ReadOnlyError. """
+        e = self.snapshot.edges.get(self.n, self.n2)
+
+        self.assertRaises(ReadOnlyError, e.increase_score)
+        self.assertRaises(ReadOnlyError, self.snapshot.nodes.create, 'new')
+        self.assertRaises(ReadOnlyError, self.snapshot.edges.remove, e)
+
+    def test_invalid(self):
+        """ Opening another file raises ValueError. """
+        with open(self.path, 'wb') as f:
+            f.write('\0' * 128)
+
+        self.assertRaises(
+            ValueError, SnapshotGraphStore, name='test', path=self.path
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
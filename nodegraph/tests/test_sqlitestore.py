@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..graph import Graph
+from ..sqlitestore import SQLiteGraphStore
+
+from . import (
+    test_lowlevel, test_highlevel, test_edgelist, test_weights, test_buffer
+)
+
+
+class SQLiteTestMixin(object):
+    """ Mixin running Graph tests on an in-memory SQLiteGraphStore. """
+
+    def create_store(self):
+        return SQLiteGraphStore(name='test_graph')
+
+
+class TestSQLiteNode(SQLiteTestMixin, test_lowlevel.TestNode):
+    pass
+
+
+class TestSQLiteNodeManager(SQLiteTestMixin, test_lowlevel.TestNodeManager):
+    pass
+
+
+class TestSQLiteNodeNeighbors(
+    SQLiteTestMixin, test_lowlevel.TestNodeNeighbors
+):
+    pass
+
+
+class TestSQLiteEdge(SQLiteTestMixin, test_lowlevel.TestEdge):
+    pass
+
+
+class TestSQLiteEdgeManager(SQLiteTestMixin, test_lowlevel.TestEdgeManager):
+    pass
+
+
+class TestSQLiteComplexPath(
+    SQLiteTestMixin, test_highlevel.TestComplexPath
+):
+    pass
+
+
+class TestSQLiteEnsembleManager(
+    SQLiteTestMixin, test_highlevel.TestEnsembleManager
+):
+    pass
+
+
+class TestSQLiteEdgeList(SQLiteTestMixin, test_edgelist.TestEdgeList):
+    pass
+
+
+class TestSQLiteWeights(SQLiteTestMixin, test_weights.TestWeights):
+    pass
+
+
+class TestSQLiteScoreBuffer(SQLiteTestMixin, test_buffer.TestScoreBuffer):
+    pass
+
+
+class TestSQLiteGraphStore(unittest.TestCase):
+    """ Tests for persistence of SQLiteGraphStore. """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'graph.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_reopen(self):
+        """ Nodes, edges, scores and settings survive reopening. """
+        s = SQLiteGraphStore(name='test', path=self.path)
+        g = Graph(name='test', store=s)
+
+        n = g.nodes.create('test_node')
+        n2 = g.nodes.create('test_node_2')
+        e = g.edges.create(n, n2)
+        e.increase_score()
+        e.ttl = 7
+        g.ttl = 5
+
+        s.close()
+
+        s = SQLiteGraphStore(name='test', path=self.path)
+        g = Graph(name='test', store=s)
+
+        self.assertEquals(g.ttl, 5)
+        self.assertEquals(g.nodes.get('test_node'), n)
+
+        e = g.edges.get(n, n2)
+        self.assertEquals(e.score, 100)
+        self.assertEquals(e.ttl, 7)
+
+        s.close()
+
+    def test_batch(self):
+        """ Writes are committed in batches. """
+        s = SQLiteGraphStore(name='test', path=self.path, batch_size=3)
+
+        s.add_node(s.intern('a'))
+        self.assertEquals(s.pending, 2)
+
+        s.add_node(s.intern('b'))
+        self.assertEquals(s.pending, 1)
+
+        # Pending writes are visible
+        self.assertEquals(set(s.iter_nodes()), set([0, 1]))
+
+        s.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
+import sys
 import tempfile
+import threading
 
+from ..graph import Graph
 from ..store import GraphStore
 
 
@@ -47,6 +50,202 @@ class TestGraphStore(unittest.TestCase):
             s = GraphStore.load(f)
             self.assertEquals(s.name, 'test')
 
+    def test_pickle_graph(self):
+        """ Pickle a store holding Nodes and Edges. """
+        g = Graph(name='test')
+        n = g.nodes.create('test_node')
+        n2 = g.nodes.create('test_node_2')
+        e = g.edges.create(n, n2)
+        e.increase_score()
+
+        # Populate the cache
+        e.get_weight()
+
+        with tempfile.TemporaryFile() as f:
+            g.store.save(f)
+
+            # Rewind file pointer
+            f.seek(0)
+
+            s = GraphStore.load(f)
+
+            self.assertEquals(s.lookup('test_node_2'), n2.id)
+            self.assertEquals(list(s.iter_edges()), [(n.id, n2.id)])
+            self.assertEquals(s.get_score(n.id, n2.id), 100)
+            self.assertEquals(s.score_out(n.id), 100)
+
+    def test_unpickle_score_out(self):
+        """ Totals are rebuilt for stores pickled without them. """
+        s = GraphStore(name='test')
+        s.add_edges([(0, 1, 10, None), (0, 2, 5, None), (1, 2, 3, None)])
+
+        state = s.__getstate__()
+        del state['edge_score_out']
+
+        s = GraphStore.__new__(GraphStore)
+        s.__setstate__(state)
+
+        self.assertEquals(s.score_out(0), 15)
+        self.assertEquals(s.score_out(1), 3)
+        self.assertEquals(s.score_out(2), 0)
+
+    def test_intern(self):
+        """ Test the interned name table. """
+        s = GraphStore(name='test')
+
+        self.assertEquals(s.intern('a'), 0)
+        self.assertEquals(s.intern('b'), 1)
+        self.assertEquals(s.intern('a'), 0)
+
+        self.assertEquals(s.lookup('b'), 1)
+        self.assertEquals(s.lookup('c'), None)
+        self.assertEquals(s.get_name(1), 'b')
+
+    def test_edges(self):
+        """ Test adding and removing edges. """
+        s = GraphStore(name='test')
+
+        self.assertTrue(s.add_edge(0, 1))
+        self.assertFalse(s.add_edge(0, 1))
+        self.assertTrue(s.add_edge(2, 1))
+
+        self.assertEquals(s.edge_count, 2)
+        self.assertEquals(set(s.edges_in(1)), set([0, 2]))
+
+        s.set_score(0, 1, 5)
+        s.remove_edge(0, 1)
+
+        self.assertFalse(s.has_edge(0, 1))
+        self.assertEquals(s.get_score(0, 1), 0)
+        self.assertEquals(s.edge_count, 1)
+        self.assertEquals(list(s.iter_edges()), [(2, 1)])
+
+    def test_increase_score(self):
+        """ Test atomic score increments, clamped at 0. """
+        s = GraphStore(name='test')
+        s.add_edges([(0, 1, 10, None), (0, 2, 5, None)])
+
+        self.assertEquals(s.increase_score(0, 1, 5), 15)
+        self.assertEquals(s.increase_score(0, 2, -10), 0)
+        self.assertEquals(s.score_out(0), 15)
+
+    def test_concurrent_writers(self):
+        """ Test that no updates are lost with concurrent writers. """
+        s = GraphStore(name='test', stripes=4)
+        s.add_edges((from_id, 1, None, None) for from_id in xrange(8))
+
+        def worker():
+            for i in xrange(1000):
+                for from_id in xrange(8):
+                    s.increase_score(from_id, 1, 1)
+
+                s.increase_scores([(0, 1, 1), (4, 1, 1)])
+
+        threads = [threading.Thread(target=worker) for i in xrange(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for from_id in xrange(8):
+            expected = 8000 if from_id in (0, 4) else 4000
+
+            self.assertEquals(s.get_score(from_id, 1), expected)
+            self.assertEquals(s.score_out(from_id), expected)
+
+    def test_concurrent_edges(self):
+        """ Test adding and removing edges to a shared node concurrently. """
+        s = GraphStore(name='test')
+        errors = []
+
+        def worker(from_id):
+            try:
+                for i in xrange(10000):
+                    s.add_edge(from_id, 1000)
+                    s.remove_edge(from_id, 1000)
+
+                s.add_edge(from_id, 1000)
+
+            except KeyError as e:
+                errors.append(e)
+
+        # Switch threads as often as possible
+        interval = sys.getcheckinterval()
+        sys.setcheckinterval(1)
+
+        try:
+            threads = [
+                threading.Thread(target=worker, args=(from_id, ))
+                for from_id in xrange(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setcheckinterval(interval)
+
+        self.assertEquals(errors, [])
+        self.assertEquals(s.edge_count, 8)
+        self.assertEquals(set(s.edges_in(1000)), set(xrange(8)))
+
+    def test_concurrent_reads(self):
+        """ Test reading the edges of a node while they change. """
+        s = GraphStore(name='test')
+        errors = []
+
+        def writer(to_id):
+            for i in xrange(2000):
+                s.add_edge(0, to_id)
+                s.remove_edge(0, to_id)
+
+        def reader():
+            try:
+                for i in xrange(2000):
+                    for to_id in s.edges_out(0):
+                        pass
+
+                    s.scores_out(0)
+                    s.ttls_out(0)
+                    list(s.iter_edges())
+
+            except RuntimeError as e:
+                errors.append(e)
+
+        # Switch threads as often as possible
+        interval = sys.getcheckinterval()
+        sys.setcheckinterval(1)
+
+        try:
+            threads = [
+                threading.Thread(target=writer, args=(to_id, ))
+                for to_id in xrange(1, 5)
+            ]
+            threads.extend(threading.Thread(target=reader) for i in xrange(4))
+
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setcheckinterval(interval)
+
+        self.assertEquals(errors, [])
+        self.assertEquals(s.edges_out(0), [])
+
+    def test_pickle_locks(self):
+        """ Locks are recreated when unpickling. """
+        s = GraphStore(name='test', stripes=4)
+
+        state = s.__getstate__()
+        self.assertFalse('locks' in state)
+
+        s = GraphStore.__new__(GraphStore)
+        s.__setstate__(state)
+
+        self.assertEquals(len(s.locks), 4)
+        self.assertTrue(s.lock(5) is s.locks[1])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,251 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from ..graph import Graph
+from ..wal import WriteAheadLog, LoggedGraphStore
+
+from . import test_lowlevel
+
+
+class LoggedTestMixin(object):
+    """ Mixin running Graph tests on a LoggedGraphStore. """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+        super(LoggedTestMixin, self).setUp()
+
+    def tearDown(self):
+        self.g.store.close()
+        shutil.rmtree(self.directory)
+
+        super(LoggedTestMixin, self).tearDown()
+
+    def create_store(self):
+        return LoggedGraphStore.open(name='test_graph', directory=self.directory)
+
+
+class TestLoggedNodeManager(LoggedTestMixin, test_lowlevel.TestNodeManager):
+    pass
+
+
+class TestLoggedEdge(LoggedTestMixin, test_lowlevel.TestEdge):
+    pass
+
+
+class TestWriteAheadLog(unittest.TestCase):
+    """ Tests for WriteAheadLog. """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'log')
+
+        # Initialize mock time
+        self.time = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_group_commit(self):
+        """ Records are committed per group_size records. """
+        log = WriteAheadLog(self.path, group_size=3, timer=lambda: self.time)
+
+        log.append(['a', 1])
+        log.append(['b', 2])
+        self.assertEquals(log.pending, 2)
+
+        log.append(['c', 3])
+        self.assertEquals(log.pending, 0)
+
+        log.close()
+
+        self.assertEquals(
+            list(WriteAheadLog.replay(self.path)),
+            [['a', 1], ['b', 2], ['c', 3]]
+        )
+
+    def test_group_interval(self):
+        """ Records are committed after group_interval seconds. """
+        log = WriteAheadLog(
+            self.path, group_size=100, group_interval=1,
+            timer=lambda: self.time
+        )
+
+        log.append(['a', 1])
+        self.assertEquals(log.pending, 1)
+
+        self.time = 1
+        log.append(['b', 2])
+        self.assertEquals(log.pending, 0)
+
+        log.close()
+
+    def test_commit_timer(self):
+        """ Pending records are committed when no records follow. """
+        log = WriteAheadLog(self.path, group_size=100, group_interval=0.01)
+
+        log.append(['a', 1])
+
+        for i in xrange(200):
+            if not log.pending:
+                break
+
+            time.sleep(0.01)
+
+        self.assertEquals(log.pending, 0)
+
+        log.close()
+
+    def test_partial(self):
+        """ A partially written record is ignored and truncated. """
+        with open(self.path, 'wb') as f:
+            f.write('["a",1]\n["b",')
+
+        self.assertEquals(list(WriteAheadLog.replay(self.path)), [['a', 1]])
+        self.assertEquals(os.path.getsize(self.path), 8)
+
+
+class TestLoggedGraphStore(unittest.TestCase):
+    """ Tests for durability of LoggedGraphStore. """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def open(self):
+        return Graph(
+            name='test',
+            store=LoggedGraphStore.open(name='test', directory=self.directory)
+        )
+
+    def populate(self):
+        """ Make some changes to a new Graph, returns the Graph. """
+        g = self.open()
+
+        n = g.nodes.create('test_node')
+        n2 = g.nodes.create('test_node_2')
+        n3 = g.nodes.create('test_node_3')
+
+        e = g.edges.create(n, n2)
+        e.increase_score()
+        e.ttl = 7
+
+        g.edges.create(n, n3)
+        g.nodes.remove(n3)
+        g.ttl = 5
+
+        return g
+
+    def assertPopulated(self, g, names=('test_node', 'test_node_2')):
+        """ Assert the changes made by populate(). """
+        self.assertEquals(g.ttl, 5)
+        self.assertEquals(
+            set(node.name for node in g.nodes.all()), set(names)
+        )
+
+        n = g.nodes.get('test_node')
+        e = g.edges.get(n, g.nodes.get('test_node_2'))
+
+        self.assertEquals(e.score, 100)
+        self.assertEquals(e.ttl, 7)
+        self.assertEquals(g.edges.from_node(n), set([e]))
+
+    def test_replay(self):
+        """ Changes are replayed from the log when reopening. """
+        g = self.populate()
+        g.store.close()
+
+        g = self.open()
+        self.assertPopulated(g)
+        g.store.close()
+
+    def test_bulk(self):
+        """ Bulk additions are logged and replayed. """
+        g = self.open()
+
+        a, b = g.store.intern('a'), g.store.intern('b')
+        g.store.add_nodes(iter([a, b]))
+        g.store.add_edges(iter([(a, b, 300, None)]))
+        g.store.close()
+
+        g = self.open()
+        a, b = g.nodes.get_many(['a', 'b'])
+        self.assertEquals(g.edges.get(a, b).score, 300)
+        g.store.close()
+
+    def test_non_ascii(self):
+        """ Non-ASCII names are replayed with the type they were created. """
+        g = self.open()
+
+        g.nodes.create('Z\xc3\xbcrich')
+        g.nodes.create(u'M\xfcnchen')
+        g.store.close()
+
+        g = self.open()
+        zurich = g.nodes.get('Z\xc3\xbcrich')
+        munich = g.nodes.get(u'M\xfcnchen')
+
+        self.assertTrue(isinstance(g.store.get_name(zurich.id), str))
+        self.assertTrue(isinstance(g.store.get_name(munich.id), unicode))
+
+        # No duplicate Nodes
+        g.nodes.create('Z\xc3\xbcrich')
+        self.assertEquals(len(list(g.store.iter_nodes())), 2)
+        g.store.close()
+
+    def test_compact(self):
+        """ Compaction writes a snapshot and empties the log. """
+        g = self.populate()
+        g.store.compact()
+
+        self.assertEquals(g.store.generation, 2)
+        self.assertEquals(
+            sorted(os.listdir(self.directory)), ['log.2', 'snapshot']
+        )
+        self.assertEquals(os.path.getsize(g.store.log.path), 0)
+
+        # Changes after compaction are logged
+        g.nodes.create('test_node_4')
+        g.store.close()
+
+        g = self.open()
+        self.assertPopulated(
+            g, names=('test_node', 'test_node_2', 'test_node_4')
+        )
+        g.store.close()
+
+
+    def test_compact_concurrent(self):
+        """ Writes during compaction are neither lost nor logged twice. """
+        g = self.open()
+        store = g.store
+
+        a, b = store.intern('a'), store.intern('b')
+        store.add_nodes([a, b])
+        store.add_edge(a, b)
+
+        def worker():
+            for i in xrange(2000):
+                store.increase_score(a, b, 1)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+
+        while thread.is_alive():
+            store.compact()
+
+        thread.join()
+        store.close()
+
+        g = self.open()
+        self.assertEquals(g.store.get_score(a, b), 2000)
+        g.store.close()
+
+if __name__ == '__main__':
+    unittest.main()
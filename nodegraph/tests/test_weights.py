@@ -0,0 +1,79 @@
+import unittest
+
+from ..weights import edge_weights, weights_out, normalize, numpy
+
+from .mixins import GraphTestMixin
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed.')
+class TestWeights(GraphTestMixin, unittest.TestCase):
+    """ Tests for vectorized weights. """
+
+    def setUp(self):
+        super(TestWeights, self).setUp()
+
+        self.nodes = self.g.nodes.create_many(
+            'node_{0}'.format(i) for i in xrange(5)
+        )
+        n = self.nodes
+
+        self.g.edges.increase_score_many([
+            (n[0], n[1], 100),
+            (n[0], n[2], 300),
+            (n[1], n[2], 50),
+            (n[2], n[3], 0),
+            (n[3], n[4], 20),
+        ], create=True)
+
+        # Edge without score from a Node with scored Edges
+        self.g.edges.create(n[3], n[0])
+
+    def test_edge_weights(self):
+        """ Weights for all Edges equal those of Edge.get_weight(). """
+        from_ids, to_ids, weights = edge_weights(self.g)
+
+        self.assertEquals(len(weights), self.g.store.edge_count)
+
+        get_node = self.g.nodes.get_by_id
+        for from_id, to_id, weight in zip(from_ids, to_ids, weights):
+            edge = self.g.edges.get(get_node(from_id), get_node(to_id))
+
+            self.assertAlmostEqual(weight, edge.get_weight())
+
+    def test_weights_out(self):
+        """ Weights for Edges from a single Node. """
+        to_ids, weights = weights_out(self.g, self.nodes[0])
+
+        self.assertEquals(
+            sorted(zip(to_ids.tolist(), weights.tolist())),
+            [(self.nodes[1].id, 0.25), (self.nodes[2].id, 0.75)]
+        )
+
+        # Edges without score
+        to_ids, weights = weights_out(self.g, self.nodes[2])
+        self.assertEquals(weights.tolist(), [0.0])
+
+        # No Edges
+        to_ids, weights = weights_out(self.g, self.nodes[4])
+        self.assertEquals(len(to_ids), 0)
+        self.assertEquals(len(weights), 0)
+
+    def test_empty(self):
+        """ A Graph without Edges has no weights. """
+        for node in self.nodes:
+            self.g.nodes.remove(node)
+
+        from_ids, to_ids, weights = edge_weights(self.g)
+        self.assertEquals(len(weights), 0)
+
+    def test_normalize(self):
+        """ Normalize scores per from id. """
+        weights = normalize(
+            numpy.array([0, 0, 2, 2]), numpy.array([1, 3, 0, 0])
+        )
+
+        self.assertEquals(weights.tolist(), [0.25, 0.75, 0.0, 0.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
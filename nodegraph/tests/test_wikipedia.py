@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from StringIO import StringIO
+
+from ..wikipedia import iter_rows, read_pagelinks, load_sample
+
+from .mixins import GraphTestMixin
+
+
+class TestDumps(unittest.TestCase):
+    """ Tests for parsing MySQL dumps. """
+
+    def test_iter_rows(self):
+        """ Rows are parsed from INSERT statements for the given table. """
+        f = StringIO(
+            "INSERT INTO `other` VALUES (1,'a');\n"
+            "INSERT INTO `page` VALUES (1,0,'A_(b)',NULL),"
+            "(2,0,'It\\'s_\\\\_Z\xc3\xbcrich',0.5);\n"
+        )
+
+        self.assertEquals(list(iter_rows(f, 'page')), [
+            ('1', '0', u'A_(b)', None),
+            ('2', '0', u'It\'s_\\_Z\xfcrich', '0.5'),
+        ])
+
+    def test_read_pagelinks(self):
+        """ Links are read from dumps before and after 2024. """
+        f = StringIO(
+            "INSERT INTO `pagelinks` VALUES "
+            "(1,0,'B',0),(1,14,'C',0),(2,0,'A',1);\n"
+        )
+        self.assertEquals(list(read_pagelinks(f)), [(1, u'B')])
+
+        # Link targets by id
+        f = StringIO(
+            "INSERT INTO `pagelinks` VALUES (1,0,10),(1,0,11),(2,1,10);\n"
+        )
+        self.assertEquals(
+            list(read_pagelinks(f, targets={10: u'B'})), [(1, u'B')]
+        )
+
+
+class TestSample(GraphTestMixin, unittest.TestCase):
+    """ Tests for loading the bundled sample. """
+
+    def test_load_sample(self):
+        """ The sample loads pages as Nodes and links as Edges. """
+        count = load_sample(self.g)
+
+        self.assertEquals(self.g.store.edge_count, count)
+        self.assertEquals(len(self.g.nodes.all()), 63)
+
+        amsterdam, golden_age = self.g.nodes.get_many(
+            ['Amsterdam', 'Dutch_Golden_Age']
+        )
+
+        edge = self.g.edges.get(amsterdam, golden_age)
+        self.assertEquals(edge.score, 100)
+
+        # Escaped and non-ASCII titles
+        self.g.nodes.get(u"Hitchhiker's_Guide_to_Amsterdam")
+        self.g.nodes.get(u'Z\xfcrich')
+
+        # Red links and self-links are skipped
+        self.assertFalse(self.g.edges.exists(amsterdam, amsterdam))
+
+    def test_limit(self):
+        """ At most limit Edges are loaded. """
+        self.assertEquals(load_sample(self.g, limit=10, batch_size=3), 10)
+        self.assertEquals(self.g.store.edge_count, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
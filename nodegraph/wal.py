@@ -0,0 +1,364 @@
+import json
+import os
+import threading
+import time
+
+from .store import GraphStore
+
+
+class WriteAheadLog(object):
+    """
+    Append-only log of store mutations, one JSON encoded record per line.
+
+    Records are written to the file right away but only made durable with
+    fsync once `group_size` records are pending or `group_interval` seconds
+    have passed since the last commit, so many writes share one sync. When
+    writes stop, a background timer commits pending records after
+    `group_interval` seconds.
+
+    `lock` serializes appends and commits.
+    """
+
+    def __init__(self, path, group_size=100, group_interval=1.0,
+                 timer=time.time):
+        self.path = path
+        self.group_size = group_size
+        self.group_interval = group_interval
+
+        # Allow for pluggable timer, eases testing
+        self.timer = timer
+
+        self.lock = threading.RLock()
+
+        self.file = open(path, 'ab')
+
+        # Records written since the last commit
+        self.pending = 0
+        self.committed = self.timer()
+
+        # Commits pending records when no further records are appended
+        self._commit_timer = None
+
+    def append(self, record):
+        """ Append a record, committing when a group is complete. """
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+
+        with self.lock:
+            self.file.write(line)
+
+            self.pending += 1
+
+            if (
+                self.pending >= self.group_size or
+                self.timer() - self.committed >= self.group_interval
+            ):
+                self.commit()
+
+            elif self._commit_timer is None:
+                self._commit_timer = threading.Timer(
+                    self.group_interval, self._commit_pending
+                )
+                self._commit_timer.daemon = True
+                self._commit_timer.start()
+
+    def _commit_pending(self):
+        """ Commit records left pending, called by the commit timer. """
+        with self.lock:
+            if self.pending and not self.file.closed:
+                self.commit()
+
+    def commit(self):
+        """ Make all appended records durable. """
+        with self.lock:
+            if self._commit_timer is not None:
+                self._commit_timer.cancel()
+                self._commit_timer = None
+
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+            self.pending = 0
+            self.committed = self.timer()
+
+    def close(self):
+        """ Commit and close the log. """
+        with self.lock:
+            self.commit()
+            self.file.close()
+
+    @staticmethod
+    def replay(path):
+        """
+        Generator yielding the records in a log file. A record which was
+        only partially written, and anything after it, is truncated.
+        """
+        if not os.path.exists(path):
+            return
+
+        # Length of the complete records
+        length = 0
+
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+
+                length += len(line)
+
+                yield record
+
+        if length < os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(length)
+
+
+def _encode_name(name):
+    """
+    Return the log arguments for a node name. JSON only holds unicode, so
+    byte strings are logged decoded from UTF-8 and marked as bytes.
+    """
+    if isinstance(name, unicode):
+        return [name]
+
+    return [name.decode('utf-8'), 'bytes']
+
+
+def _decode_name(name, name_type='unicode'):
+    """ Return a node name of the type it was interned with. """
+    if name_type == 'bytes':
+        return name.encode('utf-8')
+
+    return name
+
+
+def _logged(name):
+    """ Return a GraphStore method which logs successful calls. """
+    method = getattr(GraphStore, name)
+
+    def wrapper(self, *args):
+        with self._write_lock:
+            result = method(self, *args)
+
+            self.log.append([name] + list(args))
+
+        return result
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+
+    return wrapper
+
+
+class LoggedGraphStore(GraphStore):
+    """
+    In-memory store persisting every mutation to a write-ahead log, so
+    durable writes cost O(change) instead of O(graph).
+
+    A store lives in a directory holding a pickled snapshot and the log of
+    changes since that snapshot. open() loads the snapshot and replays the
+    log; compact() writes a fresh snapshot and starts an empty log. Each
+    compaction increases the generation, which names the log belonging to
+    a snapshot, so a crash halfway through compaction is harmless.
+
+    Writes hold a store-wide write lock while applying a change and logging
+    it, keeping the log in the order changes were applied; compact() holds
+    it while swapping logs.
+    """
+
+    # Methods changing the store, by log record type
+    LOGGED = (
+        'add_node', 'remove_node', 'set_node_ttl', 'delete_node_ttl',
+        'add_edge', 'remove_edge', 'set_score', 'delete_score',
+        'set_edge_ttl', 'add_nodes', 'add_edges', 'increase_scores',
+        'increase_score',
+    )
+
+    add_node = _logged('add_node')
+    remove_node = _logged('remove_node')
+    set_node_ttl = _logged('set_node_ttl')
+    delete_node_ttl = _logged('delete_node_ttl')
+    add_edge = _logged('add_edge')
+    remove_edge = _logged('remove_edge')
+    set_score = _logged('set_score')
+    delete_score = _logged('delete_score')
+    increase_score = _logged('increase_score')
+    set_edge_ttl = _logged('set_edge_ttl')
+
+    def add_nodes(self, node_ids):
+        """ Add an iterable of node ids, logged as a single record. """
+        node_ids = list(node_ids)
+
+        with self._write_lock:
+            super(LoggedGraphStore, self).add_nodes(node_ids)
+
+            self.log.append(['add_nodes', node_ids])
+
+    def add_edges(self, rows):
+        """
+        Add edges from an iterable of `(from id, to id, score, ttl)` rows,
+        logged as a single record.
+        """
+        rows = list(rows)
+
+        with self._write_lock:
+            super(LoggedGraphStore, self).add_edges(rows)
+
+            self.log.append(['add_edges', rows])
+
+    def increase_scores(self, deltas):
+        """
+        Add deltas to the scores of edges from an iterable of
+        `(from id, to id, delta)` rows, logged as a single record.
+        """
+        deltas = list(deltas)
+
+        with self._write_lock:
+            super(LoggedGraphStore, self).increase_scores(deltas)
+
+            self.log.append(['increase_scores', deltas])
+
+    def __init__(self, name, directory, **log_options):
+        super(LoggedGraphStore, self).__init__(name=name)
+
+        self.directory = directory
+        self.generation = 0
+
+        self._open_log(**log_options)
+
+    def _create_locks(self):
+        """ Create the locks guarding the store, and the write lock. """
+        super(LoggedGraphStore, self)._create_locks()
+
+        self._write_lock = threading.RLock()
+
+    def __getstate__(self):
+        """ The log is attached on opening and not persisted. """
+        state = super(LoggedGraphStore, self).__getstate__()
+        del state['log']
+        del state['_write_lock']
+
+        return state
+
+    @staticmethod
+    def snapshot_path(directory):
+        return os.path.join(directory, 'snapshot')
+
+    @staticmethod
+    def log_path(directory, generation):
+        return os.path.join(directory, 'log.{0}'.format(generation))
+
+    def _open_log(self, **log_options):
+        """ Open the log for the current generation for appending. """
+        self.log = WriteAheadLog(
+            self.log_path(self.directory, self.generation), **log_options
+        )
+
+    @classmethod
+    def open(cls, name, directory, **log_options):
+        """
+        Open the store in directory, creating it when it does not exist.
+        """
+        snapshot_path = cls.snapshot_path(directory)
+
+        if not os.path.exists(snapshot_path):
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+
+            store = cls(name=name, directory=directory, **log_options)
+            store.compact()
+
+            return store
+
+        with open(snapshot_path, 'rb') as f:
+            store = cls.load(f)
+
+        store.directory = directory
+
+        store.replay(cls.log_path(directory, store.generation))
+        store._open_log(**log_options)
+
+        return store
+
+    def replay(self, path):
+        """ Apply the records in a log file, without logging them again. """
+        for record in WriteAheadLog.replay(path):
+            operation, args = record[0], record[1:]
+
+            if operation == 'intern':
+                GraphStore.intern(self, _decode_name(*args))
+            elif operation == 'setting':
+                key, value = args
+                self.settings[key] = value
+            else:
+                assert operation in self.LOGGED
+
+                getattr(GraphStore, operation)(self, *args)
+
+    def intern(self, name):
+        """ Return the id for name, assigning a new one when required. """
+        if name in self.node_ids:
+            return self.node_ids[name]
+
+        with self._write_lock:
+            if name in self.node_ids:
+                return self.node_ids[name]
+
+            node_id = super(LoggedGraphStore, self).intern(name)
+
+            self.log.append(['intern'] + _encode_name(name))
+
+        return node_id
+
+    def save_setting(self, key, value):
+        """ Log changes to Graph settings. """
+        with self._write_lock:
+            self.log.append(['setting', key, value])
+
+    def commit(self):
+        """ Make all logged changes durable. """
+        self.log.commit()
+
+    def close(self):
+        """ Commit and close the log. """
+        self.log.close()
+
+    def compact(self):
+        """
+        Write a snapshot of the current state and start a new, empty log.
+        Writes wait until compaction is complete.
+        """
+        with self._write_lock:
+            self._compact()
+
+    def _compact(self):
+        """ Compact, the write lock should be held. """
+        self.log.close()
+
+        old_log = self.log_path(self.directory, self.generation)
+        self.generation += 1
+
+        # Write the snapshot to a temporary file and atomically replace
+        snapshot_path = self.snapshot_path(self.directory)
+        temporary_path = snapshot_path + '.tmp'
+
+        with open(temporary_path, 'wb') as f:
+            self.save(f)
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.rename(temporary_path, snapshot_path)
+
+        if os.path.exists(old_log):
+            os.remove(old_log)
+
+        self._open_log(
+            group_size=self.log.group_size,
+            group_interval=self.log.group_interval,
+            timer=self.log.timer
+        )
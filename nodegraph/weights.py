@@ -0,0 +1,94 @@
+"""
+Vectorized Edge weights for offline jobs, requires NumPy.
+
+Weights are computed from arrays of scores in a single pass, bypassing
+Edge objects and the GraphCache; they equal `Edge.get_weight()`:
+
+    from_ids, to_ids, weights = edge_weights(graph)
+    to_ids, weights = weights_out(graph, node)
+
+Node ids map to Nodes through `graph.nodes.get_by_id()`.
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .csr import CSRGraphStore
+
+
+def _require_numpy():
+    """ Raise ImportError when NumPy is not available. """
+    if numpy is None:
+        raise ImportError('Vectorized weights require NumPy.')
+
+
+def score_arrays(store):
+    """
+    Return int64 arrays of from ids, to ids and scores for all edges in a
+    store, grouped by from id.
+    """
+    _require_numpy()
+
+    if isinstance(store, CSRGraphStore):
+        return store.score_arrays()
+
+    rows = numpy.fromiter(
+        (value for row in store.iter_scores() for value in row),
+        dtype=numpy.int64
+    ).reshape(-1, 3)
+
+    return rows[:, 0], rows[:, 1], rows[:, 2]
+
+
+def normalize(from_ids, scores):
+    """
+    Return float64 weights for edges with the given from ids and scores:
+    the score divided by the total score of edges from the same node, 0 for
+    edges without score.
+    """
+    _require_numpy()
+
+    weights = numpy.zeros(len(scores), dtype=numpy.float64)
+
+    if not len(scores):
+        return weights
+
+    totals = numpy.bincount(from_ids, weights=scores)
+
+    scored = scores > 0
+    weights[scored] = scores[scored] / totals[from_ids[scored]]
+
+    return weights
+
+
+def edge_weights(graph):
+    """
+    Return arrays of from ids, to ids and weights for every Edge in a Graph.
+    """
+    from_ids, to_ids, scores = score_arrays(graph.store)
+
+    return from_ids, to_ids, normalize(from_ids, scores)
+
+
+def weights_out(graph, node):
+    """
+    Return arrays of to ids and weights for all Edges from node.
+    """
+    _require_numpy()
+
+    pairs = list(graph.store.scores_out(node.id))
+
+    to_ids = numpy.fromiter(
+        (to_id for to_id, score in pairs), dtype=numpy.int64, count=len(pairs)
+    )
+    scores = numpy.fromiter(
+        (score for to_id, score in pairs), dtype=numpy.int64, count=len(pairs)
+    )
+
+    total = scores.sum()
+
+    if not total:
+        return to_ids, numpy.zeros(len(scores), dtype=numpy.float64)
+
+    return to_ids, scores / float(total)
@@ -0,0 +1,158 @@
+"""
+Loader turning Wikipedia's page link graph into a Graph.
+
+Wikipedia publishes its link graph as MySQL dumps at
+https://dumps.wikimedia.org/, e.g. `enwiki-latest-page.sql.gz` and
+`enwiki-latest-pagelinks.sql.gz`. Pages become Nodes named after their
+title, links between them Edges. Since 2024 pagelinks refer to their
+target through the `linktarget` table, which should be given as well.
+
+A small sample in the same format is bundled for testing and benchmarks:
+
+    graph = Graph(name='wikipedia')
+    load_sample(graph)
+"""
+import itertools
+import os
+import re
+
+from .edgelist import insert_edges, open_edge_list
+
+# Directory holding the bundled sample dumps
+SAMPLE_DIRECTORY = os.path.join(os.path.dirname(__file__), 'data')
+
+# A row in an INSERT statement; a parenthesized list of values
+ROW = re.compile(r"\(((?:'(?:[^'\\]|\\.)*'|[^'()])*)\)")
+
+# A single value within a row, either quoted or bare
+VALUE = re.compile(r"'((?:[^'\\]|\\.)*)'|([^,]+)")
+
+# Escape sequences in quoted values
+ESCAPE = re.compile(r'\\(.)')
+ESCAPES = {'0': '\0', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+
+
+def _unescape(match):
+    """ Return the character for an escape sequence match. """
+    character = match.group(1)
+
+    return ESCAPES.get(character, character)
+
+
+def iter_rows(f, table):
+    """
+    Generator yielding tuples of values for the rows inserted into a table
+    by a MySQL dump. Quoted values are returned as unicode strings, NULL as
+    None and other values as bytes.
+    """
+    prefix = 'INSERT INTO `{0}` VALUES '.format(table)
+
+    for line in f:
+        if not line.startswith(prefix):
+            continue
+
+        for row in ROW.finditer(line, len(prefix)):
+            values = []
+
+            for quoted, bare in VALUE.findall(row.group(1)):
+                if bare:
+                    if bare == 'NULL':
+                        values.append(None)
+                    else:
+                        values.append(bare)
+                else:
+                    values.append(
+                        ESCAPE.sub(_unescape, quoted).decode('utf-8')
+                    )
+
+            yield tuple(values)
+
+
+def read_pages(f, namespace=0):
+    """ Generator yielding `(page id, title)` for pages in namespace. """
+    for row in iter_rows(f, 'page'):
+        if int(row[1]) == namespace:
+            yield int(row[0]), row[2]
+
+
+def read_linktargets(f, namespace=0):
+    """ Generator yielding `(target id, title)` for targets in namespace. """
+    for row in iter_rows(f, 'linktarget'):
+        if int(row[1]) == namespace:
+            yield int(row[0]), row[2]
+
+
+def read_pagelinks(f, namespace=0, targets=None):
+    """
+    Generator yielding `(page id, title)` for links between pages in
+    namespace. For dumps referring to targets by id, targets should be a
+    dictionary (target id -> title) of targets in namespace.
+    """
+    for row in iter_rows(f, 'pagelinks'):
+        if len(row) == 4:
+            # Before 2024: from, namespace, title, from namespace
+            from_id, to_namespace, title, from_namespace = row
+
+            if int(to_namespace) != namespace:
+                continue
+
+        else:
+            # Since 2024: from, from namespace, target id
+            from_id, from_namespace, target_id = row[:3]
+
+            title = targets.get(int(target_id))
+
+            if title is None:
+                continue
+
+        if int(from_namespace) == namespace:
+            yield int(from_id), title
+
+
+def load_pagelinks(graph, page_path, pagelinks_path, linktarget_path=None,
+                   namespace=0, score=100, limit=None, batch_size=10000):
+    """
+    Load pages and the links between them from Wikipedia dumps into a
+    Graph, returns the number of Edges created. Every link gets the given
+    score; links to missing pages and pages linking to themselves are
+    skipped. At most limit Edges are created, when given.
+
+    Titles of all pages, and link targets when given, are held in memory
+    while loading; links are streamed in batches.
+    """
+    with open_edge_list(page_path) as f:
+        titles = dict(read_pages(f, namespace))
+
+    targets = None
+    if linktarget_path:
+        with open_edge_list(linktarget_path) as f:
+            targets = dict(read_linktargets(f, namespace))
+
+    # Only titles of existing pages are valid targets
+    pages = set(titles.itervalues())
+
+    with open_edge_list(pagelinks_path) as f:
+        links = (
+            (titles[from_id], title, score, None)
+            for from_id, title in read_pagelinks(f, namespace, targets)
+            if from_id in titles and title in pages and
+            titles[from_id] != title
+        )
+
+        if limit is not None:
+            links = itertools.islice(links, limit)
+
+        return insert_edges(graph, links, batch_size=batch_size)
+
+
+def load_sample(graph, **kwargs):
+    """
+    Load the bundled sample of the English Wikipedia link graph into a
+    Graph, returns the number of Edges created.
+    """
+    return load_pagelinks(
+        graph,
+        os.path.join(SAMPLE_DIRECTORY, 'enwiki-sample-page.sql'),
+        os.path.join(SAMPLE_DIRECTORY, 'enwiki-sample-pagelinks.sql'),
+        **kwargs
+    )
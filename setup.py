@@ -17,10 +17,16 @@ setup(
     author='Mathijs de Bruin',
     author_email='mathijs@mathijsfiets.nl',
     packages=find_packages(),
+    package_data={'nodegraph': ['data/*.sql']},
     url='https://pypi.python.org/pypi/nodegraph/',
     description='Perspectivist graph database.',
     long_description=README,
     install_requires=REQUIREMENTS,
+    extras_require={
+        'csr': ['numpy'],
+        'redis': ['redis'],
+        'weights': ['numpy'],
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Environment :: Web Environment',